@@ -0,0 +1,451 @@
+# HTTP scoring service (ASGI) for other internal systems: analyze a JD, extract a resume, score candidates
+# Run: uvicorn api:app --host 0.0.0.0 --port 8000
+# JD analyses are cached by normalized text hash for every client (utils/jd_cache.py); LLM calls share one
+# concurrency limit and RPM/TPM budget per process. Tests can pass a stub client: create_app(client=FakeLLM()).
+
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from utils import extractor, metrics
+from utils.jd_cache import JDAnalysisCache
+from utils.pdf_pool import PdfExtractionPool
+from utils.ranking import top_k
+from utils.ratelimit import RateLimiter
+from utils.scorer import score_candidate
+from utils.scoring_profiles import ComponentTable, get_profile, load_profiles
+
+# Buffered request bodies (JSON, PDF); NDJSON bodies are parsed line by line and only limited per line
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", 20 * 1024 * 1024))
+API_JD_CACHE_SIZE = int(os.getenv("API_JD_CACHE_SIZE", 1024))
+
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+
+class RequestError(Exception):
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_k(value):
+    try:
+        return max(0, int(value or 0))
+    except (TypeError, ValueError):
+        raise RequestError(f"top_k must be an integer, got {value!r}")
+
+
+# "scoring_profile": a profile name or an object of overrides (utils.scoring_profiles); None is the default profile
+def parse_profile(value):
+    if value is None or value == "":
+        return None
+    try:
+        return get_profile(value)
+    except ValueError as e:
+        raise RequestError(str(e))
+
+
+# Extracted resume JSON (RESUME_SCHEMA) as the scorer reads it; a wrong type would be a TypeError (500) mid-scoring
+CANDIDATE_STRING_FIELDS = ("candidate_name", "education_level", "location")
+CANDIDATE_YEAR_FIELDS = ("total_primary_years", "total_secondary_years")
+WORK_HISTORY_STRING_FIELDS = ("role", "company", "start", "end", "relevance")
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Returns the first problem of a candidate ("skills[2].name must be a string") or None
+def candidate_error(candidate):
+    if not isinstance(candidate, dict):
+        return "must be an object"
+    for field in CANDIDATE_STRING_FIELDS:
+        if field in candidate and not isinstance(candidate[field], str):
+            return f"{field} must be a string"
+    for field in CANDIDATE_YEAR_FIELDS:
+        if candidate.get(field) is not None and not is_number(candidate[field]):
+            return f"{field} must be a number"
+    licenses = candidate.get("licenses", [])
+    if not isinstance(licenses, list) or not all(isinstance(item, str) for item in licenses):
+        return "licenses must be a list of strings"
+    error = skill_list_error(candidate.get("skills", []), "skills")
+    if error:
+        return error
+    work_history = candidate.get("work_history", [])
+    if not isinstance(work_history, list):
+        return "work_history must be a list of objects"
+    for position, role in enumerate(work_history):
+        if not isinstance(role, dict):
+            return f"work_history[{position}] must be an object"
+        for field in WORK_HISTORY_STRING_FIELDS:
+            if role.get(field) is not None and not isinstance(role[field], str):
+                return f"work_history[{position}].{field} must be a string"
+    return None
+
+
+# Analyzed JD JSON (JOB_DESCRIPTION_SCHEMA) sent by the client as "job"; same rule as candidate_error
+JOB_STRING_FIELDS = ("job_title", "education_level", "location")
+
+
+def skill_list_error(skills, field):
+    if not isinstance(skills, list):
+        return f"{field} must be a list of objects"
+    for position, skill in enumerate(skills):
+        if not isinstance(skill, dict) or not isinstance(skill.get("name"), str):
+            return f"{field}[{position}] must be an object with a string name"
+        if not isinstance(skill.get("level", ""), str):
+            return f"{field}[{position}].level must be a string"
+    return None
+
+
+# Returns the first problem of a JD ("min_experience_years must be a number") or None
+def job_error(job):
+    for field in JOB_STRING_FIELDS:
+        if field in job and not isinstance(job[field], str):
+            return f"{field} must be a string"
+    if "min_experience_years" in job and not is_number(job["min_experience_years"]):
+        return "min_experience_years must be a number"
+    if not isinstance(job.get("is_remote_allowed", False), bool):
+        return "is_remote_allowed must be a boolean"
+    licenses = job.get("required_licenses", [])
+    if not isinstance(licenses, list) or not all(isinstance(item, str) for item in licenses):
+        return "required_licenses must be a list of strings"
+    for field in ("required_skills", "preferred_skills"):
+        error = skill_list_error(job.get(field, []), field)
+        if error:
+            return error
+    return None
+
+
+def validate_candidates(candidates, label="candidates"):
+    if not isinstance(candidates, list):
+        raise RequestError(f"{label} must be a list of objects")
+    for index, candidate in enumerate(candidates):
+        error = candidate_error(candidate)
+        if error:
+            raise RequestError(f"{label}[{index}]: {error}")
+
+
+# JSON flags must be real booleans: bool("false") would be True
+def parse_bool(value, name):
+    if not isinstance(value, bool):
+        raise RequestError(f"{name} must be true or false, got {value!r}")
+    return value
+
+
+def content_type(request):
+    return request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+async def read_body(request, limit=None):
+    limit = limit or API_MAX_BODY_BYTES
+    try:
+        declared = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        raise RequestError("Invalid Content-Length header")
+    if declared > limit:
+        raise RequestError(f"Request body is larger than {limit} bytes", 413)
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise RequestError(f"Request body is larger than {limit} bytes", 413)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def read_json(request):
+    try:
+        body = json.loads(await read_body(request))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise RequestError(f"Invalid JSON body: {e}")
+    if not isinstance(body, dict):
+        raise RequestError("The JSON body must be an object")
+    return body
+
+
+# One JSON value per line, decoded as the chunks arrive (the raw body is never held in memory)
+# The unfinished line is kept as a list of chunks and joined once, so a long line is not copied on every chunk
+async def iter_ndjson(request, line_limit=None):
+    line_limit = line_limit or API_MAX_BODY_BYTES
+    pending = []
+    pending_size = 0
+    async for chunk in request.stream():
+        if b"\n" not in chunk:
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size > line_limit:
+                raise RequestError(f"NDJSON line is larger than {line_limit} bytes", 413)
+            continue
+        *lines, rest = chunk.split(b"\n")
+        lines[0] = b"".join(pending) + lines[0]
+        pending = [rest]
+        pending_size = len(rest)
+        if pending_size > line_limit:
+            raise RequestError(f"NDJSON line is larger than {line_limit} bytes", 413)
+        for line in lines:
+            if line.strip():
+                yield parse_ndjson_line(line)
+    buffer = b"".join(pending)
+    if buffer.strip():
+        yield parse_ndjson_line(buffer)
+
+
+def parse_ndjson_line(line):
+    try:
+        return json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise RequestError(f"Invalid NDJSON line: {e}")
+
+
+# explain=False skips the reasoning/calculation text (ScoreResult fast path)
+# components=True adds the stored score components (re-ranked later with POST /rerank)
+def score_payload(result, explain=True, components=False):
+    payload = result.to_dict() if explain else {"final_score": result.final_score, "breakdown": result.breakdown}
+    if components:
+        payload["components"] = result.components()
+    return payload
+
+
+def score_candidates(job_data, candidates, k=None, explain=True, reference_date=None, scoring_profile=None,
+                     components=False):
+    reference_date = reference_date or datetime.datetime.now()
+    if k:
+        ranked = top_k(job_data, enumerate(candidates), k, reference_date, scoring_profile=scoring_profile)
+        return [{"index": index, **score_payload(result, explain, components)} for index, result in ranked]
+    return [
+        {"index": index,
+         **score_payload(score_candidate(job_data, candidate, reference_date, scoring_profile), explain, components)}
+        for index, candidate in enumerate(candidates)
+    ]
+
+
+class ScoringService:
+
+    def __init__(self, client=None, jd_cache_size=None, max_concurrency=None, rpm=None, tpm=None, pdf_pool=None):
+        self.client = client
+        self.jd_cache = JDAnalysisCache(API_JD_CACHE_SIZE if jd_cache_size is None else jd_cache_size)
+        self.limiter = RateLimiter(extractor.LLM_RPM if rpm is None else rpm, extractor.LLM_TPM if tpm is None else tpm)
+        self.semaphore = asyncio.Semaphore(max_concurrency or extractor.LLM_MAX_CONCURRENCY)
+        self.pdf_pool = pdf_pool or PdfExtractionPool()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app):
+        metrics.setup_from_env()
+        try:
+            yield
+        finally:
+            self.pdf_pool.close()
+
+    # LLM calls
+
+    async def analyze_job_text(self, text):
+        async with self.semaphore:
+            return await extractor.aextract_data_with_gemini(
+                text, "job_description", client=self.client, limiter=self.limiter
+            )
+
+    async def extract_resume_text(self, text, job_data):
+        async with self.semaphore:
+            if extractor.RESUME_TWO_STAGE:
+                return await extractor.aextract_resume_two_stage(text, job_data, client=self.client, limiter=self.limiter)
+            return await extractor.aextract_data_with_gemini(
+                text, "resume", job_data, client=self.client, limiter=self.limiter
+            )
+
+    async def analyze_job(self, text):
+        if not text or not text.strip():
+            raise RequestError("The Job Description text is empty")
+        key, job_data, cached = await self.jd_cache.get_or_analyze(text, self.analyze_job_text)
+        if job_data is None:
+            raise RequestError("Gemini did not return valid data for the Job Description", 502)
+        return key, job_data, cached
+
+    # The JD of a request: "job" (already analyzed JSON), "job_key" (from /jd/analyze) or "job_text"
+    async def resolve_job(self, params, required=True):
+        if params.get("job") is not None:
+            if not isinstance(params["job"], dict):
+                raise RequestError("job must be an object")
+            error = job_error(params["job"])
+            if error:
+                raise RequestError(f"job: {error}")
+            return None, params["job"]
+        if params.get("job_key"):
+            job_data = self.jd_cache.get(params["job_key"])
+            if job_data is None:
+                raise RequestError(f"Unknown job_key {params['job_key']} (analyze the JD again)", 404)
+            return params["job_key"], job_data
+        if params.get("job_text"):
+            key, job_data, _ = await self.analyze_job(params["job_text"])
+            return key, job_data
+        if required:
+            raise RequestError("One of job, job_key or job_text is required")
+        return None, None
+
+    # Endpoints
+
+    async def healthz(self, request):
+        return JSONResponse({"status": "ok"})
+
+    async def metrics_endpoint(self, request):
+        return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+    # GET /profiles: the named scoring profiles
+    async def profiles(self, request):
+        return JSONResponse({"profiles": load_profiles()})
+
+    # POST /jd/analyze: {"text": "..."} or the plain JD text as the body
+    async def analyze_jd(self, request):
+        if content_type(request) == "application/json":
+            text = (await read_json(request)).get("text") or ""
+        else:
+            text = (await read_body(request)).decode("utf-8", errors="replace")
+        key, job_data, cached = await self.analyze_job(text)
+        return JSONResponse({"job_key": key, "job": job_data, "cached": cached})
+
+    # GET /jd/{job_key}
+    async def get_jd(self, request):
+        job_data = self.jd_cache.get(request.path_params["job_key"])
+        if job_data is None:
+            raise RequestError("Unknown job_key", 404)
+        return JSONResponse({"job_key": request.path_params["job_key"], "job": job_data})
+
+    # POST /resume/extract: {"text": "...", job...} or a PDF body (application/pdf) with ?job_key=
+    async def extract_resume(self, request):
+        if content_type(request) == "application/pdf":
+            document = await run_in_threadpool(self.pdf_pool.extract, "upload.pdf", await read_body(request))
+            if document["error"]:
+                raise RequestError(f"PDF could not be read: {document['error']}", 422)
+            text = document["text"]
+            _, job_data = await self.resolve_job(request.query_params, required=False)
+        else:
+            body = await read_json(request)
+            text = body.get("text") or ""
+            _, job_data = await self.resolve_job(body, required=False)
+        if not text.strip():
+            raise RequestError("No resume text", 422)
+        data = await self.extract_resume_text(text, job_data)
+        if data is None:
+            raise RequestError("Gemini did not return valid data for the resume", 502)
+        return JSONResponse({"data": data})
+
+    # POST /score
+    # JSON: {job..., "candidates": [extracted resume JSON, ...] | "resumes": [text, ...], "top_k": n, "explain": bool,
+    #        "scoring_profile": name | {...}, "components": bool}
+    # NDJSON: one candidate JSON per line, JD from ?job_key= / ?top_k= / ?explain=0 / ?scoring_profile= /
+    #         ?components=1, results streamed back as NDJSON
+    async def score(self, request):
+        if content_type(request) in NDJSON_TYPES:
+            return await self.score_ndjson(request)
+
+        body = await read_json(request)
+        scoring_profile = parse_profile(body.get("scoring_profile"))
+        job_key, job_data = await self.resolve_job(body)
+        k = parse_k(body.get("top_k"))
+        explain = parse_bool(body.get("explain", True), "explain")
+        components = parse_bool(body.get("components", False), "components")
+
+        if "resumes" in body and "candidates" in body:
+            raise RequestError("Send either candidates or resumes, not both")
+        errors = []
+        if "resumes" in body:
+            resumes = body["resumes"] or []
+            if not isinstance(resumes, list) or not all(isinstance(text, str) for text in resumes):
+                raise RequestError("resumes must be a list of strings")
+            extracted = await asyncio.gather(*(self.extract_resume_text(text, job_data) for text in resumes))
+            candidates = []
+            indexes = []
+            for index, data in enumerate(extracted):
+                if data is None:
+                    errors.append({"index": index, "error": "Gemini did not return valid data"})
+                else:
+                    indexes.append(index)
+                    candidates.append(data)
+        else:
+            candidates = body.get("candidates") or []
+            validate_candidates(candidates)
+            indexes = list(range(len(candidates)))
+
+        results = await run_in_threadpool(
+            score_candidates, job_data, candidates, k, explain, None, scoring_profile, components
+        )
+        for result in results:
+            position = result["index"]
+            result["index"] = indexes[position]
+            if "resumes" in body:
+                result["data"] = candidates[position]
+        return JSONResponse({"job_key": job_key, "results": results, "errors": errors})
+
+    async def score_ndjson(self, request):
+        scoring_profile = parse_profile(request.query_params.get("scoring_profile"))
+        _, job_data = await self.resolve_job(request.query_params)
+        k = parse_k(request.query_params.get("top_k"))
+        explain = request.query_params.get("explain", "1") not in ("0", "false")
+        components = request.query_params.get("components", "0") not in ("0", "false")
+
+        candidates = []
+        async for candidate in iter_ndjson(request):
+            error = candidate_error(candidate)
+            if error:
+                raise RequestError(f"NDJSON line {len(candidates) + 1}: {error}")
+            candidates.append(candidate)
+        results = await run_in_threadpool(
+            score_candidates, job_data, candidates, k, explain, None, scoring_profile, components
+        )
+
+        def lines():
+            for result in results:
+                yield json.dumps(result) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    # POST /rerank: {"components": [stored components of one JD's candidates], "scoring_profile": ..., "top_k": n}
+    # No JD, resume or LLM needed: returns [{"index", "final_score"}] best first
+    async def rerank(self, request):
+        body = await read_json(request)
+        scoring_profile = parse_profile(body.get("scoring_profile"))
+        k = parse_k(body.get("top_k")) or None
+        components = body.get("components")
+        if not isinstance(components, list) or not all(
+            isinstance(item, dict) and "knocked_out" in item for item in components
+        ):
+            raise RequestError("components must be a list of score components (from /score with components=true)")
+        try:
+            table = ComponentTable(components)
+        except (KeyError, TypeError, ValueError) as e:
+            raise RequestError(f"Invalid components: {e}")
+        ranked = table.rank(scoring_profile, k)
+        return JSONResponse({"results": [{"index": index, "final_score": score} for index, score in ranked]})
+
+
+async def request_error(request, exc):
+    return JSONResponse({"error": str(exc)}, status_code=exc.status_code)
+
+
+def create_app(client=None, **kwargs):
+    service = ScoringService(client, **kwargs)
+    routes = [
+        Route("/healthz", service.healthz, methods=["GET"]),
+        Route("/metrics", service.metrics_endpoint, methods=["GET"]),
+        Route("/profiles", service.profiles, methods=["GET"]),
+        Route("/jd/analyze", service.analyze_jd, methods=["POST"]),
+        Route("/jd/{job_key}", service.get_jd, methods=["GET"]),
+        Route("/resume/extract", service.extract_resume, methods=["POST"]),
+        Route("/score", service.score, methods=["POST"]),
+        Route("/rerank", service.rerank, methods=["POST"]),
+    ]
+    app = Starlette(routes=routes, lifespan=service.lifespan, exception_handlers={RequestError: request_error})
+    app.state.service = service
+    return app
+
+
+app = create_app()
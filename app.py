@@ -1,7 +1,127 @@
 import streamlit as st
-import concurrent.futures
-from utils.extractor import extract_data_with_gemini, extract_text_from_pdf
-from utils.scorer import calculate_score  # Scorer fonksiyonunu import ettik
+import datetime
+import json
+from utils.extractor import (
+    ExtractionSession, extract_data_with_gemini, get_cache_stats, get_compaction_stats, get_parse_stats
+)
+from utils.ingest import INGEST_MAX_IN_FLIGHT, ingest
+from utils.prefilter import prefilter_resume
+from utils import metrics
+from utils.cache import hash_stream, hash_text
+from utils.dedup import DedupIndex
+from utils.scorer import calculate_score, profile_value, weight_label  # Scorer fonksiyonunu import ettik
+from utils.scoring_profiles import load_profiles
+
+
+def leaderboard_rows(results):
+    rows = []
+    for res in results:
+        row = {"Candidate": res["name"], "Score": None, "Skills": None, "Experience": None,
+               "Education": None, "Bonus": None, "Status": "Scored"}
+        if "error" in res:
+            row["Status"] = "Failed"
+        elif "prefilter" in res:
+            row["Score"] = 0
+            row["Status"] = "Rejected (prefilter)"
+        else:
+            breakdown = res["score"]["breakdown"]
+            row.update(Score=res["score"]["final_score"], Skills=breakdown["skills"], Experience=breakdown["experience"],
+                       Education=breakdown["education"], Bonus=breakdown["bonus"])
+            if "duplicate_of" in res:
+                row["Status"] = f"Scored (duplicate of {res['duplicate_of']})"
+        rows.append(row)
+    return sorted(rows, key=lambda row: -1 if row["Score"] is None else row["Score"], reverse=True)
+
+
+def render_result(res):
+    st.header(res["name"])
+
+    if "error" in res:
+        st.error(f"Error: {res['error']}")
+    elif "prefilter" in res:
+        st.error(res["prefilter"]["reason"])
+        with st.expander("Show Prefilter Checks"):
+            st.json(res["prefilter"]["checks"])
+    else:
+        if "duplicate_of" in res:
+            st.info(f"Near-duplicate of {res['duplicate_of']} ({res['similarity']:.0%} similar): its analysis was reused.")
+        with st.expander("Show Extracted JSON Data"):
+            st.json(res["data"])
+
+        score_result = res["score"]
+        final_score = score_result["final_score"]
+        reasoning = score_result["reasoning"]
+        breakdown = score_result["breakdown"]
+
+        calculation_steps = score_result.get("calculation_steps", [])
+
+        if final_score >= 80:
+            score_color = "green"
+        elif final_score >= 50:
+            score_color = "orange"
+        else:
+            score_color = "red"
+
+        st.subheader("Scoring Analysis")
+        
+        st.markdown(f"""
+        <div style="border: 2px solid {score_color}; padding: 20px; border-radius: 10px; text-align: center;">
+            <h1 style="color: {score_color}; margin:0;">{final_score} / 100</h1>
+            <p>Match Score</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.write("")
+
+        # Labels follow the profile the result was scored with
+        weights = profile_value(res.get("scoring_profile"), "weights")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(f"Skills ({weight_label(weights['skills'])})", f"{breakdown['skills']}%", 
+                    help="the skills that candidate has / required total skills from job description")
+        
+        col2.metric(f"Experience ({weight_label(weights['experience'])})", f"{breakdown['experience']}%", 
+                    help="the experience year that candidate has / required total experience year from job description")
+        
+        col3.metric(f"Education ({weight_label(weights['education'])})", f"{breakdown['education']}%", 
+                    help="candidate education level / required education level from job description")
+        
+        col4.metric(f"Bonus ({weight_label(weights['bonus'])})", f"{breakdown['bonus']}%", 
+                    help="preferred skills that candidate has / total preferred skills from job description")
+
+        st.write("")
+
+        with st.expander("View Scoring Proof (Deterministic Logic)"):
+            for step in calculation_steps:
+                st.write(step)
+
+        st.markdown("### Detailed Reasoning")
+        if not reasoning:
+            st.info("Perfect match! No negative findings.")
+        else:
+            for item in reasoning:
+                if "Eliminated" in item:
+                    st.error(f"{item}")
+                elif "Missing" in item or "Low" in item or "Little" in item:
+                    st.warning(f"{item}")
+                elif "Plus" in item or "Overqualified" in item:
+                    st.success(f"{item}") 
+                else:
+                    st.info(f"ℹ{item}")
+
+        years = breakdown.get("years_calc", {})
+        if years:
+            st.caption(f"""
+            **Experience Calculation Logic:** 
+            Required: {years['required']} years | 
+            Candidate Total: {years['adjusted_total']} adjusted years 
+            (Primary: {years['primary']}y + Secondary: {years['secondary']}y)
+            """)
+
+    st.markdown("---")
+
+
+# METRICS_PORT / METRICS_FILE (no-op on reruns)
+metrics.setup_from_env()
 
 if "job_saved" not in st.session_state:
     st.session_state.job_saved = False
@@ -9,6 +129,31 @@ if "job_saved" not in st.session_state:
 if "job_analysis_result" not in st.session_state:
     st.session_state.job_analysis_result = None
 
+if "resume_results" not in st.session_state:
+    st.session_state.resume_results = {}
+
+# Near-duplicate index per JD hash (utils/dedup.py)
+if "dedup_indexes" not in st.session_state:
+    st.session_state.dedup_indexes = {}
+
+cache_stats = get_cache_stats()
+st.sidebar.caption(
+    f"LLM cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+    f"(all sessions: {cache_stats.get('total_hits', 0)} / {cache_stats.get('total_misses', 0)})"
+)
+parse_stats = get_parse_stats()
+if parse_stats["total"]:
+    st.sidebar.caption(
+        f"LLM answers: {parse_stats['salvage_rate']:.0%} salvaged / {parse_stats['failure_rate']:.0%} unparseable "
+        f"({parse_stats['retries']} targeted retries)"
+    )
+compaction_stats = get_compaction_stats()
+if compaction_stats["raw_tokens"]:
+    st.sidebar.caption(
+        f"Resume text: ~{compaction_stats['tokens']:,} tokens sent instead of ~{compaction_stats['raw_tokens']:,} "
+        f"({compaction_stats['saved_ratio']:.0%} saved by compaction)"
+    )
+
 st.title("Resume Analyser")
 st.markdown("---")
 
@@ -19,6 +164,8 @@ if st.button("Save Job Description"):
     st.session_state.job_saved = True
     st.session_state.job_description = job_desc
     st.session_state.job_analysis_result = None
+    st.session_state.resume_results = {}
+    st.session_state.dedup_indexes = {}
 
 if st.session_state.job_saved:
     st.success("Job Description Saved!")
@@ -32,117 +179,200 @@ if st.session_state.job_saved:
 
     st.subheader("Resume/CV")
     uploaded_file = st.file_uploader("Upload the Resume/CV", type=["pdf", "txt"], accept_multiple_files=True)
+    use_prefilter = st.checkbox(
+        "Reject clear license/location mismatches before the AI analysis",
+        help="Deterministic text check of the required licenses and the job location. Resumes that never mention a required license, or whose contact address is in another state, are rejected. Uncertain cases are always sent to the AI."
+    )
+    use_dedup = st.checkbox(
+        "Reuse the AI analysis for near-duplicate resumes",
+        help="Resumes that are almost identical to one already analyzed for this job (re-applications, the same CV sent by several agencies) reuse its analysis instead of a new AI call."
+    )
+    scoring_profiles = load_profiles()
+    profile_name = st.selectbox(
+        "Scoring profile",
+        list(scoring_profiles),
+        help="How much skills, experience, education and preferred skills count. Changing it re-scores the analyzed resumes instantly, without new AI calls."
+    )
+    scoring_profile = scoring_profiles[profile_name]
 
     if uploaded_file:
         st.success("Files Uploaded!")
         st.markdown("---")
 
-        files_data = []
-        for i in uploaded_file:
-            if i.type == "text/plain":
-                text = str(i.read(), "utf-8")
-            else:
-                text = extract_text_from_pdf(i)
-            files_data.append({"name": i.name, "text": text})
-
-        results = []
-        with st.spinner("Analyzing All Resumes Simultaneously..."):
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future_to_file = {
-                    executor.submit(
-                        extract_data_with_gemini, 
-                        file["text"],              
-                        "resume",                  
-                        st.session_state.job_analysis_result
-                    ): file["name"] for file in files_data
-                }
-
-                for future in concurrent.futures.as_completed(future_to_file):
-                    name = future_to_file[future]
-                    try:
-                        data = future.result()
-                        results.append({"name": name, "data": data})
-                    except Exception as e:
-                        results.append({"name": name, "error": str(e)})
-
-        for res in results:
-            st.header(res["name"])
-            
-            if "error" in res:
-                st.error(f"Error: {res['error']}")
+        # Results are kept per session, keyed by file content hash + JD hash,
+        # so reruns (expanders, buttons...) only process newly added files
+        jd_hash = hash_text(json.dumps([st.session_state.job_analysis_result, use_prefilter, use_dedup], sort_keys=True))
+
+        file_keys = [f"{hash_stream(i)}:{jd_hash}" for i in uploaded_file]
+
+        # Failures (rate limits, unreadable answers) are shown for the run they happened in and retried on the next one
+        for key in file_keys:
+            if "error" in st.session_state.resume_results.get(key, {}):
+                del st.session_state.resume_results[key]
+
+        # The uploads are only read in chunks (hashing, spooling to disk); see utils/ingest.py
+        new_files = [
+            {"key": key, "name": i.name, "file": i}
+            for i, key in zip(uploaded_file, file_keys)
+            if key not in st.session_state.resume_results
+        ]
+
+        # Every result is scored once and rendered as soon as it completes;
+        # the leaderboard and the progress counters are updated in place
+        reference_date = datetime.datetime.now()
+        store = st.session_state.resume_results
+
+        st.subheader("Leaderboard")
+        progress_bar = st.progress(0.0)
+        status_text = st.empty()
+        leaderboard = st.empty()
+        st.markdown("---")
+        details = st.container()
+
+        def refresh():
+            done = [store[key] for key in file_keys if key in store]
+            failed = sum(1 for res in done if "error" in res)
+            progress_bar.progress(len(done) / len(file_keys), text=f"{len(done)} / {len(file_keys)} resumes")
+            status_text.caption(
+                f"Completed: {len(done) - failed} | Failed: {failed} | In progress: {len(file_keys) - len(done)}"
+            )
+            leaderboard.dataframe(leaderboard_rows(done), width="stretch", hide_index=True)
+
+        def complete(key, res):
+            if "data" in res:
+                with metrics.timer("score"):
+                    res["score"] = calculate_score(
+                        st.session_state.job_analysis_result, res["data"], reference_date, scoring_profile
+                    )
+                res["reference_date"] = reference_date
+                res["scoring_profile"] = scoring_profile
+                metrics.inc("resumes_total", outcome="scored")
             else:
-                with st.expander("Show Extracted JSON Data"):
-                    st.json(res["data"])
-                
-                score_result = calculate_score(
-                    st.session_state.job_analysis_result, 
-                    res["data"]
+                metrics.inc("resumes_total", outcome="prefiltered" if "prefilter" in res else "failed")
+            store[key] = res
+            with details:
+                render_result(res)
+            refresh()
+
+        # Results scored under another profile are re-scored from their stored analysis (no AI call)
+        for key in file_keys:
+            res = store.get(key)
+            if res is not None and "score" in res and res["scoring_profile"] != scoring_profile:
+                res["score"] = calculate_score(
+                    st.session_state.job_analysis_result, res["data"], res["reference_date"], scoring_profile
                 )
-                
-                final_score = score_result["final_score"]
-                reasoning = score_result["reasoning"]
-                breakdown = score_result["breakdown"]
+                res["scoring_profile"] = scoring_profile
 
-                calculation_steps = score_result.get("calculation_steps", [])
+        for key in file_keys:
+            if key in store:
+                with details:
+                    render_result(store[key])
+        refresh()
 
-                if final_score >= 80:
-                    score_color = "green"
-                elif final_score >= 50:
-                    score_color = "orange"
-                else:
-                    score_color = "red"
-
-                st.subheader("Scoring Analysis")
-                
-                st.markdown(f"""
-                <div style="border: 2px solid {score_color}; padding: 20px; border-radius: 10px; text-align: center;">
-                    <h1 style="color: {score_color}; margin:0;">{final_score} / 100</h1>
-                    <p>Match Score</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.write("")
-
-                col1, col2, col3, col4 = st.columns(4)
-                col1.metric("Skills (30%)", f"{breakdown['skills']}%", 
-                            help="the skills that candidate has / required total skills from job description")
-                
-                col2.metric("Experience (45%)", f"{breakdown['experience']}%", 
-                            help="the experience year that candidate has / required total experience year from job description")
-                
-                col3.metric("Education (15%)", f"{breakdown['education']}%", 
-                            help="candidate education level / required education level from job description")
-                
-                col4.metric("Bonus (10%)", f"{breakdown['bonus']}%", 
-                            help="preferred skills that candidate has / total preferred skills from job description")
-
-                st.write("")
-
-                with st.expander("View Scoring Proof (Deterministic Logic)"):
-                    for step in calculation_steps:
-                        st.write(step)
-
-                st.markdown("### Detailed Reasoning")
-                if not reasoning:
-                    st.info("Perfect match! No negative findings.")
+        # Uploads are processed in bounded chunks: while one chunk's resumes are analyzed, the next one is parsed,
+        # and every resume's text is released once it is scored (utils/ingest.py). One ExtractionSession runs the
+        # AI analysis of the whole upload, so the RPM/TPM limits hold across chunks and a chunk does not wait for
+        # the slowest call of the previous one; at most INGEST_MAX_IN_FLIGHT parsed texts wait for the AI.
+        # Near-duplicates of a resume analyzed (or being analyzed) for this JD wait for that analysis instead of
+        # their own AI call: {original key: [(file, similarity)]}
+        dedup_index = st.session_state.dedup_indexes.setdefault(jd_hash, DedupIndex()) if use_dedup else None
+        duplicates_of = {}
+
+        def analyze(session, files):
+
+            def on_result(index, data):
+                file = files[index]
+                if file.get("entry") is not None:
+                    dedup_index.resolve(file["entry"], data)
+                if data is None:
+                    complete(file["key"], {"name": file["name"], "error": "Gemini did not return valid data"})
                 else:
-                    for item in reasoning:
-                        if "Eliminated" in item:
-                            st.error(f"{item}")
-                        elif "Missing" in item or "Low" in item or "Little" in item:
-                            st.warning(f"{item}")
-                        elif "Plus" in item or "Overqualified" in item:
-                            st.success(f"{item}") 
-                        else:
-                            st.info(f"ℹ{item}")
-
-                years = breakdown.get("years_calc", {})
-                if years:
-                    st.caption(f"""
-                    **Experience Calculation Logic:** 
-                    Required: {years['required']} years | 
-                    Candidate Total: {years['adjusted_total']} adjusted years 
-                    (Primary: {years['primary']}y + Secondary: {years['secondary']}y)
-                    """)
-
-            st.markdown("---")
\ No newline at end of file
+                    complete(file["key"], {"name": file["name"], "data": data})
+                orphans = []
+                for duplicate, similarity in duplicates_of.pop(file["key"], []):
+                    if data is None:
+                        # The original failed: the duplicate is analyzed on its own
+                        duplicate["entry"] = None
+                        orphans.append(duplicate)
+                    else:
+                        dedup_index.add_duplicate(file["entry"], duplicate["key"], duplicate["name"], similarity)
+                        complete(duplicate["key"], {"name": duplicate["name"], "data": data,
+                                                    "duplicate_of": file["name"], "similarity": similarity})
+                if orphans:
+                    analyze(session, orphans)
+
+            session.submit([file["text"] for file in files], on_result)
+
+        def process_chunk(session, documents):
+            files_data = []
+            for document in documents:
+                if document["error"]:
+                    complete(document["key"], {"name": document["name"], "error": document["error"]})
+                    continue
+
+                if use_prefilter:
+                    decision = prefilter_resume(document["text"], st.session_state.job_analysis_result)
+                    if not decision["passed"]:
+                        complete(document["key"], {"name": document["name"], "prefilter": decision})
+                        continue
+
+                files_data.append({"key": document["key"], "name": document["name"], "text": document["text"]})
+
+            if files_data and use_dedup:
+                unique_files = []
+                for file in files_data:
+                    file["entry"], match, similarity = dedup_index.claim(file["key"], file["text"], file["name"])
+                    if match is None:
+                        unique_files.append(file)
+                    elif match.ready.is_set():
+                        dedup_index.add_duplicate(match, file["key"], file["name"], similarity)
+                        complete(file["key"], {"name": file["name"], "data": match.data, "duplicate_of": match.name,
+                                               "similarity": similarity})
+                    else:
+                        duplicates_of.setdefault(match.key, []).append((file, similarity))
+                files_data = unique_files
+
+            if files_data:
+                analyze(session, files_data)
+            session.collect(max_pending=INGEST_MAX_IN_FLIGHT)
+
+        if new_files:
+            with st.spinner("Reading and Analyzing Resumes..."):
+                with ExtractionSession("resume", st.session_state.job_analysis_result) as session:
+                    ingest_stats = ingest(new_files, lambda documents: process_chunk(session, documents))
+                    session.collect()
+                    # Duplicates whose original was claimed by an earlier run that never finished
+                    orphans = [duplicate for waiting in duplicates_of.values() for duplicate, _ in waiting]
+                    duplicates_of.clear()
+                    if orphans:
+                        for file in orphans:
+                            file["entry"] = None
+                        analyze(session, orphans)
+                        session.collect()
+            st.session_state.ingest_stats = ingest_stats
+
+        if new_files:
+            metrics.write_metrics_file()
+
+        ingest_stats = st.session_state.get("ingest_stats")
+        if ingest_stats:
+            st.caption(
+                f"Memory: {ingest_stats['rss'] / 2**20:.0f} MiB resident, peak {ingest_stats['peak_rss'] / 2**20:.0f} MiB "
+                f"({ingest_stats['documents']} resumes in {ingest_stats['chunks']} chunks, "
+                f"{ingest_stats['spooled_bytes'] / 2**20:.1f} MiB spooled to disk)"
+            )
+
+        if use_prefilter:
+            rejected = sum(1 for key in file_keys if "prefilter" in store.get(key, {}))
+            st.info(f"Prefilter: {rejected} of {len(file_keys)} resumes rejected without an AI call.")
+
+        if use_dedup:
+            reused = [store[key] for key in file_keys if "duplicate_of" in store.get(key, {})]
+            st.info(f"Near-duplicates: {len(reused)} of {len(file_keys)} resumes reused an earlier analysis.")
+            if reused:
+                with st.expander("Show Duplicate Clusters"):
+                    clusters = {}
+                    for res in reused:
+                        clusters.setdefault(res["duplicate_of"], []).append(f"{res['name']} ({res['similarity']:.0%})")
+                    for original, copies in clusters.items():
+                        st.markdown(f"**{original}**: {', '.join(copies)}")
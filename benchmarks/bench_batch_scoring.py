@@ -0,0 +1,60 @@
+# Batch scoring benchmark: parity with calculate_score, then timing
+# Usage: python -m benchmarks.bench_batch_scoring [pool_size ...]
+
+import random
+import sys
+import time
+
+from utils.batch_scorer import calculate_scores_batch
+from utils.scorer import calculate_score
+
+from .synthetic import generate_job, generate_pool
+
+
+def parity_jobs():
+    rng = random.Random(42)
+    return [
+        generate_job(rng),
+        generate_job(rng, required_skills=0, preferred_skills=0),
+        generate_job(rng, required_skills=10, preferred_skills=0),
+        generate_job(rng, licenses=1, remote=False),
+        generate_job(rng, licenses=2, remote=False),
+    ]
+
+
+def check_parity(pool_size=2000):
+    pool = generate_pool(pool_size, seed=7)
+    for job in parity_jobs():
+        batch = calculate_scores_batch(job, pool)
+        for candidate, batch_result in zip(pool, batch):
+            single = calculate_score(job, candidate)
+            assert batch_result["final_score"] == single["final_score"], (candidate, job)
+            assert batch_result["breakdown"] == single["breakdown"], (candidate, job)
+    print(f"parity: OK ({pool_size} candidates x {len(parity_jobs())} jobs)")
+
+
+def run(pool_size):
+    job = generate_job(random.Random(1), licenses=1, remote=False)
+    pool = generate_pool(pool_size, seed=pool_size)
+
+    start = time.perf_counter()
+    for candidate in pool:
+        calculate_score(job, candidate)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    calculate_scores_batch(job, pool)
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    calculate_scores_batch(job, pool, as_arrays=True)
+    arrays_seconds = time.perf_counter() - start
+
+    print(f"{pool_size:>7} candidates | calculate_score loop: {loop_seconds:.3f}s | "
+          f"batch: {batch_seconds:.3f}s | batch (arrays): {arrays_seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    check_parity()
+    for size in [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]:
+        run(size)
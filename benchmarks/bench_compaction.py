@@ -0,0 +1,69 @@
+# Resume compaction benchmark: estimated prompt tokens of the raw PDF text vs the compacted text
+# Synthetic resumes get real-world noise (contact line, page footers, publications / interests / references) and go
+# through render_pdf + read_pdf_text. Every field the scorer uses (name, location, skills with levels, roles with
+# dates, education, licenses) is checked to still be in the compacted text; with a tight budget some are lost.
+# Usage: python -m benchmarks.bench_compaction [--count 200] [--bullets 4] [--budgets 0 3000 600 400]
+
+import argparse
+import io
+import random
+import statistics
+import sys
+import time
+
+from utils.compaction import compact_text
+from utils.pdf_pool import read_pdf_text
+from utils.ratelimit import estimate_tokens
+
+from .synthetic import add_resume_noise, generate_documents, render_pdf
+
+
+# Lines of the clean rendering (render_resume_text) that carry an extracted field
+def field_lines(candidate):
+    lines = [candidate["candidate_name"], candidate["education_level"]] + list(candidate["licenses"])
+    if candidate["location"] != "Unknown":
+        lines.append(candidate["location"])
+    lines += [f"{skill['name']} ({skill['level']})" for skill in candidate["skills"]]
+    lines += [f"{role['role']}, {role['company']} ({role['start']} - {role['end']})" for role in candidate["work_history"]]
+    return lines
+
+
+def missing_fields(candidate, text):
+    present = set(text.splitlines())
+    return sum(1 for line in field_lines(candidate) if line not in present)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--bullets", type=int, default=4, help="Bullets per role (document size)")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[0, 3000, 600, 400],
+                        help="Token budgets to compare (0 = no budget)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(5)
+    documents = generate_documents(args.count, seed=5, bullets_per_role=args.bullets)
+    texts = [read_pdf_text(io.BytesIO(render_pdf(add_resume_noise(document["text"], rng))))[0]
+             for document in documents]
+    raw_tokens = sum(estimate_tokens(text) for text in texts)
+    print(f"{args.count} resumes, ~{raw_tokens / args.count:.0f} tokens each as parsed from the PDF")
+
+    for budget in args.budgets:
+        timings = []
+        tokens = missing = truncated = over_budget = 0
+        for document, text in zip(documents, texts):
+            start = time.perf_counter()
+            compacted, stats = compact_text(text, budget)
+            timings.append(time.perf_counter() - start)
+            tokens += stats["tokens"]
+            truncated += stats["truncated"] or stats["bullets_dropped"] > 0
+            over_budget += stats["over_budget"]
+            missing += missing_fields(document["candidate"], compacted)
+        print(f"  budget {budget or 'none':>5}: ~{tokens / args.count:.0f} tokens/resume "
+              f"({1 - tokens / raw_tokens:.0%} fewer) | {statistics.median(timings) * 1000:.2f}ms p50 | "
+              f"{truncated} cut, {over_budget} still over budget | {missing} field lines lost")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
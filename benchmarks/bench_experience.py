@@ -0,0 +1,104 @@
+# Experience calculator benchmark: interval arithmetic vs the previous month-string sets
+# Usage: python -m benchmarks.bench_experience [roles_per_candidate ...]
+
+import datetime
+import random
+import sys
+import time
+
+from utils.scorer import calculate_total_experience
+
+from .synthetic import generate_work_history
+
+
+# Previous implementation, kept here as the reference for output parity
+def legacy_months_between(start_date_str, end_date_str, now):
+    if not start_date_str or start_date_str.lower() == "unknown":
+        return set()
+    try:
+        start = datetime.datetime.strptime(start_date_str, "%Y-%m")
+    except ValueError:
+        return set()
+    if not end_date_str or end_date_str.lower() == "present":
+        end = now
+    else:
+        try:
+            end = datetime.datetime.strptime(end_date_str, "%Y-%m")
+        except ValueError:
+            end = now
+    months_set = set()
+    curr = start
+    while curr <= end:
+        months_set.add(curr.strftime("%Y-%m"))
+        if curr.month == 12:
+            curr = datetime.datetime(curr.year + 1, 1, 1)
+        else:
+            curr = datetime.datetime(curr.year, curr.month + 1, 1)
+    return months_set
+
+
+def legacy_total_experience(work_history, now):
+    primary_months_set = set()
+    secondary_months_set = set()
+    if not work_history:
+        return {"primary_years": 0.0, "secondary_years": 0.0}
+    for role in work_history:
+        role_months = legacy_months_between(role.get("start", "Unknown"), role.get("end", "Present"), now)
+        relevance = role.get("relevance", "Irrelevant")
+        if relevance == "Primary":
+            primary_months_set.update(role_months)
+        elif relevance == "Secondary":
+            secondary_months_set.update(role_months)
+    secondary_months_set = secondary_months_set - primary_months_set
+    return {
+        "primary_years": round(len(primary_months_set) / 12, 1),
+        "secondary_years": round(len(secondary_months_set) / 12, 1)
+    }
+
+
+EDGE_CASES = [
+    [],
+    [{"start": "Unknown", "end": "Unknown", "relevance": "Primary"}],
+    [{"start": "2020-05", "end": "2019-01", "relevance": "Primary"}],
+    [{"start": "2020-05", "end": "garbage", "relevance": "Secondary"}],
+    [{"start": "2020-5", "end": None, "relevance": "Primary"}],
+    [{"start": "2019-12", "end": "2020-01", "relevance": "Primary"},
+     {"start": "2020-02", "end": "2020-02", "relevance": "Primary"},
+     {"start": "2018-01", "end": "Present", "relevance": "Secondary"},
+     {"start": "2010-01", "end": "2012-01", "relevance": "Irrelevant"}],
+]
+
+
+def check_parity(count=5000):
+    now = datetime.datetime.now()
+    rng = random.Random(11)
+    histories = EDGE_CASES + [generate_work_history(rng, rng.randint(1, 30)) for _ in range(count)]
+    for history in histories:
+        assert calculate_total_experience(history, now) == legacy_total_experience(history, now), history
+    print(f"parity: OK ({len(histories)} work histories)")
+
+
+def run(roles, count=2000):
+    now = datetime.datetime.now()
+    rng = random.Random(roles)
+    # Long careers starting in the 70s with many overlapping roles
+    histories = [generate_work_history(rng, roles, start_year=1975) for _ in range(count)]
+
+    start = time.perf_counter()
+    for history in histories:
+        legacy_total_experience(history, now)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for history in histories:
+        calculate_total_experience(history, now)
+    interval_seconds = time.perf_counter() - start
+
+    print(f"{roles:>3} roles x {count} candidates | month sets: {legacy_seconds:.3f}s | "
+          f"intervals: {interval_seconds:.3f}s | speedup: {legacy_seconds / interval_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    check_parity()
+    for roles in [int(arg) for arg in sys.argv[1:]] or [4, 15, 40]:
+        run(roles)
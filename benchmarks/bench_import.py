@@ -0,0 +1,54 @@
+# Import-time benchmark (python -X importtime) for the entry points, in fresh interpreters
+# Usage: python -m benchmarks.bench_import [module ...] [--runs N]
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+MODULES = ["utils.scorer", "utils.batch_scorer", "utils.extractor", "utils.batch"]
+HEAVY_MODULES = ["langchain_google_genai", "pdfplumber", "numpy"]
+IMPORTTIME_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s+(\S.*)$")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Cumulative microseconds for "module" and the heavy dependencies it pulled in
+def measure_import(module):
+    code = f"import sys, json; import {module}; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True, cwd=ROOT
+    )
+    cumulative = None
+    for line in process.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match and match.group(3).strip() == module:
+            cumulative = int(match.group(2))
+    return cumulative, json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def run(modules, runs=5):
+    results = []
+    for module in modules:
+        timings = []
+        heavy = []
+        for _ in range(runs):
+            cumulative, heavy = measure_import(module)
+            timings.append(cumulative)
+        results.append({"module": module, "ms": round(statistics.median(timings) / 1000, 1), "heavy_imports": heavy})
+        print(f"{module:<20} {statistics.median(timings) / 1000:>8.1f} ms | heavy imports: {', '.join(heavy) or '-'}")
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the import time of the project entry points.")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (median is reported)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run(args.modules, args.runs)
@@ -0,0 +1,115 @@
+# Upload ingestion benchmark: peak RSS of reading every file up front (the old app path) vs utils.ingest
+# Every run is a fresh process, so its peak RSS only covers that run. PDFs are padded to pdf_kib to stand in for
+# the embedded fonts and images of real resumes; the LLM is the fake backend with the cache off.
+# Usage: python -m benchmarks.bench_ingest [--counts 100 400 1600] [--pdf-kib 200] [--max-in-flight 16]
+#                                        [--latency fixed:0.001]
+
+import argparse
+import datetime
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from utils import extractor
+from utils.ingest import ingest, memory_usage
+from utils.pdf_pool import extract_texts_parallel
+from utils.scorer import calculate_score
+
+from .fake_llm import FakeLLM
+from .synthetic import generate_documents, generate_job, render_pdf
+
+
+def write_pdfs(directory, count, pdf_kib):
+    paths = []
+    for index, document in enumerate(generate_documents(count, seed=3, bullets_per_role=3)):
+        path = os.path.join(directory, f"resume_{index:05d}.pdf")
+        with open(path, "wb") as f:
+            f.write(render_pdf(document["text"], padding_bytes=pdf_kib * 1024))
+        paths.append(path)
+    return paths
+
+
+# Old app path: every file read into memory, every text extracted, then one extract_batch for all of them
+def run_eager(paths, job, client, reference_date):
+    documents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            documents.append({"name": os.path.basename(path), "data": f.read()})
+    parsed = extract_texts_parallel(documents)
+    texts = [document["text"] for document in parsed if not document["error"]]
+    results = extractor.extract_batch(texts, "resume", job, rpm=0, tpm=0, client=client)
+    return [calculate_score(job, data, reference_date) for data in results if data is not None]
+
+
+# App path: one ExtractionSession for the whole upload, at most max_in_flight parsed texts waiting for the LLM
+def run_ingest(paths, job, client, reference_date, max_in_flight):
+    scores = []
+
+    def on_result(index, data):
+        if data is not None:
+            # Results keep the score, not the text
+            scores.append(calculate_score(job, data, reference_date))
+
+    with extractor.ExtractionSession("resume", job, rpm=0, tpm=0, client=client) as session:
+
+        def process_chunk(items):
+            session.submit([item["text"] for item in items if not item["error"]], on_result)
+            session.collect(max_pending=max_in_flight)
+
+        documents = ({"key": path, "name": os.path.basename(path), "path": path} for path in paths)
+        stats = ingest(documents, process_chunk, max_in_flight)
+        session.collect()
+    return scores, stats
+
+
+def child(mode, directory, count, max_in_flight, latency):
+    extractor.llm_cache.enabled = False
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))[:count]
+    job = generate_job(random.Random(4))
+    client = FakeLLM(latency=latency, seed=1)
+    reference_date = datetime.datetime(2025, 1, 1)
+    start = time.perf_counter()
+    if mode == "eager":
+        scores = run_eager(paths, job, client, reference_date)
+    else:
+        scores, _ = run_ingest(paths, job, client, reference_date, max_in_flight)
+    print(json.dumps({"scored": len(scores), "seconds": time.perf_counter() - start, **memory_usage()}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 400, 1600])
+    parser.add_argument("--pdf-kib", type=int, default=200)
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    parser.add_argument("--latency", default="fixed:0.001",
+                        help="Fake LLM latency (benchmarks.fake_llm), e.g. lognormal:0.8,0.4 to compare throughput")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "DIRECTORY", "COUNT"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.child[0], args.child[1], int(args.child[2]), args.max_in_flight, args.latency)
+        return 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_pdfs(directory, max(args.counts), args.pdf_kib)
+        for count in args.counts:
+            line = [f"{count:>6} PDFs x {args.pdf_kib} KiB"]
+            for mode in ("eager", "ingest"):
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_ingest", "--max-in-flight", str(args.max_in_flight),
+                     "--latency", args.latency, "--child", mode, directory, str(count)],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                line.append(f"{mode}: peak {result['peak_rss'] / 2**20:.0f} MiB, {result['seconds']:.1f}s "
+                            f"({result['scored']} scored)")
+            print(" | ".join(line))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# Matching benchmark: inverted-index top-k vs scoring every stored candidate
+# Usage: python -m benchmarks.bench_matching [pool_size ...]
+
+import datetime
+import random
+import sys
+import time
+
+from utils.matching import MatchStore
+from utils.scorer import score_candidate
+
+from .synthetic import SKILL_POOL, generate_job, generate_pool
+
+
+def run(pool_size, k=25, domains=10, queries=5):
+    reference_date = datetime.datetime.now()
+    pool = generate_pool(pool_size, seed=pool_size, domains=domains)
+
+    start = time.perf_counter()
+    store = MatchStore()
+    for index, candidate in enumerate(pool):
+        store.add_candidate(index, candidate)
+    build_seconds = time.perf_counter() - start
+
+    rng = random.Random(3)
+    chunk = len(SKILL_POOL) // domains
+    indexed_seconds = brute_seconds = 0.0
+    scored = 0
+    for _ in range(queries):
+        job = generate_job(rng, required_skills=3, preferred_skills=1)
+        # JD skills from one domain, like a real requisition
+        domain = rng.randrange(domains)
+        for skill, name in zip(job["required_skills"], rng.sample(SKILL_POOL[domain * chunk:(domain + 1) * chunk], 3)):
+            skill["name"] = name
+
+        start = time.perf_counter()
+        top = store.top_candidates(job, k, reference_date)
+        indexed_seconds += time.perf_counter() - start
+        scored += len(store.candidate_ids_for_job(job))
+
+        start = time.perf_counter()
+        brute = sorted(
+            ((index, score_candidate(job, candidate, reference_date)) for index, candidate in enumerate(pool)),
+            key=lambda item: (-item[1].final_score, str(item[0]))
+        )[:k]
+        brute_seconds += time.perf_counter() - start
+
+        # Candidates without any required skill are never in the indexed result; above them the ranking is identical
+        brute_with_skill = [item for item in brute if item[0] in store.candidate_ids_for_job(job)]
+        assert [item[0] for item in top][:len(brute_with_skill)] == [item[0] for item in brute_with_skill]
+
+    print(f"{pool_size:>7} profiles | index build: {build_seconds:.2f}s | "
+          f"top-{k} indexed: {indexed_seconds / queries * 1000:.0f}ms/query "
+          f"({scored / queries / pool_size:.0%} of pool scored) | brute force: {brute_seconds / queries * 1000:.0f}ms/query")
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [10000, 100000]:
+        run(size)
@@ -0,0 +1,59 @@
+# Scoring profile re-ranking benchmark: ComponentTable (stored components) vs score_candidate for the whole pool
+# Every profile's ranking is checked against scoring each candidate again (same ids, same scores, same order)
+# Usage: python -m benchmarks.bench_profiles [pool_size ...]
+
+import datetime
+import random
+import sys
+import time
+
+from utils.scorer import score_candidate
+from utils.scoring_profiles import ComponentTable, load_profiles, make_profile
+
+from .synthetic import generate_job, generate_pool
+
+
+def rescore_all(job, pool, reference_date, scoring_profile):
+    scored = [(index, score_candidate(job, candidate, reference_date, scoring_profile).final_score)
+              for index, candidate in enumerate(pool)]
+    return sorted(scored, key=lambda item: (-item[1], str(item[0])))
+
+
+def run(pool_size):
+    reference_date = datetime.datetime(2025, 1, 1)
+    rng = random.Random(11)
+    job = generate_job(rng)
+    pool = generate_pool(pool_size, seed=pool_size)
+
+    # What the pipeline stores with every result
+    start = time.perf_counter()
+    components = [score_candidate(job, candidate, reference_date).components() for candidate in pool]
+    table = ComponentTable(components)
+    build_seconds = time.perf_counter() - start
+
+    profiles = list(load_profiles().values()) + [
+        make_profile({"weights": {"skills": 0.25, "experience": 0.25, "education": 0.25, "bonus": 0.25},
+                      "secondary_factor": 0.2, "education_step_penalty": 40,
+                      "skill_level_weights": {"Expert": 2.5}}, "flat")
+    ]
+    rerank_seconds = rescore_seconds = 0.0
+    for scoring_profile in profiles:
+        start = time.perf_counter()
+        ranked = table.rank(scoring_profile)
+        rerank_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        exact = rescore_all(job, pool, reference_date, scoring_profile)
+        rescore_seconds += time.perf_counter() - start
+
+        assert ranked == exact, scoring_profile["name"]
+
+    print(f"{pool_size:>7} candidates | components + table: {build_seconds:.2f}s | "
+          f"re-rank: {rerank_seconds / len(profiles) * 1000:.1f}ms/profile | "
+          f"score_candidate + sort: {rescore_seconds / len(profiles) * 1000:.0f}ms/profile "
+          f"({rescore_seconds / rerank_seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]:
+        run(size)
@@ -0,0 +1,104 @@
+# Queue scaling benchmark: the same batch processed by 1, 2, 4... worker processes against the fake LLM,
+# then a crash-recovery run where one worker is killed mid-batch and its leases expire
+# Usage: python -m benchmarks.bench_queue [--count 200] [--processes 1 2 4] [--threads 2] [--latency fixed:0.3]
+
+import argparse
+import os
+import random
+import signal
+import sys
+import tempfile
+import time
+
+from utils import extractor
+from utils.job_queue import JobQueue
+from utils.worker import start_workers
+
+from .fake_llm import FakeLLM
+from .synthetic import generate_documents, generate_job, render_pdf
+
+
+def write_resumes(directory, count):
+    paths = []
+    for index, document in enumerate(generate_documents(count, seed=9, bullets_per_role=3)):
+        path = os.path.join(directory, f"resume_{index:05d}.pdf")
+        with open(path, "wb") as f:
+            f.write(render_pdf(document["text"]))
+        paths.append(path)
+    return paths
+
+
+def wait_until_finished(queue, batch_id, timeout=600):
+    deadline = time.monotonic() + timeout
+    while not queue.is_finished(batch_id):
+        if time.monotonic() > deadline:
+            raise TimeoutError("Queue did not drain")
+        time.sleep(0.1)
+
+
+def run(paths, job, processes, threads, latency, error_rate, directory):
+    queue = JobQueue(os.path.join(directory, f"queue_{processes}.sqlite3"))
+    batch_id = queue.enqueue_batch(job, paths)
+    client = FakeLLM(latency=latency, error_rate=error_rate, seed=processes)
+    start = time.perf_counter()
+    workers = start_workers(processes, queue_path=queue.path, threads=threads, batch_id=batch_id,
+                            exit_when_empty=True, poll_interval=0.05, client=client)
+    for worker in workers:
+        worker.join()
+    seconds = time.perf_counter() - start
+    status = queue.status(batch_id)
+    print(f"{processes:>3} processes x {threads} threads | {len(paths)} resumes in {seconds:.2f}s "
+          f"({len(paths) / seconds:.1f}/s) | done {status['done']} dead {status['dead']}")
+    return len(paths) / seconds
+
+
+def crash_recovery(paths, job, threads, latency, directory, lease_seconds=2.0):
+    queue = JobQueue(os.path.join(directory, "queue_crash.sqlite3"), lease_seconds=lease_seconds)
+    batch_id = queue.enqueue_batch(job, paths)
+    client = FakeLLM(latency=latency, seed=1)
+    options = {"queue_path": queue.path, "threads": threads, "batch_id": batch_id, "exit_when_empty": True,
+               "poll_interval": 0.05, "client": client, "lease_seconds": lease_seconds}
+    start = time.perf_counter()
+    victim, survivor = start_workers(2, **options)
+    time.sleep(1.0)
+    os.kill(victim.pid, signal.SIGKILL)
+    victim.join()
+    survivor.join()
+    seconds = time.perf_counter() - start
+    status = queue.status(batch_id)
+    retried = queue._connect().execute(
+        "SELECT COUNT(*) FROM tasks WHERE batch_id = ? AND attempts > 1", (batch_id,)
+    ).fetchone()[0]
+    print(f"crash recovery: 1 of 2 workers killed after 1s | {status['done']}/{status['total']} done, "
+          f"{status['dead']} dead, {retried} tasks re-leased after the lease expired | {seconds:.2f}s")
+    return status["done"] == status["total"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure queue throughput for different worker counts.")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=2)
+    parser.add_argument("--latency", default="fixed:0.3", help="Fake LLM latency (see benchmarks.fake_llm)")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fake 429s, retried through the queue")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Every run must call the (fake) LLM, not the disk cache filled by the previous run
+    extractor.llm_cache.enabled = False
+    job = generate_job(random.Random(4))
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_resumes(directory, args.count)
+        rates = [run(paths, job, processes, args.threads, args.latency, args.error_rate, directory)
+                 for processes in args.processes]
+        print("scaling vs first run: " + ", ".join(
+            f"{processes}p {rate / rates[0]:.2f}x" for processes, rate in zip(args.processes, rates)
+        ))
+        recovered = crash_recovery(paths[:60], job, args.threads, args.latency, directory)
+    return 0 if recovered else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# Top-k ranking benchmark: upper-bound pruning (utils.ranking.top_k) vs scoring every candidate
+# Every query is checked against brute force (same ids, same scores, same order) before timing is reported
+# Usage: python -m benchmarks.bench_ranking [pool_size ...]
+
+import datetime
+import random
+import sys
+import time
+
+from utils.ranking import CandidateProfile, top_k
+from utils.scorer import score_candidate
+
+from .synthetic import generate_job, generate_pool
+
+
+def brute_force(job, pool, k, reference_date):
+    scored = [(index, score_candidate(job, candidate, reference_date)) for index, candidate in enumerate(pool)]
+    return sorted(scored, key=lambda item: (-item[1].final_score, str(item[0])))[:k]
+
+
+def run(pool_size, k=25, queries=8):
+    reference_date = datetime.datetime(2025, 1, 1)
+    pool = generate_pool(pool_size, seed=pool_size)
+
+    start = time.perf_counter()
+    profiles = {index: CandidateProfile(candidate) for index, candidate in enumerate(pool)}
+    profile_seconds = time.perf_counter() - start
+
+    rng = random.Random(7)
+    pruned_seconds = brute_seconds = 0.0
+    scored = 0
+    for query in range(queries):
+        # Mix of remote / on-site JDs, with and without license requirements
+        job = generate_job(rng, licenses=query % 2, remote=query % 4 < 2)
+
+        start = time.perf_counter()
+        stats = {}
+        top = top_k(job, enumerate(pool), k, reference_date, profiles, stats)
+        pruned_seconds += time.perf_counter() - start
+        scored += stats["scored"]
+
+        start = time.perf_counter()
+        brute = brute_force(job, pool, k, reference_date)
+        brute_seconds += time.perf_counter() - start
+
+        assert [(index, result.to_dict()) for index, result in top] == \
+            [(index, result.to_dict()) for index, result in brute]
+
+    print(f"{pool_size:>7} candidates | profiles: {profile_seconds:.2f}s | "
+          f"top-{k} pruned: {pruned_seconds / queries * 1000:.0f}ms/query "
+          f"({1 - scored / (queries * pool_size):.0%} of exact scores skipped) | "
+          f"brute force: {brute_seconds / queries * 1000:.0f}ms/query ({brute_seconds / pruned_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [10000, 50000]:
+        run(size)
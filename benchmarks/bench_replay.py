@@ -0,0 +1,116 @@
+# Replays a recorded LLM cassette (LLM_CASSETTE_MODE=record) against the current build, without calling Gemini
+# Requests are issued on their original arrival schedule (scaled by --time-scale), or back to back with --closed,
+# through the same retry/parse path as production; the recorded responses and latencies stand in for Gemini.
+# Usage: python -m benchmarks.bench_replay .cache/llm_cassette.jsonl [--time-scale 0.1] [--latency-scale 1.0]
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from utils.cassette import CassettePlayer, load_cassette
+from utils.extractor import LLM_MAX_CONCURRENCY, ainvoke_with_retries, parse_llm_content
+
+from .run import compare, environment
+
+
+# One request per recorded call; entries that retry a failed call for the same prompt are served by the retry loop
+def recorded_requests(entries):
+    requests = []
+    failed_keys = set()
+    for entry in sorted(entries, key=lambda entry: entry.get("started_at") or 0):
+        if entry["key"] not in failed_keys:
+            requests.append(entry)
+        if entry.get("error") is not None:
+            failed_keys.add(entry["key"])
+        else:
+            failed_keys.discard(entry["key"])
+    return requests
+
+
+async def replay(path, time_scale=1.0, latency_scale=1.0, concurrency=None, closed=False):
+    player = CassettePlayer(path, latency_scale)
+    requests = recorded_requests(load_cassette(path))
+    first_start = (requests[0].get("started_at") or 0) if requests else 0
+    semaphore = asyncio.Semaphore(concurrency or LLM_MAX_CONCURRENCY)
+    latencies = []
+    state = {"in_flight": 0, "max_in_flight": 0, "errors": 0, "invalid_json": 0}
+    started = time.perf_counter()
+
+    async def run(entry):
+        if not closed:
+            delay = ((entry.get("started_at") or first_start) - first_start) * time_scale
+            await asyncio.sleep(max(0.0, delay - (time.perf_counter() - started)))
+        arrived = time.perf_counter()
+        async with semaphore:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            try:
+                parse_llm_content(await ainvoke_with_retries(entry["prompt"], client=player))
+            except json.JSONDecodeError:
+                state["invalid_json"] += 1
+            except Exception:
+                state["errors"] += 1
+            finally:
+                state["in_flight"] -= 1
+        latencies.append(time.perf_counter() - arrived)
+
+    await asyncio.gather(*(run(entry) for entry in requests))
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "name": "replay",
+        "params": {"cassette": path, "time_scale": time_scale, "latency_scale": latency_scale,
+                   "concurrency": concurrency or LLM_MAX_CONCURRENCY, "closed": closed},
+        "items": len(requests),
+        "repeats": 1,
+        "seconds": round(seconds, 6),
+        "min_seconds": round(seconds, 6),
+        "items_per_second": round(len(requests) / seconds, 3) if seconds else None,
+        "ms_per_item": round(seconds / len(requests) * 1000, 4) if requests else None,
+        "extra": {
+            "latency_p50": round(statistics.median(latencies), 4) if latencies else None,
+            "latency_p95": round(latencies[int(0.95 * (len(latencies) - 1))], 4) if latencies else None,
+            "max_in_flight": state["max_in_flight"],
+            "errors": state["errors"],
+            "invalid_json": state["invalid_json"],
+            "cassette_misses": player.misses,
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded LLM cassette against the current build.")
+    parser.add_argument("cassette", help="JSONL cassette written with LLM_CASSETTE_MODE=record")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiplier for the recorded arrival offsets")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier for the recorded latencies")
+    parser.add_argument("--concurrency", type=int, default=None, help="Defaults to LLM_MAX_CONCURRENCY")
+    parser.add_argument("--closed", action="store_true", help="Ignore arrival times and issue requests back to back")
+    parser.add_argument("--output", default=None, help="Write the result JSON here (benchmarks.run format)")
+    parser.add_argument("--compare", default=None, help="Earlier replay result to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = asyncio.run(replay(args.cassette, args.time_scale, args.latency_scale, args.concurrency, args.closed))
+    extra = result["extra"]
+    print(f"{result['items']} requests in {result['seconds']:.2f}s ({result['items_per_second']:.1f}/s) | "
+          f"latency p50 {extra['latency_p50']}s p95 {extra['latency_p95']}s | max in flight {extra['max_in_flight']} | "
+          f"errors {extra['errors']} | invalid json {extra['invalid_json']} | cassette misses {extra['cassette_misses']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": [result]}, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            if compare(json.load(f), [result]):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+# Score-only fast path benchmark: calculate_score (dict + explanation text) vs score_candidate (ScoreResult)
+# Checks that ScoreResult.to_dict() matches calculate_score, then compares time and memory for a whole pool
+# Usage: python -m benchmarks.bench_score_result [pool_size ...]
+
+import datetime
+import random
+import sys
+import time
+import tracemalloc
+
+from utils.scorer import calculate_score, score_candidate
+
+from .synthetic import generate_job, generate_pool
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+# Peak traced memory while holding every result of the pool
+def peak_memory(fn):
+    tracemalloc.start()
+    results = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return peak
+
+
+def run(pool_size):
+    reference_date = datetime.datetime(2025, 1, 1)
+    job = generate_job(random.Random(1), licenses=1, remote=False)
+    pool = generate_pool(pool_size, seed=pool_size)
+
+    for candidate in pool[:500]:
+        assert score_candidate(job, candidate, reference_date).to_dict() == calculate_score(job, candidate, reference_date)
+
+    full = lambda: [calculate_score(job, candidate, reference_date) for candidate in pool]
+    fast = lambda: [score_candidate(job, candidate, reference_date) for candidate in pool]
+    ranked = lambda: sorted(fast(), key=lambda result: -result.final_score)[:10]
+
+    full_seconds = min(timed(full)[1] for _ in range(3))
+    fast_seconds = min(timed(fast)[1] for _ in range(3))
+    top, _ = timed(ranked)
+    explain_seconds = timed(lambda: [(result.reasoning, result.calculation_steps) for result in top])[1]
+    full_memory = peak_memory(full)
+    fast_memory = peak_memory(fast)
+
+    print(f"{pool_size:>7} candidates | calculate_score: {full_seconds:.3f}s, {full_memory / 2**20:.1f} MiB | "
+          f"score_candidate: {fast_seconds:.3f}s, {fast_memory / 2**20:.1f} MiB "
+          f"({full_seconds / fast_seconds:.2f}x faster) | top-10 explanations: {explain_seconds * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [10000, 100000]:
+        run(size)
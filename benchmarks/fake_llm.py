@@ -0,0 +1,132 @@
+# Fake LLM backend for benchmarks: canned JSON in the shape each prompt asks for, after a simulated latency
+# Drop-in for the "client=" argument of the extractor functions (invoke / ainvoke returning .content)
+
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+
+from utils.cache import hash_text
+from utils.prompts import (
+    BATCH_RESUME_PROMPT, JOB_DESCRIPTION_PROMPT, PROFILE_PROMPT, RELEVANCE_PROMPT, RESUME_PROMPT
+)
+
+from .synthetic import generate_candidate, generate_job
+
+# The literal text before the first placeholder identifies the prompt, longest first
+PROMPT_TYPES = sorted(
+    [
+        (JOB_DESCRIPTION_PROMPT, "job_description"), (RESUME_PROMPT, "resume"), (PROFILE_PROMPT, "profile"),
+        (RELEVANCE_PROMPT, "relevance"), (BATCH_RESUME_PROMPT, "resume_batch"),
+    ],
+    key=lambda item: -len(item[0].split("{", 1)[0]),
+)
+RESUME_TEXT_PATTERN = re.compile(r"RESUME TEXT:\n(.*?)\n-{16}", re.S)
+BATCH_ITEM_PATTERN = re.compile(r"RESUME ID: (R\d+)\nRESUME TEXT:\n(.*?)\n-{16}", re.S)
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+
+class FakeResponse:
+
+    def __init__(self, content):
+        self.content = content
+        self.usage_metadata = None
+
+
+# "fixed:0.5", "uniform:0.2,1.5" or "lognormal:0.8,0.4" (median seconds, sigma); scale multiplies every sample
+class LatencyModel:
+
+    def __init__(self, spec="lognormal:0.8,0.4", seed=0, scale=1.0):
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(value) for value in params.split(",") if value]
+        self.scale = scale
+        self.spec = spec
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self):
+        with self._lock:
+            if self.kind == "fixed":
+                value = self.params[0] if self.params else 0.0
+            elif self.kind == "uniform":
+                value = self._rng.uniform(self.params[0], self.params[1])
+            else:
+                value = self._rng.lognormvariate(math.log(self.params[0]), self.params[1])
+        return value * self.scale
+
+
+def prompt_type(prompt):
+    for template, type in PROMPT_TYPES:
+        if prompt.startswith(template.split("{", 1)[0]):
+            return type
+    return "unknown"
+
+
+# Same text -> same canned candidate, so batched and single calls give the same answer
+def _rng_for(text):
+    return random.Random(int(hash_text(text)[:16], 16))
+
+
+def candidate_for(resume_text, profile=False):
+    candidate = generate_candidate(_rng_for(resume_text))
+    if profile:
+        for role in candidate["work_history"]:
+            role.pop("relevance")
+            role["summary"] = f"{role['role']} at {role['company']}"
+    return candidate
+
+
+def canned_response(prompt):
+    type = prompt_type(prompt)
+    if type == "job_description":
+        return generate_job(_rng_for(prompt))
+    if type == "relevance":
+        indexes = [int(index) for index in re.findall(r'"index": (\d+)', prompt.rsplit("WORK HISTORY:", 1)[-1])]
+        rng = _rng_for(prompt)
+        return {"relevance": [
+            {"index": index, "relevance": rng.choice(["Primary", "Secondary", "Irrelevant"])} for index in indexes
+        ]}
+    if type == "resume_batch":
+        return {"results": [
+            dict(candidate_for(text), resume_id=resume_id) for resume_id, text in BATCH_ITEM_PATTERN.findall(prompt)
+        ]}
+    match = RESUME_TEXT_PATTERN.search(prompt)
+    return candidate_for(match.group(1) if match else prompt, profile=type == "profile")
+
+
+class FakeLLM:
+
+    def __init__(self, latency="lognormal:0.8,0.4", error_rate=0.0, invalid_json_rate=0.0, seed=0, scale=1.0):
+        self.latency = latency if isinstance(latency, LatencyModel) else LatencyModel(latency, seed, scale)
+        self.error_rate = error_rate
+        self.invalid_json_rate = invalid_json_rate
+        self.calls = 0
+        self._rng = random.Random(seed + 1)
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt):
+        with self._lock:
+            self.calls += 1
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            raise FakeRateLimitError("429 Resource exhausted (fake)")
+        if roll < self.error_rate + self.invalid_json_rate:
+            return FakeResponse("Sorry, I cannot help with that.")
+        return FakeResponse("```json\n" + json.dumps(canned_response(prompt)) + "\n```")
+
+    def invoke(self, prompt):
+        time.sleep(self.latency.sample())
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.latency.sample())
+        return self._respond(prompt)
@@ -0,0 +1,230 @@
+# Benchmark suite runner: synthetic data + fake LLM, results written as JSON that can be compared between releases
+# Usage: python -m benchmarks.run [--quick] [--only NAME ...] [--output results.json] [--compare baseline.json]
+
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from utils import extractor, metrics
+from utils.pdf_pool import extract_texts_parallel
+from utils.scorer import calculate_score, calculate_total_experience
+
+from .fake_llm import FakeLLM
+from .synthetic import generate_documents, generate_job, generate_pool, generate_work_history, render_pdf
+
+RESULTS_SCHEMA = 1
+
+
+# Runs fn() "repeats" times; fn returns the number of items it processed and optional extra fields
+def measure(name, params, fn, repeats=3):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        items, extra = fn()
+        timings.append(time.perf_counter() - start)
+    seconds = statistics.median(timings)
+    return {
+        "name": name,
+        "params": params,
+        "items": items,
+        "repeats": repeats,
+        "seconds": round(seconds, 6),
+        "min_seconds": round(min(timings), 6),
+        "items_per_second": round(items / seconds, 3) if seconds else None,
+        "ms_per_item": round(seconds / items * 1000, 4) if items else None,
+        "extra": extra or {},
+    }
+
+
+def bench_calculate_score(pool_size=2000, skills=8, roles=4):
+    reference_date = datetime.datetime(2025, 1, 1)
+    job = generate_job(random.Random(1), licenses=1, remote=False)
+    pool = generate_pool(pool_size, seed=pool_size, skills=skills, roles=roles)
+
+    def run():
+        for candidate in pool:
+            calculate_score(job, candidate, reference_date)
+        return len(pool), None
+
+    return measure("calculate_score", {"pool_size": pool_size, "skills": skills, "roles": roles}, run)
+
+
+def bench_total_experience(count=2000, roles=15):
+    reference_date = datetime.datetime(2025, 1, 1)
+    rng = random.Random(roles)
+    histories = [generate_work_history(rng, roles, start_year=1975) for _ in range(count)]
+
+    def run():
+        for history in histories:
+            calculate_total_experience(history, reference_date)
+        return len(histories), None
+
+    return measure("calculate_total_experience", {"count": count, "roles": roles}, run)
+
+
+def generated_pdfs(count, bullets_per_role):
+    return [
+        {"name": f"resume_{index}.pdf", "data": render_pdf(document["text"])}
+        for index, document in enumerate(generate_documents(count, seed=5, bullets_per_role=bullets_per_role))
+    ]
+
+
+def bench_extract_text_from_pdf(count=50, bullets_per_role=10):
+    documents = generated_pdfs(count, bullets_per_role)
+
+    def run():
+        characters = sum(len(extractor.extract_text_from_pdf(io.BytesIO(document["data"]))) for document in documents)
+        return len(documents), {"characters": characters}
+
+    return measure("extract_text_from_pdf", {"count": count, "bullets_per_role": bullets_per_role}, run)
+
+
+def bench_pdf_pool(count=50, bullets_per_role=10, workers=None):
+    documents = generated_pdfs(count, bullets_per_role)
+
+    def run():
+        results = extract_texts_parallel(documents, max_workers=workers)
+        return len(documents), {"errors": sum(1 for result in results if result["error"])}
+
+    return measure("pdf_pool", {"count": count, "bullets_per_role": bullets_per_role, "workers": workers}, run)
+
+
+# End to end: PDF parsing -> concurrent LLM extraction against the fake backend -> scoring, with the LLM cache off
+def bench_pipeline(count=200, concurrency=8, latency="lognormal:0.5,0.4", batch_size=1, error_rate=0.0):
+    reference_date = datetime.datetime(2025, 1, 1)
+    job = generate_job(random.Random(2))
+    documents = generated_pdfs(count, bullets_per_role=3)
+
+    def run():
+        client = FakeLLM(latency=latency, error_rate=error_rate, seed=count)
+        metrics.registry.reset()
+        cache_enabled = extractor.llm_cache.enabled
+        extractor.llm_cache.enabled = False
+        try:
+            parsed = extract_texts_parallel(documents)
+            texts = [document["text"] for document in parsed if not document["error"]]
+            results = extractor.extract_batch(
+                texts, "resume", job, concurrency=concurrency, rpm=0, tpm=0, client=client, batch_size=batch_size
+            )
+            for data in results:
+                if data is not None:
+                    with metrics.timer("score"):
+                        calculate_score(job, data, reference_date)
+        finally:
+            extractor.llm_cache.enabled = cache_enabled
+        return len(documents), {
+            "llm_calls": client.calls,
+            "failed": sum(1 for data in results if data is None),
+            "stages": metrics.stage_summary(),
+        }
+
+    params = {"count": count, "concurrency": concurrency, "latency": latency, "batch_size": batch_size,
+              "error_rate": error_rate}
+    return measure("pipeline", params, run, repeats=1)
+
+
+def suite(quick=False, latency="lognormal:0.5,0.4"):
+    scale = 10 if quick else 1
+    return {
+        "calculate_score": lambda: bench_calculate_score(2000 // scale),
+        "calculate_total_experience": lambda: bench_total_experience(2000 // scale),
+        "extract_text_from_pdf": lambda: bench_extract_text_from_pdf(50 // scale),
+        "pdf_pool": lambda: bench_pdf_pool(50 // scale),
+        "pipeline": lambda: bench_pipeline(200 // scale, latency=latency),
+        "pipeline_batched": lambda: bench_pipeline(200 // scale, latency=latency, batch_size=5),
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "schema": RESULTS_SCHEMA,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def result_key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+# Prints the throughput change per benchmark; returns the benchmarks that got slower than the threshold
+def compare(baseline, results, threshold=0.1):
+    previous = {result_key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    print(f"\nCompared with {baseline.get('environment', {}).get('commit') or 'baseline'}:")
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None or not old["items_per_second"] or not result["items_per_second"]:
+            print(f"  {result['name']:<28} (no baseline)")
+            continue
+        change = result["items_per_second"] / old["items_per_second"] - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressions.append(result["name"])
+        print(f"  {result['name']:<28} {old['items_per_second']:>12.1f} -> {result['items_per_second']:>12.1f} items/s "
+              f"({change:+.1%}){flag}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite against synthetic data and a fake LLM.")
+    parser.add_argument("--only", nargs="+", default=None, help="Benchmark names to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="10x smaller inputs")
+    parser.add_argument("--latency", default="lognormal:0.5,0.4",
+                        help="Fake LLM latency: fixed:S, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA (seconds)")
+    parser.add_argument("--output", default=None, help="Write the results JSON here")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Throughput drop reported as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    benchmarks = suite(args.quick, args.latency)
+    names = args.only or list(benchmarks)
+    unknown = [name for name in names if name not in benchmarks]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)} (available: {', '.join(benchmarks)})", file=sys.stderr)
+        return 2
+
+    results = []
+    for name in names:
+        result = benchmarks[name]()
+        results.append(result)
+        print(f"{name:<28} {result['items']:>6} items | {result['seconds']:.3f}s | "
+              f"{result['items_per_second']:.1f} items/s | {result['ms_per_item']:.3f} ms/item")
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results -> {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+# Synthetic JDs and resumes (same JSON shape as the LLM output) for benchmarks
+
+import random
+
+SKILL_POOL = [
+    "Python", "Java", "Go", "Rust", "C++", "JavaScript", "TypeScript", "React", "Node.js", "Django",
+    "Flask", "FastAPI", "Spring", "Kubernetes", "Docker", "AWS", "GCP", "Azure", "Terraform", "SQL",
+    "PostgreSQL", "MongoDB", "Redis", "Kafka", "Spark", "Airflow", "Pandas", "NumPy", "PyTorch", "TensorFlow",
+    "Machine Learning", "Patient Care", "Iv Therapy", "Icu Experience", "Excel", "SAP", "Tableau", "Power BI",
+    "Linux", "Git", "CI/CD", "GraphQL", "REST", "Scala", "Kotlin", "Swift", "Figma", "Jira", "Agile", "Scrum",
+]
+CANDIDATE_LEVELS = ["Unspecified", "Basic", "Intermediate", "Advanced", "Expert"]
+REQUIRED_LEVELS = ["Unspecified", "Junior", "Senior", "Lead"]
+EDUCATION_LEVELS = ["None", "High School", "Associate", "Bachelor", "Master", "PhD"]
+LOCATIONS = ["New York, NY", "Austin, TX", "Seattle, WA", "Boston, MA", "Unknown"]
+LICENSES = ["RN License", "CPIM", "CSCP", "AWS Certified", "PMP"]
+
+
+def generate_job(rng=None, required_skills=6, preferred_skills=3, licenses=0, remote=True):
+    rng = rng or random.Random(0)
+    names = rng.sample(SKILL_POOL, required_skills + preferred_skills)
+    return {
+        "job_title": "Synthetic Engineer",
+        "required_skills": [{"name": n, "level": rng.choice(REQUIRED_LEVELS)} for n in names[:required_skills]],
+        "preferred_skills": [{"name": n, "level": "Unspecified"} for n in names[required_skills:]],
+        "min_experience_years": rng.randint(0, 8),
+        "education_level": rng.choice(EDUCATION_LEVELS),
+        "required_licenses": [" or ".join(rng.sample(LICENSES, 2)) for _ in range(licenses)],
+        "location": "Remote" if remote else rng.choice(LOCATIONS[:-1]),
+        "is_remote_allowed": remote,
+    }
+
+
+def generate_work_history(rng, roles=4, start_year=2000):
+    history = []
+    year = start_year + rng.randint(0, 10)
+    for i in range(roles):
+        length = rng.randint(6, 60)
+        start_month = rng.randint(1, 12)
+        # Some roles overlap the previous one
+        year -= rng.randint(0, 1)
+        end_year = year + (start_month - 1 + length) // 12
+        end_month = (start_month - 1 + length) % 12 + 1
+        end = "Present" if i == roles - 1 and rng.random() < 0.5 else f"{end_year:04d}-{end_month:02d}"
+        history.append({
+            "role": f"Role {i}",
+            "company": f"Company {rng.randint(1, 500)}",
+            "start": f"{year:04d}-{start_month:02d}",
+            "end": end,
+            "relevance": rng.choice(["Primary", "Secondary", "Secondary"]),
+        })
+        year = end_year
+    return history
+
+
+def generate_candidate(rng=None, skills=8, roles=4, skill_pool=None):
+    rng = rng or random.Random(0)
+    skill_pool = skill_pool or SKILL_POOL
+    return {
+        "candidate_name": f"Candidate {rng.randint(1, 10 ** 6)}",
+        "skills": [
+            {"name": n, "level": rng.choice(CANDIDATE_LEVELS)}
+            for n in rng.sample(skill_pool, min(skills, len(skill_pool)))
+        ],
+        "work_history": generate_work_history(rng, roles),
+        "total_primary_years": None,
+        "total_secondary_years": None,
+        "education_level": rng.choice(EDUCATION_LEVELS),
+        "licenses": rng.sample(LICENSES, rng.randint(0, 2)),
+        "location": rng.choice(LOCATIONS),
+    }
+
+
+# domains > 1 splits SKILL_POOL into disjoint groups and draws each candidate's skills from one group
+def generate_pool(size, seed=0, skills=8, roles=4, domains=1):
+    rng = random.Random(seed)
+    chunk = len(SKILL_POOL) // domains
+    pools = [SKILL_POOL[i * chunk:(i + 1) * chunk] for i in range(domains)]
+    return [generate_candidate(rng, skills=skills, roles=roles, skill_pool=rng.choice(pools)) for _ in range(size)]
+
+
+# Plain-text renderings of the JSON above, the input the LLM would see
+FILLER_WORDS = [
+    "designed", "built", "maintained", "migrated", "scaled", "monitored", "reviewed", "mentored", "automated",
+    "services", "pipelines", "dashboards", "releases", "customers", "reports", "systems", "teams", "workflows",
+]
+
+
+def filler_sentence(rng, words=12):
+    return " ".join(rng.choice(FILLER_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def render_job_text(job, rng=None, paragraphs=2):
+    rng = rng or random.Random(0)
+    lines = [job["job_title"], f"Location: {job['location']}", ""]
+    lines += [filler_sentence(rng, 20) for _ in range(paragraphs)]
+    lines += ["", "Requirements:"]
+    lines += [f"- {skill['level']} {skill['name']}" for skill in job["required_skills"]]
+    lines.append(f"- {job['min_experience_years']}+ years of experience")
+    lines.append(f"- {job['education_level']} degree")
+    lines += [f"- {license} required" for license in job["required_licenses"]]
+    if job["preferred_skills"]:
+        lines += ["", "Nice to have:"]
+        lines += [f"- {skill['name']}" for skill in job["preferred_skills"]]
+    return "\n".join(lines) + "\n"
+
+
+# bullets_per_role controls the size of the document (~15 words per bullet)
+def render_resume_text(candidate, rng=None, bullets_per_role=3):
+    rng = rng or random.Random(0)
+    lines = [candidate["candidate_name"], candidate["location"], "candidate@example.com", ""]
+    lines.append("SKILLS")
+    lines += [f"{skill['name']} ({skill['level']})" for skill in candidate["skills"]]
+    lines += ["", "EXPERIENCE"]
+    for role in candidate["work_history"]:
+        lines.append(f"{role['role']}, {role['company']} ({role['start']} - {role['end']})")
+        lines += [f"- {filler_sentence(rng, 15)}" for _ in range(bullets_per_role)]
+    lines += ["", "EDUCATION", candidate["education_level"]]
+    if candidate["licenses"]:
+        lines += ["", "LICENSES"] + candidate["licenses"]
+    return "\n".join(lines) + "\n"
+
+
+def generate_documents(size, seed=0, skills=8, roles=4, bullets_per_role=3):
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(size):
+        candidate = generate_candidate(rng, skills=skills, roles=roles)
+        documents.append({"candidate": candidate, "text": render_resume_text(candidate, rng, bullets_per_role)})
+    return documents
+
+
+# What the PDF text of a real resume also carries: a contact line, a footer with the name and page on every page,
+# layout whitespace, and publications / interests / references sections. Pages are separated by form feeds like
+# read_pdf_text output (render_pdf starts a new page at each one).
+def add_resume_noise(text, rng=None, lines_per_page=30):
+    rng = rng or random.Random(0)
+    lines = text.rstrip("\n").split("\n")
+    name = lines[0]
+    handle = name.lower().replace(" ", "")
+    lines.insert(2, f"{handle}@example.com  |  (512) 555-{rng.randint(0, 9999):04d}  |  linkedin.com/in/{handle}")
+    lines = [line.replace(" ", "   ") if rng.random() < 0.2 else line for line in lines]
+    lines += ["", "PUBLICATIONS"] + [f"{name} et al. ({rng.randint(2005, 2024)}). {filler_sentence(rng, 10)}"
+                                     for _ in range(rng.randint(2, 6))]
+    lines += ["", "INTERESTS", ", ".join(rng.sample(FILLER_WORDS, 4))]
+    lines += ["", "REFERENCES"] + [f"Referee {i}, Company {rng.randint(1, 500)}, (617) 555-{rng.randint(0, 9999):04d}"
+                                   for i in range(2)]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    return "\f".join(
+        "\n".join(page + ["", f"{name} - Resume - Page {number} of {len(pages)}"]) + "\n"
+        for number, page in enumerate(pages, 1)
+    )
+
+
+# Minimal text-only PDF (Helvetica, one text object per page) so PDF benchmarks need no extra dependency
+# padding_bytes adds an unreferenced stream of that size, standing in for the embedded fonts and images of real PDFs
+def _pdf_escape(line):
+    return line.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_pdf(text, lines_per_page=50, padding_bytes=0):
+    pages = []
+    for page_text in text.split("\f"):
+        lines = page_text.splitlines() or [""]
+        pages += [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, page_lines in zip(page_ids, pages):
+        stream = "BT /F1 10 Tf 14 TL 50 800 Td\n" + "".join(f"({_pdf_escape(line)}) '\n" for line in page_lines) + "ET"
+        objects[page_id] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        )
+        objects[page_id + 1] = f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream"
+    if padding_bytes:
+        objects[page_ids[-1] + 2] = f"<< /Length {padding_bytes} >>\nstream\n{'0' * padding_bytes}\nendstream"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += f"{object_id} 0 obj\n{objects[object_id]}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    output += "".join(f"{offsets[object_id]:010d} 00000 n \n" for object_id in sorted(objects)).encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(output)
@@ -0,0 +1,97 @@
+# Malformed candidates, JDs, flags and headers are a 400 naming the problem, never a 500
+# Run with: python -m pytest tests
+
+import asyncio
+
+import pytest
+from starlette.testclient import TestClient
+
+from api import create_app, iter_ndjson
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.synthetic import generate_pool
+
+JOB = {
+    "job_title": "Nurse", "required_skills": [{"name": "Triage", "level": "Expert"}], "preferred_skills": [],
+    "required_licenses": [], "education_level": "None", "location": "Boston, MA", "is_remote_allowed": True,
+    "min_experience_years": 2,
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(create_app(client=FakeLLM(latency="fixed:0.001", seed=1))) as test_client:
+        yield test_client
+
+
+def test_valid_candidates_score(client):
+    response = client.post("/score", json={"job": JOB, "candidates": generate_pool(3, seed=2)})
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 3
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ("skills", ["Python"], "skills[0]"),
+    ("skills", "Python", "skills must be a list"),
+    ("licenses", [1], "licenses must be a list of strings"),
+    ("licenses", None, "licenses must be a list of strings"),
+    ("location", None, "location must be a string"),
+    ("total_primary_years", "ten", "total_primary_years must be a number"),
+    ("work_history", [{"role": "Nurse", "start": 2019}], "work_history[0].start"),
+])
+def test_wrong_field_type_is_a_400(client, field, value, message):
+    candidate = dict(generate_pool(1, seed=3)[0], **{field: value})
+    response = client.post("/score", json={"job": JOB, "candidates": [generate_pool(1, seed=4)[0], candidate]})
+    assert response.status_code == 400
+    assert "candidates[1]" in response.json()["error"]
+    assert message in response.json()["error"]
+
+
+def test_ndjson_wrong_field_type_is_a_400(client):
+    response = client.post("/score?job_text=Nurse", content='{"skills": [3]}\n',
+                           headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 400
+    assert "NDJSON line 1" in response.json()["error"]
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ("required_skills", [{"name": 3}], "required_skills[0]"),
+    ("preferred_skills", "Python", "preferred_skills must be a list"),
+    ("min_experience_years", "two", "min_experience_years must be a number"),
+    ("required_licenses", "RN", "required_licenses must be a list of strings"),
+    ("location", None, "location must be a string"),
+])
+def test_malformed_job_is_a_400(client, field, value, message):
+    job = dict(JOB, **{field: value})
+    response = client.post("/score", json={"job": job, "candidates": generate_pool(1, seed=5)})
+    assert response.status_code == 400
+    assert message in response.json()["error"]
+
+
+@pytest.mark.parametrize("flag", ["explain", "components"])
+def test_flags_must_be_booleans(client, flag):
+    response = client.post("/score", json={"job": JOB, "candidates": generate_pool(1, seed=6), flag: "false"})
+    assert response.status_code == 400
+    assert flag in response.json()["error"]
+
+
+def test_invalid_content_length_is_a_400(client):
+    response = client.post("/jd/analyze", content=b"Nurse", headers={"content-type": "text/plain", "content-length": "abc"})
+    assert response.status_code == 400
+
+
+class ChunkedRequest:
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def test_ndjson_lines_split_across_chunks():
+    async def collect(chunks):
+        return [value async for value in iter_ndjson(ChunkedRequest(chunks))]
+
+    chunks = [b'{"a": ', b"1", b'}\n{"b"', b": 2}\n\n", b'{"c": 3}']
+    assert asyncio.run(collect(chunks)) == [{"a": 1}, {"b": 2}, {"c": 3}]
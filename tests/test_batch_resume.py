@@ -0,0 +1,24 @@
+# Resuming a batch keeps exactly one output record per scored file
+# Run with: python -m pytest tests
+
+import json
+
+from utils.batch import prune_output
+
+
+def test_identical_files_keep_their_own_records(tmp_path):
+    output = tmp_path / "results.jsonl"
+    rows = [
+        {"file": "a.pdf", "sha256": "same", "final_score": 80},
+        {"file": "copy_of_a.pdf", "sha256": "same", "final_score": 80},
+        {"file": "a.pdf", "sha256": "same", "final_score": 80},
+        {"file": "b.pdf", "sha256": "other", "error": "timeout"},
+        {"file": "c.pdf", "sha256": "unchecked", "final_score": 10},
+    ]
+    output.write_text("".join(json.dumps(row) + "\n" for row in rows) + '{"file": "half', encoding="utf-8")
+
+    removed = prune_output(str(output), "jsonl", {"same", "other"})
+
+    kept = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [row["file"] for row in kept] == ["a.pdf", "copy_of_a.pdf"]
+    assert removed == 4
@@ -0,0 +1,88 @@
+# Compaction must never drop a field the extraction uses; these resumes used to lose licenses / the current role
+# Run with: python -m pytest tests
+
+from utils.compaction import compact_text
+from utils.ratelimit import estimate_tokens
+
+NURSE_RESUME = """Jane Doe
+Boston, MA | jane.doe@example.com | (617) 555-0134
+
+Experience
+Staff Nurse, Mercy Hospital (2019-01 - Present)
+- Triage and care of 20+ emergency department patients per shift
+
+Publications
+Doe J. Early warning scores in the emergency department. Journal of Nursing, 2021.
+Doe J., Smith K. Sepsis screening outcomes. Critical Care, 2020.
+
+Licensure and Certification
+Registered Nurse (RN), Massachusetts
+Basic Life Support (BLS), American Heart Association
+"""
+
+TEACHER_RESUME = """John Smith
+Chicago, IL
+
+Education
+Master of Education, Northwestern University (2016)
+
+Publications
+Smith J. Project-based learning in STEM classrooms. Education Review, 2022.
+
+Teaching Experience
+Mathematics Teacher, Lincoln High School (2018-08 - Present)
+- Algebra and calculus for grades 10-12
+"""
+
+
+def test_title_case_heading_ends_a_dropped_section():
+    compacted, stats = compact_text(NURSE_RESUME, 0)
+    assert stats["sections_dropped"] == 1
+    assert "Journal of Nursing" not in compacted
+    assert "Registered Nurse (RN), Massachusetts" in compacted
+    assert "Basic Life Support (BLS), American Heart Association" in compacted
+
+
+def test_unknown_experience_heading_is_kept():
+    compacted, _ = compact_text(TEACHER_RESUME, 0)
+    assert "Education Review" not in compacted
+    assert "Teaching Experience" in compacted
+    assert "Mathematics Teacher, Lincoln High School (2018-08 - Present)" in compacted
+
+
+def resume_with_roles(count):
+    roles = "\n".join(
+        f"Role {index}, Company {index} (20{index:02d}-01 - 20{index:02d}-12)\n"
+        f"Responsible for {' '.join(['operations'] * 12)} and reporting"
+        for index in range(count)
+    )
+    return (
+        "Jane Doe\nAustin, TX\n\nEXPERIENCE\n" + roles +
+        "\n\nEDUCATION\nBachelor of Science in Nursing, University of Texas\n"
+        "\nCERTIFICATIONS\nRegistered Nurse (RN)\nBasic Life Support (BLS)\n"
+    )
+
+
+KEPT_LINES = ("Jane Doe", "Austin, TX", "Bachelor of Science in Nursing, University of Texas", "Registered Nurse (RN)",
+              "Basic Life Support (BLS)")
+
+
+def test_budget_cut_drops_descriptions_only():
+    compacted, stats = compact_text(resume_with_roles(10), 150)
+    assert stats["truncated"] and not stats["over_budget"]
+    assert estimate_tokens(compacted) <= 150
+    lines = compacted.splitlines()
+    for line in KEPT_LINES + tuple(f"Role {index}, Company {index} (20{index:02d}-01 - 20{index:02d}-12)"
+                                   for index in range(10)):
+        assert line in lines
+
+
+def test_role_lines_are_kept_over_the_budget():
+    compacted, stats = compact_text(resume_with_roles(40), 300)
+    assert stats["truncated"] and stats["over_budget"]
+    assert estimate_tokens(compacted) > 300
+    assert "Responsible for" not in compacted
+    lines = compacted.splitlines()
+    for line in KEPT_LINES + tuple(f"Role {index}, Company {index} (20{index:02d}-01 - 20{index:02d}-12)"
+                                   for index in range(40)):
+        assert line in lines
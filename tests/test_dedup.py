@@ -0,0 +1,22 @@
+# Near-duplicate detection reads the PDF text as read_pdf_text returns it, with a form feed between pages
+# Run with: python -m pytest tests
+
+from utils.dedup import DedupIndex, minhash
+
+PAGES = [
+    "Jane Doe\nAustin, TX\n\nEXPERIENCE\nStaff Nurse, Mercy Hospital (2019-03 - Present)\n",
+    "EDUCATION\nBachelor of Science in Nursing, University of Texas\nLICENSES\nRegistered Nurse (RN)\n",
+]
+
+
+def test_page_breaks_are_whitespace():
+    assert (minhash("\f".join(PAGES)) == minhash("".join(PAGES))).all()
+
+
+def test_copy_without_page_breaks_is_a_duplicate():
+    index = DedupIndex()
+    entry, _, _ = index.claim("a", "\f".join(PAGES), "a.pdf")
+    index.resolve(entry, {"candidate_name": "Jane Doe"})
+    _, match, similarity = index.claim("b", "".join(PAGES), "b.txt")
+    assert match is entry
+    assert similarity == 1.0
@@ -0,0 +1,62 @@
+# One ExtractionSession = one rate limiter and one event loop for every piece of an upload
+# Run with: python -m pytest tests
+
+import threading
+
+import pytest
+
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.synthetic import generate_documents, generate_job
+from utils import extractor
+from utils.ratelimit import RateLimiter
+
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    monkeypatch.setattr(extractor.llm_cache, "enabled", False)
+
+
+def test_chunks_share_one_limiter_and_report_on_the_caller_thread(no_cache, monkeypatch):
+    limiters = []
+
+    class CountingLimiter(RateLimiter):
+        def __init__(self, *args):
+            super().__init__(*args)
+            limiters.append(self)
+
+    monkeypatch.setattr(extractor, "RateLimiter", CountingLimiter)
+    texts = [document["text"] for document in generate_documents(12, seed=2)]
+    results = {}
+    threads = set()
+
+    def on_result(offset):
+        def record(index, data):
+            threads.add(threading.current_thread())
+            results[offset + index] = data
+        return record
+
+    with extractor.ExtractionSession("resume", generate_job(), rpm=600, tpm=0,
+                                     client=FakeLLM(latency="fixed:0.001", seed=1)) as session:
+        for offset in range(0, len(texts), 4):
+            session.submit(texts[offset:offset + 4], on_result(offset))
+            session.collect(max_pending=4)
+            assert session.pending <= 4
+        session.collect()
+
+    assert session.pending == 0
+    assert sorted(results) == list(range(len(texts)))
+    assert all(data is not None for data in results.values())
+    assert threads == {threading.main_thread()}
+    assert len(limiters) == 1
+
+
+def test_failed_batch_reports_every_text(no_cache, monkeypatch):
+    async def broken(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(extractor, "aextract_batch", broken)
+    results = []
+    with extractor.ExtractionSession("resume", {}, rpm=0, tpm=0) as session:
+        session.submit(["a", "b", "c"], lambda index, data: results.append((index, data)))
+        session.collect()
+    assert sorted(results) == [(0, None), (1, None), (2, None)]
@@ -0,0 +1,47 @@
+# Salvage parsing must not change string contents, and an answer that is not an object must fail
+# A JD answered with a null location must not knock out candidates who have one
+# Run with: python -m pytest tests
+
+import json
+
+import pytest
+
+from utils.extractor import parse_llm_content
+from utils.parsing import salvage_json
+from utils.ranking import CandidateProfile, job_terms, knocked_out
+from utils.scorer import calculate_score, check_knockout
+
+
+def test_trailing_commas_removed_outside_strings_only():
+    content = 'Here you go: {"summary": "Led teams, ]and more, }", "skills": ["SQL", "Python", ], }'
+    data, method = salvage_json(content)
+    assert method == "extracted"
+    assert data == {"summary": "Led teams, ]and more, }", "skills": ["SQL", "Python"]}
+
+
+def test_escaped_quotes_keep_string_commas():
+    data, _ = salvage_json('Answer: {"note": "say \\"a, }\\" twice", "n": 1,}')
+    assert data == {"note": 'say "a, }" twice', "n": 1}
+
+
+@pytest.mark.parametrize("content", ["null", '"no resume found"', "42", "```json\nnull\n```"])
+def test_non_object_answer_is_a_parse_failure(content):
+    with pytest.raises(json.JSONDecodeError):
+        parse_llm_content(content, "resume")
+
+
+def test_null_job_location_does_not_knock_out_candidates():
+    content = json.dumps({
+        "job_title": "Analyst", "required_skills": [{"name": "SQL", "level": "Intermediate"}],
+        "preferred_skills": [], "min_experience_years": 0, "education_level": "None",
+        "required_licenses": [], "location": None, "is_remote_allowed": False,
+    })
+    job = parse_llm_content(content, "job_description")
+    assert job["location"] == "Unspecified"
+    candidate = {
+        "candidate_name": "Jane Doe", "skills": [{"name": "SQL", "level": "Intermediate"}], "work_history": [],
+        "education_level": "None", "licenses": [], "location": "Austin, TX",
+    }
+    assert check_knockout(job, candidate) is None
+    assert calculate_score(job, candidate)["final_score"] > 0
+    assert not knocked_out(job_terms(job), CandidateProfile(candidate))
@@ -0,0 +1,74 @@
+# The prefilter only rejects clear non-matches; these resumes were rejected although the scorer accepts them
+# Run with: python -m pytest tests
+
+import pytest
+
+from utils.prefilter import check_license, normalize, prefilter_resume
+
+BOSTON_JOB = {"location": "Boston, MA", "is_remote_allowed": False, "required_licenses": []}
+
+
+@pytest.mark.parametrize("header", [
+    "Jane Doe, MD\njane@example.com | (555) 123-4567\n",
+    "John Smith, PA\njohn@example.com\n",
+    "Jane Doe, RN, NP\nChief Nurse, Mercy Hospital\n",
+])
+def test_credential_suffix_is_not_a_state(header):
+    decision = prefilter_resume(header + "\nEXPERIENCE\nPhysician at General Hospital\n", BOSTON_JOB)
+    assert decision["passed"]
+
+
+def test_address_in_another_state_is_rejected():
+    text = "Jane Doe\nAustin, TX 78701 | jane@example.com\n\nEXPERIENCE\nNurse\n"
+    decision = prefilter_resume(text, BOSTON_JOB)
+    assert not decision["passed"]
+    assert "Austin, TX" in decision["reason"]
+
+
+def test_address_in_job_state_passes():
+    text = "Jane Doe\nCambridge, MA\n\nEXPERIENCE\nNurse\n"
+    assert prefilter_resume(text, BOSTON_JOB)["passed"]
+
+
+@pytest.mark.parametrize("requirement, text", [
+    ("Certified Nursing Assistant (CNA)", "Certifications\nCNA\n"),
+    ("Certified Nursing Assistant (CNA)", "Certified Nursing Assistant, State of Ohio\n"),
+    ("Driver's License", "Full UK driving licence\n"),
+    ("Driving Licence", "Valid driver's license\n"),
+    ("RN License", "Registered Nurse\n"),
+])
+def test_license_variants_match(requirement, text):
+    assert check_license(normalize(text), requirement)["passed"] is True
+
+
+def test_missing_license_is_rejected():
+    job = dict(BOSTON_JOB, required_licenses=["PMP"])
+    decision = prefilter_resume("Jane Doe\nBoston, MA\n\nEXPERIENCE\nProject coordinator\n", job)
+    assert not decision["passed"]
+    assert "No mention of required license: PMP" in decision["reason"]
+
+
+@pytest.mark.parametrize("requirement", ["PMP or PRINCE2", "Certified Nursing Assistant (CNA)"])
+def test_any_accepted_license_passes(requirement):
+    job = dict(BOSTON_JOB, required_licenses=[requirement])
+    text = "Jane Doe\nBoston, MA\n\nCERTIFICATIONS\nPRINCE2 Practitioner\nCNA, active\n"
+    decision = prefilter_resume(text, job)
+    assert decision["passed"]
+    assert decision["checks"][0]["passed"] is True
+
+
+def test_generic_license_requirement_is_uncertain():
+    job = dict(BOSTON_JOB, required_licenses=["License"])
+    decision = prefilter_resume("Jane Doe\nBoston, MA\n\nEXPERIENCE\nProject coordinator\n", job)
+    assert decision["passed"]
+    assert decision["checks"][0]["passed"] is None
+
+
+# read_pdf_text separates pages with a form feed; decisions must not depend on it
+@pytest.mark.parametrize("job", [BOSTON_JOB, dict(BOSTON_JOB, required_licenses=["Registered Nurse (RN)"])])
+def test_page_breaks_do_not_change_the_decision(job):
+    pages = ["Jane Doe\n", "\n", "\n", "Austin, TX 78701\n\nEXPERIENCE\nStaff nurse\n", "LICENSES\nRN, Texas\n"]
+    with_breaks = prefilter_resume("\f".join(pages), job)
+    without_breaks = prefilter_resume("".join(pages), job)
+    assert with_breaks == without_breaks
+    assert not with_breaks["passed"]
@@ -0,0 +1,114 @@
+# Every vectorized / pruned scoring path must give exactly what calculate_score gives
+# Run with: python -m pytest tests
+
+import datetime
+import random
+
+import pytest
+
+from benchmarks.synthetic import generate_job, generate_pool
+from utils.batch_scorer import calculate_scores_batch
+from utils.ranking import CandidateProfile, top_k
+from utils.scorer import calculate_score, score_candidate
+from utils.scoring_profiles import ComponentTable, load_profiles, make_profile
+
+REFERENCE_DATE = datetime.datetime(2025, 1, 1)
+
+
+def parity_jobs():
+    rng = random.Random(42)
+    return [
+        generate_job(rng),
+        # The original calculate_score raised NameError for JDs without required or preferred skills
+        generate_job(rng, required_skills=0, preferred_skills=0),
+        generate_job(rng, required_skills=0, preferred_skills=3),
+        generate_job(rng, required_skills=10, preferred_skills=0),
+        generate_job(rng, licenses=1, remote=False),
+        generate_job(rng, licenses=2, remote=False),
+    ]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    return generate_pool(400, seed=7)
+
+
+def test_empty_skill_lists_score_full_marks():
+    job = generate_job(random.Random(1), required_skills=0, preferred_skills=0)
+    candidate = generate_pool(1, seed=1)[0]
+    result = calculate_score(job, candidate, REFERENCE_DATE)
+    assert result["breakdown"]["skills"] == 100
+    assert result["breakdown"]["bonus"] == 100
+    assert result["calculation_steps"]
+
+
+@pytest.mark.parametrize("job_index", range(len(parity_jobs())))
+def test_batch_matches_calculate_score(pool, job_index):
+    job = parity_jobs()[job_index]
+    batch = calculate_scores_batch(job, pool, reference_date=REFERENCE_DATE)
+    for candidate, batch_result in zip(pool, batch):
+        single = calculate_score(job, candidate, REFERENCE_DATE)
+        assert batch_result["final_score"] == single["final_score"]
+        assert batch_result["breakdown"] == single["breakdown"]
+
+
+@pytest.mark.parametrize("job_index", range(len(parity_jobs())))
+@pytest.mark.parametrize("k", [1, 10, 50])
+def test_top_k_matches_brute_force(pool, job_index, k):
+    job = parity_jobs()[job_index]
+    profiles = {index: CandidateProfile(candidate) for index, candidate in enumerate(pool)}
+    top = top_k(job, enumerate(pool), k, REFERENCE_DATE, profiles)
+    scored = [(index, score_candidate(job, candidate, REFERENCE_DATE)) for index, candidate in enumerate(pool)]
+    brute = sorted(scored, key=lambda item: (-item[1].final_score, str(item[0])))[:k]
+    assert [(index, result.to_dict()) for index, result in top] == \
+        [(index, result.to_dict()) for index, result in brute]
+
+
+def scoring_profiles():
+    rng = random.Random(3)
+    profiles = list(load_profiles(path="").values())
+    for index in range(4):
+        raw = [rng.random() for _ in range(4)]
+        weights = dict(zip(("skills", "experience", "education", "bonus"), (value / sum(raw) for value in raw)))
+        # Weights have to add up to exactly 1 within make_profile's tolerance
+        weights["bonus"] = 1.0 - weights["skills"] - weights["experience"] - weights["education"]
+        profiles.append(make_profile({
+            "weights": weights,
+            "secondary_factor": rng.random(),
+            "education_step_penalty": rng.choice([10, 25, 40]),
+            "skill_level_weights": {"Expert": rng.uniform(1.0, 2.5), "Basic": rng.uniform(0.5, 1.0)},
+        }, f"random-{index}"))
+    return profiles
+
+
+@pytest.mark.parametrize("job_index", range(len(parity_jobs())))
+def test_component_table_matches_score_candidate(pool, job_index):
+    job = parity_jobs()[job_index]
+    table = ComponentTable([score_candidate(job, candidate, REFERENCE_DATE).components() for candidate in pool])
+    for scoring_profile in scoring_profiles():
+        scored = [(index, score_candidate(job, candidate, REFERENCE_DATE, scoring_profile).final_score)
+                  for index, candidate in enumerate(pool)]
+        assert table.rank(scoring_profile) == sorted(scored, key=lambda item: (-item[1], str(item[0])))
+
+
+@pytest.mark.parametrize("job_index", range(len(parity_jobs())))
+def test_batch_matches_calculate_score_under_profiles(pool, job_index):
+    job = parity_jobs()[job_index]
+    for scoring_profile in scoring_profiles():
+        batch = calculate_scores_batch(job, pool, reference_date=REFERENCE_DATE, scoring_profile=scoring_profile)
+        for candidate, batch_result in zip(pool, batch):
+            single = calculate_score(job, candidate, REFERENCE_DATE, scoring_profile)
+            assert batch_result["final_score"] == single["final_score"]
+            assert batch_result["breakdown"] == single["breakdown"]
+
+
+@pytest.mark.parametrize("job_index", range(len(parity_jobs())))
+def test_top_k_matches_brute_force_under_profiles(pool, job_index):
+    job = parity_jobs()[job_index]
+    for scoring_profile in scoring_profiles():
+        top = top_k(job, enumerate(pool), 10, REFERENCE_DATE, scoring_profile=scoring_profile)
+        scored = [(index, score_candidate(job, candidate, REFERENCE_DATE, scoring_profile))
+                  for index, candidate in enumerate(pool)]
+        brute = sorted(scored, key=lambda item: (-item[1].final_score, str(item[0])))[:10]
+        assert [(index, result.final_score) for index, result in top] == \
+            [(index, result.final_score) for index, result in brute]
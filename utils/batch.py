@@ -0,0 +1,330 @@
+# Headless batch scoring: python -m utils.batch --jd job.txt --input resumes/ --output results.jsonl
+
+import argparse
+import concurrent.futures
+import csv
+import datetime
+import glob
+import json
+import os
+import sys
+
+from . import metrics
+from .cache import hash_bytes
+from .extractor import extract_data_with_gemini, extract_resume, get_compaction_stats, get_parse_stats
+from .pdf_pool import PdfExtractionPool
+from .prefilter import prefilter_resume
+from .scorer import score_candidate
+
+RESUME_EXTENSIONS = (".pdf", ".txt")
+CSV_FIELDS = [
+    "file", "sha256", "candidate_name", "final_score", "skills", "experience", "education", "bonus",
+    "prefilter_reason", "duplicate_of", "similarity", "error", "error_type",
+]
+
+
+# Directories are scanned (non-recursive), anything else is treated as a glob pattern
+def iter_resume_paths(inputs):
+    seen = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths = sorted(os.path.join(item, name) for name in os.listdir(item))
+        else:
+            paths = sorted(glob.glob(item))
+        for path in paths:
+            if path.lower().endswith(RESUME_EXTENSIONS) and os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                yield path
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hash_bytes(f.read())
+
+
+# PDF/TXT -> LLM extraction -> deterministic score for a single file
+# dedup_index (utils.dedup.DedupIndex for this JD): near-duplicates of an extracted resume reuse its extraction
+# scoring_profile (utils.scoring_profiles): the record keeps the score components, so it can be re-ranked later
+def process_resume(path, key, job_data, reference_date, pdf_pool, prefilter=False, dedup_index=None,
+                   scoring_profile=None):
+    record = {"file": path, "sha256": key}
+    if path.lower().endswith(".txt"):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    else:
+        with open(path, "rb") as f:
+            document = pdf_pool.extract(path, f.read())
+        if document["error"]:
+            record["error"] = document["error"]
+            record["error_type"] = document["error_type"]
+            return record
+        text = document["text"]
+
+    if not text.strip():
+        record["error"] = "No text could be extracted"
+        record["error_type"] = "no_text"
+        return record
+
+    # Clear license/location mismatches are scored 0 without an LLM call
+    if prefilter:
+        decision = prefilter_resume(text, job_data)
+        if not decision["passed"]:
+            record["final_score"] = 0
+            record["reasoning"] = [decision["reason"]]
+            record["prefilter"] = decision
+            record["components"] = {"knocked_out": True}
+            return record
+
+    if dedup_index is not None:
+        # numpy (MinHash) is only imported when deduplication is on
+        from .dedup import extract_with_dedup
+        data, duplicate = extract_with_dedup(dedup_index, path, text, lambda: extract_resume(text, job_data), path)
+        if duplicate:
+            record.update(duplicate)
+    else:
+        data = extract_resume(text, job_data)
+    if data is None:
+        record["error"] = "Gemini did not return valid data"
+        record["error_type"] = "llm_error"
+        return record
+
+    with metrics.timer("score"):
+        score_result = score_candidate(job_data, data, reference_date, scoring_profile)
+    record["candidate_name"] = data.get("candidate_name")
+    record["final_score"] = score_result.final_score
+    record["breakdown"] = score_result.breakdown
+    record["reasoning"] = score_result.reasoning
+    record["components"] = score_result.components()
+    record["data"] = data
+    return record
+
+
+# Generator pipeline: keeps at most max_in_flight files in progress and yields records as they complete
+# PDF parsing runs in a process pool with one worker per in-flight slot
+def score_resumes(paths, job_data, max_in_flight=8, done_keys=None, reference_date=None,
+                  pdf_timeout=None, max_pages=None, prefilter=False, dedup_index=None, scoring_profile=None):
+    done_keys = done_keys or set()
+    reference_date = reference_date or datetime.datetime.now()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor, \
+            PdfExtractionPool(max_in_flight, pdf_timeout, max_pages) as pdf_pool:
+        in_flight = {}
+        for path in paths:
+            key = file_sha256(path)
+            if key in done_keys:
+                continue
+            in_flight[executor.submit(
+                process_resume, path, key, job_data, reference_date, pdf_pool, prefilter, dedup_index, scoring_profile
+            )] = path
+
+            if len(in_flight) >= max_in_flight:
+                finished, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    yield _future_record(future, in_flight.pop(future))
+
+        for future in concurrent.futures.as_completed(in_flight):
+            yield _future_record(future, in_flight[future])
+
+
+def _future_record(future, path):
+    try:
+        return future.result()
+    except Exception as e:
+        return {"file": path, "error": str(e)}
+
+
+# Checkpoint: one content hash per successfully scored file
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.split("\t", 1)[0] for line in f if line.strip()}
+
+
+# On resume the output keeps one record per checkpointed file; error records (and results written just before a
+# crash, never checkpointed) are removed because those files are processed again. Returns the removed count.
+def prune_output(output_path, output_format, done_keys):
+    if not os.path.exists(output_path):
+        return 0
+    kept, removed, seen = [], 0, set()
+    with open(output_path, "r", encoding="utf-8", newline="") as f:
+        if output_format == "csv":
+            rows = list(csv.DictReader(f))
+        else:
+            rows = []
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    # Half-written last line of an interrupted run
+                    removed += line.strip() != ""
+    for row in rows:
+        # Files with identical content share a hash but each keeps its own record
+        key = (row.get("sha256"), row.get("file"))
+        if row.get("error") or key[0] not in done_keys or key in seen:
+            removed += 1
+            continue
+        seen.add(key)
+        kept.append(row)
+    if not removed:
+        return 0
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        if output_format == "csv":
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(kept)
+        else:
+            f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in kept)
+    os.replace(tmp_path, output_path)
+    return removed
+
+
+class ResultWriter:
+
+    def __init__(self, output_path, output_format, checkpoint_path):
+        self.output_format = output_format
+        is_new = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self.output = open(output_path, "a", encoding="utf-8", newline="")
+        self.checkpoint = open(checkpoint_path, "a", encoding="utf-8")
+        self.csv_writer = None
+        if output_format == "csv":
+            self.csv_writer = csv.DictWriter(self.output, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            if is_new:
+                self.csv_writer.writeheader()
+
+    # The record is on disk before its file is marked as done, so a crash never loses a result
+    def write(self, record):
+        if self.csv_writer:
+            row = dict(record)
+            row.update(record.get("breakdown", {}))
+            row["prefilter_reason"] = record.get("prefilter", {}).get("reason")
+            self.csv_writer.writerow(row)
+        else:
+            self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.output.flush()
+        os.fsync(self.output.fileno())
+
+        if "error" not in record:
+            self.checkpoint.write(f"{record['sha256']}\t{record['file']}\n")
+            self.checkpoint.flush()
+
+    def close(self):
+        self.output.close()
+        self.checkpoint.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory (or glob) of resumes against a job description.")
+    parser.add_argument("--jd", required=True, help="Job description text file")
+    parser.add_argument("--input", required=True, nargs="+", help="Directories and/or glob patterns of PDF/TXT resumes")
+    parser.add_argument("--output", required=True, help="Results file (appended to)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Defaults to the output file extension")
+    parser.add_argument("--max-in-flight", type=int, default=8, help="Maximum files being processed at once")
+    parser.add_argument("--checkpoint", default=None, help="Defaults to <output>.checkpoint")
+    parser.add_argument("--pdf-timeout", type=float, default=None, help="Per-PDF parsing budget in seconds")
+    parser.add_argument("--max-pages", type=int, default=None, help="Only parse the first N pages of each PDF")
+    parser.add_argument("--prefilter", action="store_true",
+                        help="Reject clear license/location mismatches before the LLM call")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Reuse the extraction of near-duplicate resumes (DEDUP_THRESHOLD similarity) instead of an LLM call")
+    parser.add_argument("--profile", default=None,
+                        help="Scoring profile name (built-in or from SCORING_PROFILES_PATH); defaults to the default profile")
+    parser.add_argument("--metrics-file", default=None,
+                        help="Write Prometheus-format metrics here when done (defaults to METRICS_FILE)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    metrics.setup_from_env()
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    checkpoint_path = args.checkpoint or args.output + ".checkpoint"
+
+    scoring_profile = None
+    if args.profile:
+        from .scoring_profiles import get_profile
+        try:
+            scoring_profile = get_profile(args.profile)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    with open(args.jd, "r", encoding="utf-8") as f:
+        job_data = extract_data_with_gemini(f.read(), type="job_description")
+    if job_data is None:
+        print("Error: the job description could not be analyzed", file=sys.stderr)
+        return 1
+
+    done_keys = load_checkpoint(checkpoint_path)
+    if done_keys:
+        print(f"Resuming: {len(done_keys)} files already scored", file=sys.stderr)
+    # Without a checkpoint the output file may hold unrelated results, so it is only appended to
+    if os.path.exists(checkpoint_path):
+        removed = prune_output(args.output, output_format, done_keys)
+        if removed:
+            print(f"Removed {removed} failed or unfinished records from {args.output} (retried now)", file=sys.stderr)
+
+    dedup_index = None
+    if args.dedup:
+        from .dedup import DedupIndex
+        dedup_index = DedupIndex()
+
+    writer = ResultWriter(args.output, output_format, checkpoint_path)
+    scored = failed = prefiltered = duplicates = 0
+    try:
+        for record in score_resumes(
+            iter_resume_paths(args.input), job_data, args.max_in_flight, done_keys,
+            pdf_timeout=args.pdf_timeout, max_pages=args.max_pages, prefilter=args.prefilter, dedup_index=dedup_index,
+            scoring_profile=scoring_profile
+        ):
+            writer.write(record)
+            if "error" in record:
+                failed += 1
+                metrics.inc("resumes_total", outcome="failed")
+                print(f"FAILED {record['file']}: {record['error']}", file=sys.stderr)
+            elif "prefilter" in record:
+                prefiltered += 1
+                metrics.inc("resumes_total", outcome="prefiltered")
+                print(f"SKIPPED {record['file']}: {record['prefilter']['reason']}", file=sys.stderr)
+            else:
+                scored += 1
+                metrics.inc("resumes_total", outcome="scored")
+                if "duplicate_of" in record:
+                    duplicates += 1
+                    metrics.inc("resume_duplicates_total")
+                    print(f"{record['final_score']:>5} {record['file']} (duplicate of {record['duplicate_of']}, "
+                          f"{record['similarity']:.0%} similar)", file=sys.stderr)
+                else:
+                    print(f"{record['final_score']:>5} {record['file']}", file=sys.stderr)
+    finally:
+        writer.close()
+        metrics_path = metrics.write_metrics_file(args.metrics_file)
+
+    print(f"Done: {scored} scored, {prefiltered} rejected by prefilter, {failed} failed -> {args.output}", file=sys.stderr)
+    if dedup_index is not None:
+        print(f"  Near-duplicates: {duplicates} resumes reused an earlier extraction", file=sys.stderr)
+        for cluster in dedup_index.clusters():
+            others = ", ".join(f"{item['name']} ({item['similarity']:.0%})" for item in cluster["duplicates"])
+            print(f"    {cluster['name']}: {others}", file=sys.stderr)
+    for stage, summary in metrics.stage_summary().items():
+        print(f"  {stage:<13} n={summary['count']:<6} mean={summary['mean']:.3f}s "
+              f"p50={summary['p50']:.3f}s p95={summary['p95']:.3f}s", file=sys.stderr)
+    parse_stats = get_parse_stats()
+    if parse_stats["total"]:
+        print(f"  LLM answers: {parse_stats['total']} parsed, {parse_stats['salvage_rate']:.1%} salvaged, "
+              f"{parse_stats['failure_rate']:.1%} unparseable, {parse_stats['retries']} targeted retries", file=sys.stderr)
+    compaction_stats = get_compaction_stats()
+    if compaction_stats["raw_tokens"]:
+        print(f"  Resume text: ~{compaction_stats['raw_tokens']} -> ~{compaction_stats['tokens']} tokens after compaction "
+              f"({compaction_stats['saved_ratio']:.0%} saved, {compaction_stats['truncated']} cut at the budget, "
+              f"{compaction_stats['over_budget']} still over it)",
+              file=sys.stderr)
+    if metrics_path:
+        print(f"Metrics -> {metrics_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
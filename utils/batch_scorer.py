@@ -0,0 +1,180 @@
+# Vectorized version of calculate_score for scoring a whole candidate pool at once
+
+import datetime
+
+import numpy as np
+
+from .scorer import (
+    EDUCATION_LEVEL_MAPPING,
+    adjusted_years,
+    calculate_total_experience,
+    candidate_skill_levels,
+    check_knockout,
+    profile_value,
+    weighted_total,
+)
+
+
+# Turning the candidate dicts into arrays (one row per candidate, one column per required skill)
+# Nothing here depends on the scoring profile: skill levels are kept as codes into encoded["levels"] (-1 for a
+# missing skill), so score_encoded can apply any profile's weights. utils.scoring_profiles.ComponentTable builds
+# the same dict from stored score components.
+def encode_candidates(job_data, candidates, reference_date=None):
+    if reference_date is None:
+        reference_date = datetime.datetime.now()
+
+    required_skills = job_data.get('required_skills', [])
+    required_names = [skill['name'].lower() for skill in required_skills]
+    preferred_names = [skill['name'].lower() for skill in job_data.get('preferred_skills', [])]
+    job_edu_val = EDUCATION_LEVEL_MAPPING.get(job_data.get('education_level', 'None'), 0)
+
+    n = len(candidates)
+    encoded = empty_encoding(
+        n, [skill.get('level', 'Unspecified') for skill in required_skills],
+        job_data.get('min_experience_years', 0), len(preferred_names)
+    )
+    level_codes = {}
+
+    for row, candidate_data in enumerate(candidates):
+        if check_knockout(job_data, candidate_data):
+            encoded["knocked_out"][row] = True
+            continue
+
+        cand_skills_map = candidate_skill_levels(candidate_data)
+
+        for col, skill_name in enumerate(required_names):
+            if skill_name in cand_skills_map:
+                encoded["skill_codes"][row, col] = level_code(encoded, level_codes, cand_skills_map[skill_name])
+
+        encoded["preferred_matches"][row] = sum(1 for name in preferred_names if name in cand_skills_map)
+
+        exp_calc = calculate_total_experience(candidate_data.get("work_history", []), reference_date)
+        encoded["primary_years"][row] = exp_calc["primary_years"]
+        encoded["secondary_years"][row] = exp_calc["secondary_years"]
+
+        encoded["education_gap"][row] = (
+            job_edu_val - EDUCATION_LEVEL_MAPPING.get(candidate_data.get('education_level', 'None'), 0)
+        )
+
+    return encoded
+
+
+def empty_encoding(n, required_levels, required_years, preferred_total):
+    return {
+        "required_levels": list(required_levels),
+        "required_years": required_years,
+        "preferred_total": preferred_total,
+        "levels": [],
+        "knocked_out": np.zeros(n, dtype=bool),
+        "skill_codes": np.full((n, len(required_levels)), -1, dtype=np.int16),
+        "primary_years": np.zeros(n, dtype=np.float64),
+        "secondary_years": np.zeros(n, dtype=np.float64),
+        "education_gap": np.zeros(n, dtype=np.int64),
+        "preferred_matches": np.zeros(n, dtype=np.int64),
+    }
+
+
+# Code of a candidate skill level in encoded["levels"], added on first use
+def level_code(encoded, level_codes, level):
+    if level not in level_codes:
+        level_codes[level] = len(encoded["levels"])
+        encoded["levels"].append(level)
+    return level_codes[level]
+
+
+# Same formula as score_candidate under the scoring profile (None is the default profile), evaluated column by
+# column so the float results are identical
+def score_encoded(encoded, scoring_profile=None):
+    n = len(encoded["knocked_out"])
+
+    # Skill Scoring (default profile: 30%)
+    if not encoded["required_levels"]:
+        skill_score = np.full(n, 100.0)
+    else:
+        skill_level_weights = profile_value(scoring_profile, "skill_level_weights")
+        required_level_weights = profile_value(scoring_profile, "required_level_weights")
+        level_weights = np.array([skill_level_weights.get(level, 1.0) for level in encoded["levels"]] or [0.0])
+        total_skill_points = np.zeros(n)
+        max_possible_points = 0
+        for col, required_level in enumerate(encoded["required_levels"]):
+            req_weight = required_level_weights.get(required_level, 1.0)
+            max_possible_points += req_weight
+            codes = encoded["skill_codes"][:, col]
+            earned = np.minimum(level_weights[np.maximum(codes, 0)], req_weight)
+            total_skill_points = total_skill_points + np.where(codes >= 0, earned, 0.0)
+        skill_score = np.minimum((total_skill_points / max_possible_points) * 100, 100)
+
+    # Experience Scoring (default profile: 45%)
+    req_exp_years = encoded["required_years"]
+    adjusted_candidate_years = adjusted_years(encoded["primary_years"], encoded["secondary_years"], scoring_profile)
+    if req_exp_years == 0:
+        exp_score = np.full(n, 100.0)
+    else:
+        exp_score = np.minimum((adjusted_candidate_years / req_exp_years) * 100, 100)
+
+    # Education Scoring (default profile: 15%)
+    diff = encoded["education_gap"]
+    edu_score = np.where(
+        diff <= 0, 100, np.maximum(100 - (diff * profile_value(scoring_profile, "education_step_penalty")), 0)
+    )
+
+    # Nice to Have Scoring (default profile: 10%)
+    total_pref = encoded["preferred_total"]
+    if not total_pref:
+        bonus_score = np.full(n, 100.0)
+    else:
+        bonus_score = (encoded["preferred_matches"] / total_pref) * 100
+
+    # Aggregation
+    final_score = weighted_total(
+        skill_score, exp_score, edu_score, bonus_score, profile_value(scoring_profile, "weights")
+    )
+
+    knocked_out = encoded["knocked_out"]
+    return {
+        "final_score": np.where(knocked_out, 0.0, final_score),
+        "skills": np.where(knocked_out, 0.0, skill_score),
+        "experience": np.where(knocked_out, 0.0, exp_score),
+        "education": np.where(knocked_out, 0.0, edu_score),
+        "bonus": np.where(knocked_out, 0.0, bonus_score),
+        "adjusted_years": adjusted_candidate_years,
+        "knocked_out": knocked_out,
+    }
+
+
+# Main Function : Scoring a Candidate Pool
+# Returns final_score + breakdown per candidate (same values as calculate_score under the same scoring_profile),
+# or the raw component arrays when as_arrays=True (e.g. for ranking)
+def calculate_scores_batch(job_data, candidates, as_arrays=False, reference_date=None, scoring_profile=None):
+    encoded = encode_candidates(job_data, candidates, reference_date)
+    scores = score_encoded(encoded, scoring_profile)
+    if as_arrays:
+        return scores
+
+    req_exp_years = encoded["required_years"]
+    results = []
+    # Python's round (not np.round) so the rounding matches calculate_score exactly
+    for row in range(len(candidates)):
+        if scores["knocked_out"][row]:
+            results.append({
+                "final_score": 0,
+                "breakdown": {"skills": 0, "experience": 0, "education": 0, "bonus": 0}
+            })
+            continue
+
+        results.append({
+            "final_score": round(float(scores["final_score"][row]), 1),
+            "breakdown": {
+                "skills": round(float(scores["skills"][row]), 1),
+                "experience": round(float(scores["experience"][row]), 1),
+                "education": round(float(scores["education"][row]), 1),
+                "bonus": round(float(scores["bonus"][row]), 1),
+                "years_calc": {
+                    "required": req_exp_years,
+                    "primary": float(encoded["primary_years"][row]),
+                    "secondary": float(encoded["secondary_years"][row]),
+                    "adjusted_total": float(scores["adjusted_years"][row])
+                }
+            }
+        })
+    return results
@@ -0,0 +1,215 @@
+# Disk-backed cache for LLM results (shared by every session and worker process)
+
+import hashlib
+import json
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+from . import metrics
+
+
+def hash_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# Same digest as hash_bytes, read in chunks from a binary file object (its position is restored)
+def hash_stream(fileobj, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    position = fileobj.tell()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        digest.update(chunk)
+    fileobj.seek(position)
+    return digest.hexdigest()
+
+
+# accessed_at only drives LRU eviction, so a hit refreshes it at most once per ACCESS_REFRESH_SECONDS
+ACCESS_REFRESH_SECONDS = 600
+# Hit/miss counters are kept in memory and added to the shared totals every COUNTER_FLUSH_EVERY lookups or
+# COUNTER_FLUSH_SECONDS (and by stats() and at exit)
+COUNTER_FLUSH_EVERY = 100
+COUNTER_FLUSH_SECONDS = 30
+# Eviction takes the table down to this fraction of max_entries, so the row count is only recounted once every
+# ~10% of max_entries writes; expired entries are purged at most once per TTL_PURGE_SECONDS
+EVICT_TO = 0.9
+TTL_PURGE_SECONDS = 300
+
+
+class LLMCache:
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_entries=10000, enabled=True):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._pending = {"hits": 0, "misses": 0}
+        self._flushed_at = time.monotonic()
+        # Rows in the table as far as this process knows: counted once, then incremented by every set
+        # (other processes' writes are picked up when the estimate reaches max_entries and the table is recounted)
+        self._entries = None
+        self._purged_at = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        atexit.register(self.flush_counters)
+
+    # Cache key: hash of the rendered prompt + model name + temperature
+    @staticmethod
+    def make_key(prompt, model, temperature):
+        return hash_text(json.dumps([model, float(temperature), prompt]))
+
+    # One connection per thread, WAL mode so several processes can read and write the same file
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            if name == "hits":
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._pending[name] += 1
+            due = (sum(self._pending.values()) >= COUNTER_FLUSH_EVERY
+                   or time.monotonic() - self._flushed_at >= COUNTER_FLUSH_SECONDS)
+        metrics.inc("cache_requests_total", result="hit" if name == "hits" else "miss")
+        if due:
+            self.flush_counters()
+
+    # Adds the lookups counted since the last flush to the totals shared by every process (one write)
+    def flush_counters(self):
+        with self._lock:
+            pending = {name: value for name, value in self._pending.items() if value}
+            self._pending = {"hits": 0, "misses": 0}
+            self._flushed_at = time.monotonic()
+        if not pending or not self.enabled:
+            return
+        try:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                list(pending.items())
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Cache Write Error: {e}")
+
+    # Read-only unless the entry's accessed_at is more than ACCESS_REFRESH_SECONDS old; expired entries count as
+    # misses and are replaced by the next set (or purged by _evict)
+    def get(self, key):
+        if not self.enabled:
+            return None
+        try:
+            conn = self._connect()
+            now = time.time()
+            row = conn.execute("SELECT value, created_at, accessed_at FROM entries WHERE key = ?", (key,)).fetchone()
+
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                self._count("misses")
+                return None
+
+            if now - row[2] > ACCESS_REFRESH_SECONDS:
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+            self._count("hits")
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Cache Read Error: {e}")
+            return None
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        try:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            self._evict(conn, now)
+            conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Cache Write Error: {e}")
+
+    # TTL first, then least recently used entries above max_entries
+    def _evict(self, conn, now):
+        with self._lock:
+            purge = self.ttl_seconds and now - self._purged_at >= TTL_PURGE_SECONDS
+            if purge:
+                self._purged_at = now
+            if self._entries is not None:
+                self._entries += 1
+            recount = self._entries is None or purge or (self.max_entries and self._entries > self.max_entries)
+        if purge:
+            conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,))
+        if not recount:
+            return
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if self.max_entries and entries > self.max_entries:
+            excess = entries - int(self.max_entries * EVICT_TO)
+            conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,)
+            )
+            entries -= excess
+        with self._lock:
+            self._entries = entries
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute("DELETE FROM entries")
+        conn.execute("DELETE FROM counters")
+        conn.commit()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self._pending = {"hits": 0, "misses": 0}
+            self._entries = 0
+
+    # Process-local counters plus the totals shared by every process using this file
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        result = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+        }
+        if not self.enabled:
+            return result
+        self.flush_counters()
+        try:
+            conn = self._connect()
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            result["entries"] = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            result["total_hits"] = counters.get("hits", 0)
+            result["total_misses"] = counters.get("misses", 0)
+        except sqlite3.Error as e:
+            print(f"Cache Read Error: {e}")
+        return result
@@ -0,0 +1,160 @@
+# Record/replay of LLM calls: a JSONL cassette of prompts, responses and observed latencies
+# Record mode wraps the real client and logs every call; replay mode serves the logged responses without calling Gemini.
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from .cache import hash_text
+
+
+class CassetteMissError(Exception):
+    pass
+
+
+# A recorded failure (e.g. a 429) raised again on replay, so retry behaviour is reproduced too
+class RecordedError(Exception):
+
+    def __init__(self, message, status_code=None, error_type=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.error_type = error_type
+
+
+class CassetteResponse:
+
+    def __init__(self, content):
+        self.content = content
+        self.usage_metadata = None
+
+
+def load_cassette(path):
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    return entries
+
+
+class CassetteRecorder:
+
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # One line per call, written with a single append so several processes can share a cassette
+    def _write(self, prompt, started_at, latency, content=None, error=None):
+        entry = {
+            "key": hash_text(prompt),
+            "started_at": started_at,
+            "latency": round(latency, 4),
+            "prompt": prompt,
+            "content": content,
+        }
+        if error is not None:
+            entry["error"] = str(error)
+            entry["error_type"] = type(error).__name__
+            status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+            entry["status_code"] = status_code if isinstance(status_code, int) else None
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def invoke(self, prompt):
+        started_at, started = time.time(), time.perf_counter()
+        try:
+            response = self.client.invoke(prompt)
+        except Exception as e:
+            self._write(prompt, started_at, time.perf_counter() - started, error=e)
+            raise
+        self._write(prompt, started_at, time.perf_counter() - started, content=response.content)
+        return response
+
+    async def ainvoke(self, prompt):
+        started_at, started = time.time(), time.perf_counter()
+        try:
+            response = await self.client.ainvoke(prompt)
+        except Exception as e:
+            self._write(prompt, started_at, time.perf_counter() - started, error=e)
+            raise
+        self._write(prompt, started_at, time.perf_counter() - started, content=response.content)
+        return response
+
+    # Keeps recording calls made through bound clients (e.g. schema-constrained output)
+    def bind(self, **kwargs):
+        recorder = CassetteRecorder(self.client.bind(**kwargs), self.path)
+        recorder._lock = self._lock
+        return recorder
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class CassettePlayer:
+
+    # latency_scale: 1.0 = original latencies, 0 = no waiting; fallback: client used for prompts not on the cassette
+    def __init__(self, path, latency_scale=1.0, fallback=None):
+        self.path = path
+        self.latency_scale = latency_scale
+        self.fallback = fallback
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Same prompt recorded several times (retries, repeated uploads) -> served in recorded order, the last one repeats
+        self._entries = defaultdict(deque)
+        for entry in sorted(load_cassette(path), key=lambda entry: entry.get("started_at") or 0):
+            self._entries[entry["key"]].append(entry)
+
+    def _next(self, prompt):
+        with self._lock:
+            entries = self._entries.get(hash_text(prompt))
+            if not entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entries.popleft() if len(entries) > 1 else entries[0]
+
+    def _response(self, entry):
+        if entry.get("error") is not None:
+            raise RecordedError(entry["error"], entry.get("status_code"), entry.get("error_type"))
+        return CassetteResponse(entry["content"])
+
+    def _miss(self, prompt):
+        return CassetteMissError(f"Prompt {hash_text(prompt)[:12]} is not on the cassette {self.path}")
+
+    def invoke(self, prompt):
+        entry = self._next(prompt)
+        if entry is None:
+            if self.fallback is None:
+                raise self._miss(prompt)
+            return self.fallback.invoke(prompt)
+        time.sleep(entry["latency"] * self.latency_scale)
+        return self._response(entry)
+
+    async def ainvoke(self, prompt):
+        entry = self._next(prompt)
+        if entry is None:
+            if self.fallback is None:
+                raise self._miss(prompt)
+            return await self.fallback.ainvoke(prompt)
+        await asyncio.sleep(entry["latency"] * self.latency_scale)
+        return self._response(entry)
+
+
+# mode: "record", "replay" or anything else (off) -> the client to use
+def wrap_client(client, mode, path, latency_scale=1.0):
+    if mode == "record":
+        return CassetteRecorder(client, path)
+    if mode == "replay":
+        return CassettePlayer(path, latency_scale)
+    return client
@@ -0,0 +1,245 @@
+# Deterministic resume text compaction before the LLM call
+# PDF text comes with page furniture (the same header/footer on every page, page numbers), contact details,
+# layout whitespace and sections no extracted field uses (references, publications, hobbies). They cost input
+# tokens, and Gemini latency grows with the input. compact_text removes them; the name and location lines, skills,
+# roles, dates, education and licenses are left as they are. A dropped section ends at the next heading-like line,
+# so an unknown heading ("Teaching Experience") is never dropped with it. Resumes still above the token budget get
+# their longest lines shortened, then lose bullet points from the bottom up (oldest roles first), and as a last
+# resort lose description lines written without a bullet. The header, role/date lines and the skills, education
+# and license sections are never cut: a resume they alone put over the budget is sent over it (over_budget).
+
+import os
+import re
+
+from .ratelimit import estimate_tokens
+
+# Estimated tokens (utils/ratelimit.estimate_tokens) of a compacted resume; 0 disables the budget
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", 3000))
+
+# read_pdf_text puts a form feed between pages
+PAGE_BREAK = "\f"
+# Header/footer lines are looked for among the first and last lines of each page
+EDGE_LINES = 3
+# Word limits tried in turn for long lines when a resume is over the budget
+LINE_WORD_LIMITS = (40, 25, 15)
+TRUNCATION_MARK = "\n[truncated]\n"
+
+# Section headings whose content does not go into any extracted field
+LOW_VALUE_SECTIONS = {
+    "references", "referees", "publications", "selected publications", "papers", "presentations",
+    "conference presentations", "talks", "patents", "interests", "hobbies", "hobbies and interests",
+    "hobbies & interests", "personal interests", "references available upon request",
+    "references available on request",
+}
+# Known headings; any other short Title Case or all-caps line counts as a heading too (_is_heading)
+SECTION_HEADINGS = {
+    "summary", "professional summary", "profile", "objective", "about me", "skills", "technical skills",
+    "core competencies", "experience", "work experience", "professional experience", "employment",
+    "employment history", "work history", "education", "education and training", "licenses", "certifications",
+    "licenses and certifications", "licenses & certifications", "projects", "volunteer experience", "awards",
+    "languages", "training", "courses", "licensure", "licensure and certification",
+    "licensure and certifications", "credentials",
+} | LOW_VALUE_SECTIONS
+# Sections the last-resort cut never touches (matched as words of the heading, e.g. "Licensure and Certification")
+PROTECTED_SECTION_WORDS = ("education", "licens", "certific", "credential", "degree", "skill", "competenc")
+# Outside those sections only description lines are cut: longer than a role line and without a date
+ROLE_LINE_MAX_WORDS = 8
+DATE_PATTERN = re.compile(r"\b(19|20)\d\d\b|\bpresent\b|\bcurrent\b", re.IGNORECASE)
+# Words that stay lower case in a Title Case heading ("Licensure and Certification")
+HEADING_SMALL_WORDS = {"and", "&", "of", "the", "in", "for", "to", "a", "an", "on", "with", "at"}
+HEADING_MAX_WORDS = 6
+
+WHITESPACE_PATTERN = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+PAGE_NUMBER_PATTERN = re.compile(r"^[-–—\s]*(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?[-–—\s]*$", re.IGNORECASE)
+PAGE_COUNTER_PATTERN = re.compile(r"\b(page\s*)?\d{1,3}\s*(of|/)\s*\d{1,3}\b|\bpage\s*\d{1,3}\b", re.IGNORECASE)
+# Email addresses, URLs and phone numbers ((555) 123-4567, 555.123.4567, +1 555 123 4567, +44 20 7946 0958);
+# year ranges ("2019 - 2021") do not match and no match spans two lines
+CONTACT_PATTERN = re.compile(
+    r"(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+    r"|(?:https?://|www\.)\S+|\b(?:linkedin\.com|github\.com)/\S*"
+    r"|(?<![\w+])(?:\+\d{1,3}[ .-]?)?(?:\(\d{3}\)|\d{3})[ .-]\d{3}[ .-]\d{4}(?!\w)"
+    r"|(?<![\w+])\+\d{1,3}(?:[ .-]\d{2,4}){2,4}(?!\w)",
+    re.IGNORECASE
+)
+CONTACT_MARK = "\x00"
+CONTACT_LABEL_PATTERN = re.compile(
+    r"\b(e-?mail|phone|tel|telephone|mobile|cell|linkedin|github|website|portfolio|web)\s*:", re.IGNORECASE
+)
+SEPARATOR_PATTERN = re.compile(r"\s*[|•·]\s*")
+BULLET_PATTERN = re.compile(r"^[-–•*·▪●◦]\s")
+
+
+def _heading_key(line):
+    return re.sub(r"[^a-z& ]+", "", line.lower()).strip()
+
+
+def _is_heading(line):
+    if len(line) > 40:
+        return False
+    if _heading_key(line) in SECTION_HEADINGS:
+        return True
+    # "PROFESSIONAL DEVELOPMENT": short, all caps, letters only
+    letters = line.replace("&", "").replace(" ", "")
+    return 0 < len(line.split()) <= 4 and letters.isalpha() and line.isupper()
+
+
+# Looser test that ends a dropped low-value section: also any short Title Case line without sentence punctuation
+# ("Teaching Experience", "Licensure and Certification"). A publication title can end the drop too, which only
+# keeps more text.
+def _is_heading_like(line):
+    if _is_heading(line):
+        return True
+    words = line.rstrip(":").split()
+    if not 0 < len(words) <= HEADING_MAX_WORDS or len(line) > 60:
+        return False
+    if not all(word == "&" or word.replace("-", "").replace("'", "").isalpha() for word in words):
+        return False
+    return all(word[0].isupper() or word.lower() in HEADING_SMALL_WORDS for word in words)
+
+
+def _is_protected(heading_key):
+    return any(word in heading_key for word in PROTECTED_SECTION_WORDS)
+
+
+# A role line names a title, company or dates ("Staff Nurse, Mercy Hospital (2019-03 - Present)")
+def _is_role_line(line):
+    return len(line.split()) <= ROLE_LINE_MAX_WORDS or bool(DATE_PATTERN.search(line))
+
+
+# Page counters do not count, so "Jane Doe - Page 2 of 3" matches between pages (dates and other numbers do)
+def _repeat_key(line):
+    return PAGE_COUNTER_PATTERN.sub("#", line.lower())
+
+
+# Lines at the top (or at the bottom) of at least two pages, and of half the pages or more, are page furniture.
+# Top and bottom are counted apart, so a role that ends one page and another that starts the next never match.
+# Returns {key: True for headers, False for footers}
+def _page_furniture(pages):
+    if len(pages) < 2:
+        return {}
+    counts = {}
+    for lines in pages:
+        content = [line for line in lines if line]
+        for edge, edge_lines in (("top", content[:EDGE_LINES]), ("bottom", content[-EDGE_LINES:])):
+            for key in {_repeat_key(line) for line in edge_lines}:
+                counts[edge, key] = counts.get((edge, key), 0) + 1
+    furniture = {}
+    for (edge, key), count in counts.items():
+        if count >= 2 and count * 2 >= len(pages):
+            furniture[key] = furniture.get(key, False) or edge == "top"
+    return furniture
+
+
+# What remains of a contact line once its email addresses, URLs and phone numbers (CONTACT_MARK) are removed;
+# usually the location
+def _strip_contact(line):
+    stripped = CONTACT_LABEL_PATTERN.sub(" ", line.replace(CONTACT_MARK, " "))
+    parts = [" ".join(part.split()).strip(" ,;:/") for part in SEPARATOR_PATTERN.split(stripped)]
+    return " | ".join(part for part in parts if part)
+
+
+def _shorten(lines, word_limit):
+    for index, line in enumerate(lines):
+        words = line.split(" ")
+        if len(words) > word_limit:
+            lines[index] = " ".join(words[:word_limit]) + " …"
+
+
+# Returns (compacted text, stats): raw_tokens/tokens before and after (estimate_tokens), repeated_lines,
+# page_numbers, contact_items, sections_dropped, lines_shortened, bullets_dropped, truncated and over_budget
+def compact_text(text, token_budget=None):
+    token_budget = RESUME_TOKEN_BUDGET if token_budget is None else token_budget
+    stats = {"raw_tokens": estimate_tokens(text), "tokens": 0, "repeated_lines": 0, "page_numbers": 0,
+             "contact_items": 0, "sections_dropped": 0, "lines_shortened": 0, "bullets_dropped": 0,
+             "truncated": False, "over_budget": False}
+
+    text, stats["contact_items"] = CONTACT_PATTERN.subn(CONTACT_MARK, text.replace(CONTACT_MARK, ""))
+    text = WHITESPACE_PATTERN.sub(" ", text)
+    pages = [[line.strip() for line in page.splitlines()] for page in text.split(PAGE_BREAK)]
+    furniture = _page_furniture(pages)
+
+    lines = []
+    seen_furniture = set()
+    for page in pages:
+        for line in page:
+            if PAGE_NUMBER_PATTERN.match(line):
+                stats["page_numbers"] += 1
+                continue
+            key = _repeat_key(line) if line else None
+            if key in furniture:
+                # The first copy of a header stays: on the first page it is often the candidate's name
+                if key in seen_furniture or not furniture[key]:
+                    stats["repeated_lines"] += 1
+                    continue
+                seen_furniture.add(key)
+            if CONTACT_MARK in line:
+                line = _strip_contact(line)
+                if not line:
+                    continue
+            lines.append(line)
+
+    kept = []
+    dropping = False
+    for line in lines:
+        if line and _is_heading_like(line):
+            dropping = _heading_key(line) in LOW_VALUE_SECTIONS
+            if dropping:
+                stats["sections_dropped"] += 1
+        if dropping:
+            continue
+        # One blank line at most between blocks
+        if line or (kept and kept[-1]):
+            kept.append(line)
+    while kept and not kept[-1]:
+        kept.pop()
+
+    compacted = "\n".join(kept) + "\n"
+    if token_budget:
+        for word_limit in LINE_WORD_LIMITS:
+            if estimate_tokens(compacted) <= token_budget:
+                break
+            _shorten(kept, word_limit)
+            compacted = "\n".join(kept) + "\n"
+        if estimate_tokens(compacted) > token_budget:
+            # Lines are dropped until the (estimated) length fits, without joining the text again each time
+            excess = len(compacted) - token_budget * 4
+            for index in range(len(kept) - 1, -1, -1):
+                if excess <= 0:
+                    break
+                if BULLET_PATTERN.match(kept[index]):
+                    excess -= len(kept[index]) + 1
+                    kept[index] = None
+                    stats["bullets_dropped"] += 1
+            kept = [line for line in kept if line is not None]
+            compacted = "\n".join(kept) + "\n"
+        if estimate_tokens(compacted) > token_budget:
+            # Description lines from the bottom up, outside the header (name, location) and the skills, education
+            # and license sections; role/date lines always stay. The first line dropped becomes the truncation mark
+            protected = []
+            section = None
+            for line in kept:
+                if line and _is_heading(line):
+                    section = _heading_key(line)
+                    protected.append(True)
+                else:
+                    protected.append(section is None or _is_protected(section) or _is_role_line(line))
+            excess = len(compacted) - token_budget * 4 + len(TRUNCATION_MARK)
+            first_dropped = None
+            for index in range(len(kept) - 1, -1, -1):
+                if excess <= 0:
+                    break
+                if not protected[index]:
+                    excess -= len(kept[index]) + 1
+                    kept[index] = None
+                    first_dropped = index
+            if first_dropped is not None:
+                kept[first_dropped] = TRUNCATION_MARK.strip()
+                kept = [line for line in kept if line is not None]
+                compacted = "\n".join(kept) + "\n"
+                stats["truncated"] = True
+        # The protected lines alone are over the budget: they are kept, and the overrun is counted by the caller
+        stats["over_budget"] = estimate_tokens(compacted) > token_budget
+
+    stats["lines_shortened"] = sum(1 for line in kept if line.endswith(" …"))
+    stats["tokens"] = estimate_tokens(compacted)
+    return compacted, stats
@@ -0,0 +1,172 @@
+# Near-duplicate resume detection: MinHash signatures over word shingles of the extracted text, LSH-banded index
+# A resume that is at least DEDUP_THRESHOLD similar to one already extracted for the same JD reuses that
+# extraction instead of another LLM call (re-applications with small edits, the same CV sent by several agencies).
+
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", 0.9))
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+# 16 bands x 8 rows: pairs at 0.9 similarity share a band with probability > 0.999, pairs at 0.5 with ~6%
+NUM_BANDS = 16
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Multiply-shift hash family ((a * x + b) mod 2^64) >> 32 with odd a; fixed seed so signatures are comparable
+# between runs and processes
+_rng = np.random.default_rng(20240601)
+_PERM_A = _rng.integers(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+
+
+# Case, punctuation, bullets and layout whitespace do not count as differences
+def normalize_words(text):
+    return WORD_PATTERN.findall(text.lower())
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    words = normalize_words(text)
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    if len(words) <= size:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[index:index + size]) for index in range(len(words) - size + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64,
+                       count=len(shingles))
+
+
+# None for texts without any words (nothing to compare)
+def minhash(text):
+    hashes = shingle_hashes(text)
+    if not hashes.size:
+        return None
+    return ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+# Estimated Jaccard similarity of the two shingle sets
+def similarity(signature_a, signature_b):
+    return float(np.count_nonzero(signature_a == signature_b)) / len(signature_a)
+
+
+class DedupEntry:
+
+    __slots__ = ("key", "name", "signature", "data", "ready", "duplicates")
+
+    def __init__(self, key, name, signature):
+        self.key = key
+        self.name = name
+        self.signature = signature
+        self.data = None
+        # Set once the extraction of this resume finished (data stays None if it failed)
+        self.ready = threading.Event()
+        self.duplicates = []
+
+
+# One index per JD: extractions depend on the JD (relevance labels), so they are only reused within it
+class DedupIndex:
+
+    def __init__(self, threshold=None, bands=NUM_BANDS):
+        self.threshold = DEDUP_THRESHOLD if threshold is None else threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.entries = {}
+        self._buckets = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    # Best indexed resume at or above the threshold: (entry, similarity), or (None, 0.0)
+    def _find(self, signature):
+        seen = set()
+        best, best_similarity = None, 0.0
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            for key in bucket.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                value = similarity(signature, self.entries[key].signature)
+                if value >= self.threshold and value > best_similarity:
+                    best, best_similarity = self.entries[key], value
+        return best, best_similarity
+
+    def _add(self, key, name, signature):
+        entry = DedupEntry(key, name, signature)
+        self.entries[key] = entry
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+        return entry
+
+    def find(self, text):
+        signature = minhash(text)
+        if signature is None:
+            return None, 0.0
+        with self._lock:
+            return self._find(signature)
+
+    # Atomic find-or-add: returns (entry, None, 0.0) when this resume is new and the caller should extract it,
+    # or (None, match, similarity) when an indexed resume (extracted or still in progress) covers it
+    def claim(self, key, text, name=None):
+        signature = minhash(text)
+        if signature is None:
+            return None, None, 0.0
+        with self._lock:
+            if key in self.entries and self.entries[key].data is None:
+                # Claimed before but never resolved (interrupted run): this caller owns it again
+                return self.entries[key], None, 0.0
+            match, value = self._find(signature)
+            if match is not None:
+                return None, match, value
+            return self._add(key, name, signature), None, 0.0
+
+    # Stores the extraction of a claimed resume; failed ones leave the index so later copies are extracted
+    def resolve(self, entry, data):
+        with self._lock:
+            entry.data = data
+            if data is None:
+                self.entries.pop(entry.key, None)
+                for bucket, band_key in zip(self._buckets, self._band_keys(entry.signature)):
+                    keys = bucket.get(band_key)
+                    if keys and entry.key in keys:
+                        keys.remove(entry.key)
+        entry.ready.set()
+
+    def add_duplicate(self, match, key, name, value):
+        with self._lock:
+            match.duplicates.append({"key": key, "name": name, "similarity": round(value, 3)})
+
+    # [{"key", "name", "duplicates": [{"key", "name", "similarity"}]}] for every resume that was reused
+    def clusters(self):
+        with self._lock:
+            return [
+                {"key": entry.key, "name": entry.name, "duplicates": list(entry.duplicates)}
+                for entry in self.entries.values() if entry.duplicates
+            ]
+
+
+# Extraction through the index: extract() is only called when no near-duplicate was extracted (or is being
+# extracted) for this JD. Returns (data, duplicate_info) where duplicate_info is None or
+# {"duplicate_of": name, "similarity": s}.
+def extract_with_dedup(index, key, text, extract, name=None):
+    entry, match, value = index.claim(key, text, name)
+    if match is not None:
+        match.ready.wait()
+        if match.data is not None:
+            index.add_duplicate(match, key, name, value)
+            return match.data, {"duplicate_of": match.name or match.key, "similarity": round(value, 3)}
+        return extract(), None
+    if entry is None:
+        return extract(), None
+
+    data = None
+    try:
+        data = extract()
+    finally:
+        index.resolve(entry, data)
+    return data, None
@@ -1,50 +1,269 @@
 # Data Extraction from PDF and Giving it to LLM
 
-import pdfplumber
+import asyncio
+import itertools
 import json
 import os
+import queue
+import threading
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from .prompts import JOB_DESCRIPTION_PROMPT, RESUME_PROMPT
+from . import metrics
+from .cache import LLMCache
+from .cassette import wrap_client
+from .compaction import PAGE_BREAK, compact_text
+from .parsing import api_schema, conform, salvage_json, scan_json, strip_fences
+from .pdf_pool import read_pdf_text
+from .prompts import (
+    BATCH_RESUME_ITEM, BATCH_RESUME_PROMPT, JOB_DESCRIPTION_PROMPT, OUTPUT_SCHEMAS, PROFILE_PROMPT, RELEVANCE_PROMPT,
+    REPAIR_PROMPT, RESUME_PROMPT
+)
+from .ratelimit import RateLimiter, backoff_delay, error_category, estimate_tokens, is_retryable_error
 
 load_dotenv()
 
+MODEL_NAME = "gemini-2.5-flash"
+TEMPERATURE = 0.0
+
 api_key = os.getenv("GOOGLE_API_KEY")
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=api_key, temperature=0.0)
 
-def extract_text_from_pdf(uploaded_file):
+# Record every Gemini call to a JSONL cassette, or replay one instead of calling Gemini (see utils/cassette.py)
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off")
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", os.path.join(".cache", "llm_cassette.jsonl"))
+LLM_CASSETTE_LATENCY_SCALE = float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", 1.0))
+
+# Clients per process, used round-robin (each has its own HTTP connection pool)
+LLM_CLIENT_POOL_SIZE = int(os.getenv("LLM_CLIENT_POOL_SIZE", 1))
+
+# The Gemini client (and langchain_google_genai) is only loaded by the first LLM call, so importing this module
+# stays cheap for the app start-up and for code that only scores. Clients are rebuilt after a fork.
+_clients = []
+_client_pid = None
+_client_cycle = None
+_client_lock = threading.Lock()
+_client_override = None
+
+
+def create_llm():
+    if LLM_CASSETTE_MODE == "replay":
+        return wrap_client(None, LLM_CASSETTE_MODE, LLM_CASSETTE_PATH, LLM_CASSETTE_LATENCY_SCALE)
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    client = ChatGoogleGenerativeAI(model=MODEL_NAME, google_api_key=api_key, temperature=TEMPERATURE)
+    return wrap_client(client, LLM_CASSETTE_MODE, LLM_CASSETTE_PATH, LLM_CASSETTE_LATENCY_SCALE)
+
+
+def get_llm():
+    global _clients, _client_pid, _client_cycle
+    if _client_override is not None:
+        return _client_override
+    if globals().get("llm") is not None:
+        return globals()["llm"]
+    if _client_pid != os.getpid():
+        with _client_lock:
+            if _client_pid != os.getpid():
+                # A replayed cassette is shared: its responses are consumed in order
+                size = 1 if LLM_CASSETTE_MODE == "replay" else max(1, LLM_CLIENT_POOL_SIZE)
+                _clients = [create_llm() for _ in range(size)]
+                _client_cycle = itertools.cycle(_clients)
+                _client_pid = os.getpid()
+    if len(_clients) == 1:
+        return _clients[0]
+    with _client_lock:
+        return next(_client_cycle)
+
+
+# Replaces the client for every call that does not pass client= (None goes back to the Gemini client)
+def set_llm(client):
+    global _client_override
+    _client_override = client
+
+
+# "extractor.llm" still works for code written against the old eagerly created module attribute
+def __getattr__(name):
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Same JD / same resume against the same JD JSON -> same prompt -> served from disk
+llm_cache = LLMCache(
+    path=os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3")),
+    ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000)),
+    enabled=os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+)
+
+# Async batch settings (0 disables the RPM/TPM limits)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+LLM_RPM = int(os.getenv("LLM_RPM", 0))
+LLM_TPM = int(os.getenv("LLM_TPM", 0))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))
+
+# Two-stage resume extraction (JD-independent profile + small relevance call), see extract_resume
+RESUME_TWO_STAGE = os.getenv("RESUME_TWO_STAGE", "0") == "1"
+
+# Resumes packed into one request by the batched mode (1 = one request per resume)
+RESUME_BATCH_SIZE = int(os.getenv("RESUME_BATCH_SIZE", 1))
+
+# Schema-constrained generation (OUTPUT_SCHEMAS in prompts.py) and targeted retries when an answer cannot be salvaged
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "1") != "0"
+LLM_PARSE_RETRIES = int(os.getenv("LLM_PARSE_RETRIES", 1))
+
+# Resume text is compacted before it goes into a prompt (utils/compaction.py, budget RESUME_TOKEN_BUDGET); opt-in
+RESUME_COMPACTION = os.getenv("RESUME_COMPACTION", "0") == "1"
+
+def extract_text_from_pdf(uploaded_file, max_pages=None):
     try:
-        text = ""
-        with pdfplumber.open(uploaded_file) as pdf:
-            for page in pdf.pages:
-                extracted_text = page.extract_text() or ""
-                if extracted_text:
-                    text += extracted_text + "\n"
+        with metrics.timer("pdf_parse"):
+            text, _ = read_pdf_text(uploaded_file, max_pages)
         return text
     except Exception as e:
+        metrics.inc("errors_total", stage="pdf_parse", category="invalid_pdf")
         print("PDF Extraction Error: ",e)
         return ""
     
 
-def extract_data_with_gemini(text, type="resume", job_description_data=None):
+# Resume text as it goes into the prompt; raw and compacted token counts are counted when record is set
+def prepare_resume_text(text, record=True):
+    if not RESUME_COMPACTION:
+        # Without the page breaks the text is exactly what the PDF parser used to return
+        return text.replace(PAGE_BREAK, "")
+    with metrics.timer("compaction"):
+        compacted, stats = compact_text(text)
+    if record:
+        metrics.inc("resume_text_tokens_total", stats["raw_tokens"], stage="raw")
+        metrics.inc("resume_text_tokens_total", stats["tokens"], stage="compacted")
+        if stats["truncated"]:
+            metrics.inc("resume_text_truncated_total")
+        if stats["over_budget"]:
+            metrics.inc("resume_text_over_budget_total")
+    return compacted
+
+
+def build_prompt(text, type="resume", job_description_data=None):
     if type=="job_description":
-        final_prompt = JOB_DESCRIPTION_PROMPT.format(text=text)
-    else:
-        if job_description_data:
-            if isinstance(job_description_data, dict):
-                job_json_str = json.dumps(job_description_data, indent=2)
-            else:
-                job_json_str = str(job_description_data)
-        else:
-            job_json_str = "{}"
-        final_prompt = RESUME_PROMPT.format(text=text, job_json=job_json_str)
+        return JOB_DESCRIPTION_PROMPT.format(text=text)
+    if type in ("resume", "profile"):
+        text = prepare_resume_text(text)
+    if type=="profile":
+        return PROFILE_PROMPT.format(text=text)
+
+    job_json_str = job_json_string(job_description_data)
+    if type=="relevance":
+        return RELEVANCE_PROMPT.format(text=text, job_json=job_json_str)
+    return RESUME_PROMPT.format(text=text, job_json=job_json_str)
+
+
+def job_json_string(job_description_data):
+    if job_description_data:
+        if isinstance(job_description_data, dict):
+            return json.dumps(job_description_data, indent=2)
+        return str(job_description_data)
+    return "{}"
+
+
+# Tolerant parse (fences, surrounding prose, truncated output), then validated against the output schema of "type"
+# with defaults filled in. Raises json.JSONDecodeError when nothing usable can be recovered.
+def parse_llm_content(content, type=None):
+    with metrics.timer("json_parse"):
+        try:
+            data, method = salvage_json(content)
+            fixes = 0
+            if type in OUTPUT_SCHEMAS:
+                # A bare null / string / number is no answer; conform would turn it into an empty object
+                if not isinstance(data, (dict, list)):
+                    raise json.JSONDecodeError("Answer is not a JSON object", str(content), 0)
+                data, fixes = conform(data, OUTPUT_SCHEMAS[type])
+                if data is None:
+                    raise json.JSONDecodeError("Answer does not match the output schema", str(content), 0)
+        except json.JSONDecodeError:
+            metrics.inc("errors_total", stage="json_parse", category="invalid_json")
+            metrics.inc("llm_parse_total", type=type or "unknown", result="failed")
+            raise
+    if method == "clean" and fixes:
+        method = "conformed"
+    metrics.inc("llm_parse_total", type=type or "unknown", result=method)
+    return data
+
+
+# Clients that support it (LangChain chat models) are bound to the JSON schema of the prompt type
+def structured_client(client, type):
+    if not LLM_STRUCTURED_OUTPUT or type not in OUTPUT_SCHEMAS or not hasattr(client, "bind"):
+        return client
+    return client.bind(response_mime_type="application/json", response_json_schema=api_schema(OUTPUT_SCHEMAS[type]))
+
+
+# Targeted retry: a malformed answer is sent back alone to be fixed; with no JSON at all, or a truncated answer,
+# the data is missing and the original request is repeated
+def repair_prompt(prompt, content, type):
+    fragment, open_brackets = scan_json(strip_fences(content or ""))
+    if fragment is None or open_brackets or type not in OUTPUT_SCHEMAS:
+        return prompt
+    return REPAIR_PROMPT.format(schema=json.dumps(api_schema(OUTPUT_SCHEMAS[type]), indent=2), text=content)
+
+
+def parse_with_retries(content, prompt, type, client=None):
+    for attempt in range(LLM_PARSE_RETRIES + 1):
+        try:
+            return parse_llm_content(content, type)
+        except json.JSONDecodeError:
+            if attempt == LLM_PARSE_RETRIES:
+                raise
+        metrics.inc("llm_parse_retries_total", type=type)
+        content = invoke_llm(
+            repair_prompt(prompt, content, type), structured_client(client or get_llm(), type), type
+        )
+
+
+async def aparse_with_retries(content, prompt, type, client=None, limiter=None):
+    for attempt in range(LLM_PARSE_RETRIES + 1):
+        try:
+            return parse_llm_content(content, type)
+        except json.JSONDecodeError:
+            if attempt == LLM_PARSE_RETRIES:
+                raise
+        metrics.inc("llm_parse_retries_total", type=type)
+        content = await ainvoke_with_retries(
+            repair_prompt(prompt, content, type), structured_client(client or get_llm(), type), limiter, type=type
+        )
+
+
+# Token usage as reported by the API (usage_metadata), estimated from the text when it is missing
+def record_llm_usage(prompt, response, type):
+    usage = getattr(response, "usage_metadata", None) or {}
+    metrics.inc("llm_tokens_total", usage.get("input_tokens") or estimate_tokens(prompt), direction="input", type=type)
+    metrics.inc("llm_tokens_total", usage.get("output_tokens") or estimate_tokens(str(response.content)),
+                direction="output", type=type)
+
+
+# One timed LLM request; failures are counted by category and re-raised
+def invoke_llm(prompt, client=None, type="resume"):
+    try:
+        with metrics.timer("llm"):
+            response = (client or get_llm()).invoke(prompt)
+    except Exception as e:
+        metrics.inc("llm_requests_total", type=type, outcome="error")
+        metrics.inc("errors_total", stage="llm", category=error_category(e))
+        raise
+    metrics.inc("llm_requests_total", type=type, outcome="ok")
+    record_llm_usage(prompt, response, type)
+    return response.content
+
+
+def extract_data_with_gemini(text, type="resume", job_description_data=None, use_cache=True, client=None):
+    with metrics.timer("prompt_build"):
+        final_prompt = build_prompt(text, type, job_description_data)
+
+    cache_key = llm_cache.make_key(final_prompt, MODEL_NAME, TEMPERATURE)
+    if use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
     try:
-        response = llm.invoke(final_prompt)
-        content = response.content
+        content = invoke_llm(final_prompt, structured_client(client or get_llm(), type), type)
+        data = parse_with_retries(content, final_prompt, type, client)
 
-        content = content.replace("```json", "").replace("```", "").strip()
-        data = json.loads(content)
+        if use_cache:
+            llm_cache.set(cache_key, data)
         
         return data
     
@@ -53,4 +272,406 @@ def extract_data_with_gemini(text, type="resume", job_description_data=None):
         return None
     except Exception as e:
         print(f"General Error: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+# Async LLM call: waits on the rate limiter and retries 429/5xx/timeouts with jittered exponential backoff
+async def ainvoke_with_retries(prompt, client=None, limiter=None, max_retries=None, type="resume"):
+    if max_retries is None:
+        max_retries = LLM_MAX_RETRIES
+
+    for attempt in range(max_retries + 1):
+        if limiter:
+            await limiter.acquire(estimate_tokens(prompt))
+        try:
+            with metrics.timer("llm"):
+                response = await (client or get_llm()).ainvoke(prompt)
+        except Exception as e:
+            metrics.inc("llm_requests_total", type=type, outcome="error")
+            metrics.inc("errors_total", stage="llm", category=error_category(e))
+            if attempt < max_retries and is_retryable_error(e):
+                metrics.inc("llm_retries_total", type=type)
+                delay = backoff_delay(attempt)
+                print(f"Retryable Error (attempt {attempt + 1}/{max_retries}), retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                continue
+            raise
+        metrics.inc("llm_requests_total", type=type, outcome="ok")
+        record_llm_usage(prompt, response, type)
+        return response.content
+
+
+# SQLite reads and writes block, so the async paths run them in a worker thread (LLMCache keeps one connection per thread)
+async def acache_get(key):
+    if not llm_cache.enabled:
+        return None
+    return await asyncio.to_thread(llm_cache.get, key)
+
+
+async def acache_set(key, value):
+    if llm_cache.enabled:
+        await asyncio.to_thread(llm_cache.set, key, value)
+
+
+# Async version of extract_data_with_gemini
+async def aextract_data_with_gemini(text, type="resume", job_description_data=None, use_cache=True,
+                                    client=None, limiter=None, max_retries=None):
+    with metrics.timer("prompt_build"):
+        final_prompt = build_prompt(text, type, job_description_data)
+
+    cache_key = llm_cache.make_key(final_prompt, MODEL_NAME, TEMPERATURE)
+    if use_cache:
+        cached = await acache_get(cache_key)
+        if cached is not None:
+            return cached
+
+    try:
+        content = await ainvoke_with_retries(
+            final_prompt, structured_client(client or get_llm(), type), limiter, max_retries, type
+        )
+        data = await aparse_with_retries(content, final_prompt, type, client, limiter)
+    except json.JSONDecodeError:
+        print("Error: Gemini did not give a valid json")
+        return None
+    except Exception as e:
+        print(f"General Error: {e}")
+        return None
+
+    if use_cache:
+        await acache_set(cache_key, data)
+    return data
+
+
+# Two-stage resume extraction
+# Stage 1 (profile) has no Job Description in its prompt, so the cache serves it for every job the resume is scored against.
+# Stage 2 (relevance) only sends the role titles and a JD summary.
+def summarize_job(job_description_data):
+    job_description_data = job_description_data or {}
+    return {
+        "job_title": job_description_data.get("job_title"),
+        "required_skills": [s.get("name") for s in job_description_data.get("required_skills", [])],
+        "preferred_skills": [s.get("name") for s in job_description_data.get("preferred_skills", [])],
+    }
+
+
+def work_history_for_relevance(profile):
+    return json.dumps([
+        {"index": index, "role": role.get("role"), "company": role.get("company"), "summary": role.get("summary", "")}
+        for index, role in enumerate(profile.get("work_history", []))
+    ], indent=2)
+
+
+# Same shape as the single-call "resume" output: Irrelevant (or unlabeled) roles are dropped
+def merge_relevance(profile, relevance_data):
+    labels = {}
+    for item in (relevance_data or {}).get("relevance", []):
+        if isinstance(item, dict):
+            labels[item.get("index")] = item.get("relevance")
+
+    candidate = {key: value for key, value in profile.items() if key != "work_history"}
+    candidate["work_history"] = []
+    for index, role in enumerate(profile.get("work_history", [])):
+        relevance = labels.get(index)
+        if relevance in ("Primary", "Secondary"):
+            role = {key: value for key, value in role.items() if key != "summary"}
+            role["relevance"] = relevance
+            candidate["work_history"].append(role)
+    candidate["total_primary_years"] = None
+    candidate["total_secondary_years"] = None
+    return candidate
+
+
+def extract_resume_two_stage(text, job_description_data=None, client=None):
+    profile = extract_data_with_gemini(text, "profile", client=client)
+    if profile is None:
+        return None
+    if not profile.get("work_history"):
+        return merge_relevance(profile, None)
+
+    relevance_data = extract_data_with_gemini(
+        work_history_for_relevance(profile), "relevance", summarize_job(job_description_data), client=client
+    )
+    if relevance_data is None:
+        return None
+    return merge_relevance(profile, relevance_data)
+
+
+async def aextract_resume_two_stage(text, job_description_data=None, client=None, limiter=None):
+    profile = await aextract_data_with_gemini(text, "profile", client=client, limiter=limiter)
+    if profile is None:
+        return None
+    if not profile.get("work_history"):
+        return merge_relevance(profile, None)
+
+    relevance_data = await aextract_data_with_gemini(
+        work_history_for_relevance(profile), "relevance", summarize_job(job_description_data),
+        client=client, limiter=limiter
+    )
+    if relevance_data is None:
+        return None
+    return merge_relevance(profile, relevance_data)
+
+
+# Resume extraction in the configured mode (RESUME_TWO_STAGE unless two_stage is given)
+def extract_resume(text, job_description_data=None, two_stage=None, client=None):
+    if RESUME_TWO_STAGE if two_stage is None else two_stage:
+        return extract_resume_two_stage(text, job_description_data, client=client)
+    return extract_data_with_gemini(text, "resume", job_description_data, client=client)
+
+
+# Batched resume extraction: N resumes per request, the instructions and JD JSON are only sent once.
+# Every valid item is also cached under its single-resume prompt; missing or invalid items fall back to single calls.
+# The token counts of each resume were already recorded when its single-resume prompt was built for the cache key.
+def build_batch_prompt(texts, job_description_data=None):
+    resumes = "".join(
+        BATCH_RESUME_ITEM.format(resume_id=f"R{index + 1}", text=prepare_resume_text(text, record=False))
+        for index, text in enumerate(texts)
+    )
+    return BATCH_RESUME_PROMPT.format(job_json=job_json_string(job_description_data), resumes=resumes)
+
+
+def is_valid_resume_data(data):
+    return (
+        isinstance(data, dict)
+        and isinstance(data.get("skills", []), list)
+        and isinstance(data.get("work_history", []), list)
+        and isinstance(data.get("licenses", []), list)
+    )
+
+
+def split_batch_results(data, count):
+    items = data.get("results", []) if isinstance(data, dict) else data
+    results = [None] * count
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        resume_id = str(item.get("resume_id", ""))
+        if resume_id[:1] == "R" and resume_id[1:].isdigit() and 1 <= int(resume_id[1:]) <= count:
+            candidate = {key: value for key, value in item.items() if key != "resume_id"}
+            if is_valid_resume_data(candidate):
+                results[int(resume_id[1:]) - 1] = candidate
+    return results
+
+
+async def aextract_resumes_batched(texts, job_description_data=None, batch_size=None, concurrency=None,
+                                   rpm=None, tpm=None, client=None, on_result=None, limiter=None, semaphore=None):
+    batch_size = batch_size or RESUME_BATCH_SIZE
+    limiter = limiter or RateLimiter(LLM_RPM if rpm is None else rpm, LLM_TPM if tpm is None else tpm)
+    semaphore = semaphore or asyncio.Semaphore(concurrency or LLM_MAX_CONCURRENCY)
+    results = [None] * len(texts)
+    stats = {"resumes": len(texts), "cache_hits": 0, "batch_requests": 0, "batched": 0, "fallbacks": 0,
+             "single_prompt_tokens": 0, "sent_prompt_tokens": 0}
+
+    pending = []
+    for index, text in enumerate(texts):
+        with metrics.timer("prompt_build"):
+            prompt = build_prompt(text, "resume", job_description_data)
+        cached = await acache_get(llm_cache.make_key(prompt, MODEL_NAME, TEMPERATURE))
+        if cached is not None:
+            stats["cache_hits"] += 1
+            results[index] = cached
+            if on_result:
+                on_result(index, cached)
+        else:
+            stats["single_prompt_tokens"] += estimate_tokens(prompt)
+            pending.append((index, prompt))
+
+    async def run_chunk(chunk):
+        with metrics.timer("prompt_build"):
+            batch_prompt = build_batch_prompt([texts[index] for index, _ in chunk], job_description_data)
+        async with semaphore:
+            stats["batch_requests"] += 1
+            stats["sent_prompt_tokens"] += estimate_tokens(batch_prompt)
+            try:
+                items = split_batch_results(parse_llm_content(
+                    await ainvoke_with_retries(
+                        batch_prompt, structured_client(client or get_llm(), "resume_batch"), limiter, type="resume_batch"
+                    ), "resume_batch"
+                ), len(chunk))
+            except Exception as e:
+                print(f"Batch Extraction Error, falling back to single calls: {e}")
+                items = [None] * len(chunk)
+
+        for (index, prompt), data in zip(chunk, items):
+            if data is not None:
+                stats["batched"] += 1
+                await acache_set(llm_cache.make_key(prompt, MODEL_NAME, TEMPERATURE), data)
+            else:
+                stats["fallbacks"] += 1
+                stats["sent_prompt_tokens"] += estimate_tokens(prompt)
+                async with semaphore:
+                    data = await aextract_data_with_gemini(
+                        texts[index], "resume", job_description_data, use_cache=False, client=client, limiter=limiter
+                    )
+                if data is not None:
+                    await acache_set(llm_cache.make_key(prompt, MODEL_NAME, TEMPERATURE), data)
+            results[index] = data
+            if on_result:
+                on_result(index, data)
+
+    chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+
+    stats["saved_prompt_tokens"] = stats["single_prompt_tokens"] - stats["sent_prompt_tokens"]
+    stats["saved_ratio"] = round(stats["saved_prompt_tokens"] / stats["single_prompt_tokens"], 3) if stats["single_prompt_tokens"] else 0.0
+    return results, stats
+
+
+def extract_resumes_batched(texts, job_description_data=None, batch_size=None, **kwargs):
+    return asyncio.run(aextract_resumes_batched(texts, job_description_data, batch_size, **kwargs))
+
+
+# Batch driver: at most "concurrency" calls in flight, shared RPM/TPM limits for the whole batch
+# on_result(index, data) is called as soon as each item finishes; results are returned in input order
+# Resumes go through the batched mode when batch_size (or RESUME_BATCH_SIZE) is above 1
+# limiter / semaphore: shared with other batches running on the same event loop (ExtractionSession) instead of
+# new ones built from rpm, tpm and concurrency
+async def aextract_batch(texts, type="resume", job_description_data=None, concurrency=None,
+                         rpm=None, tpm=None, client=None, on_result=None, two_stage=None, batch_size=None,
+                         limiter=None, semaphore=None):
+    if two_stage is None:
+        two_stage = RESUME_TWO_STAGE
+    batch_size = batch_size or RESUME_BATCH_SIZE
+    if type == "resume" and not two_stage and batch_size > 1:
+        results, stats = await aextract_resumes_batched(
+            texts, job_description_data, batch_size, concurrency, rpm, tpm, client, on_result, limiter, semaphore
+        )
+        print(f"Batched extraction: {stats['batch_requests']} requests for {stats['resumes']} resumes, "
+              f"{stats['fallbacks']} fallbacks, ~{stats['saved_prompt_tokens']} input tokens saved ({stats['saved_ratio']:.0%})")
+        return results
+
+    limiter = limiter or RateLimiter(LLM_RPM if rpm is None else rpm, LLM_TPM if tpm is None else tpm)
+    semaphore = semaphore or asyncio.Semaphore(concurrency or LLM_MAX_CONCURRENCY)
+
+    async def run(index, text):
+        async with semaphore:
+            if type == "resume" and two_stage:
+                data = await aextract_resume_two_stage(text, job_description_data, client=client, limiter=limiter)
+            else:
+                data = await aextract_data_with_gemini(
+                    text, type, job_description_data, client=client, limiter=limiter
+                )
+        if on_result:
+            on_result(index, data)
+        return data
+
+    return await asyncio.gather(*(run(index, text) for index, text in enumerate(texts)))
+
+
+def extract_batch(texts, type="resume", job_description_data=None, **kwargs):
+    return asyncio.run(aextract_batch(texts, type, job_description_data, **kwargs))
+
+
+# Extraction for input that arrives in pieces (utils/ingest.py chunks): one event loop in a background thread, one
+# RateLimiter and one concurrency limit for everything submitted, so LLM_RPM / LLM_TPM hold across pieces and a
+# piece's calls start while the previous piece's slowest calls are still running.
+# on_result(index, data) callbacks run in the thread that calls collect() (e.g. the Streamlit script thread).
+class ExtractionSession:
+
+    def __init__(self, type="resume", job_description_data=None, concurrency=None, rpm=None, tpm=None,
+                 client=None, two_stage=None, batch_size=None):
+        self.type = type
+        self.job_description_data = job_description_data
+        self.client = client
+        self.two_stage = two_stage
+        self.batch_size = batch_size
+        self.limiter = RateLimiter(LLM_RPM if rpm is None else rpm, LLM_TPM if tpm is None else tpm)
+        self.semaphore = asyncio.Semaphore(concurrency or LLM_MAX_CONCURRENCY)
+        # Texts submitted whose on_result has not run yet
+        self.pending = 0
+        self._results = queue.Queue()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="extraction-session", daemon=True)
+        self._thread.start()
+
+    # Starts extracting texts without waiting; on_result(index, data) is called by collect()
+    def submit(self, texts, on_result):
+        texts = list(texts)
+        if not texts:
+            return
+        reported = set()
+
+        def report(index, data):
+            reported.add(index)
+            self._results.put((on_result, index, data))
+
+        # Runs on the loop thread, after every report of this batch
+        def done(future):
+            if future.cancelled() or future.exception() is not None:
+                print(f"Extraction Error: {'cancelled' if future.cancelled() else future.exception()}")
+                for index in range(len(texts)):
+                    if index not in reported:
+                        self._results.put((on_result, index, None))
+
+        self.pending += len(texts)
+        future = asyncio.run_coroutine_threadsafe(aextract_batch(
+            texts, self.type, self.job_description_data, client=self.client, on_result=report,
+            two_stage=self.two_stage, batch_size=self.batch_size, limiter=self.limiter, semaphore=self.semaphore
+        ), self._loop)
+        future.add_done_callback(done)
+
+    # Runs the callbacks of finished texts, waiting until at most max_pending texts are still being extracted
+    def collect(self, max_pending=0):
+        while self.pending:
+            try:
+                on_result, index, data = self._results.get(block=self.pending > max_pending)
+            except queue.Empty:
+                break
+            self.pending -= 1
+            on_result(index, data)
+
+    # Texts still being extracted (an interrupted upload) are cancelled
+    async def _cancel_tasks(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._cancel_tasks(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_cache_stats():
+    return llm_cache.stats()
+
+
+# Estimated resume tokens before and after compaction, over every resume prompt built since start
+def get_compaction_stats():
+    stats = {"raw_tokens": 0, "tokens": 0, "truncated": 0, "over_budget": 0}
+    for (name, labels), value in metrics.registry.counter_values().items():
+        if name == "resume_text_tokens_total":
+            stats["raw_tokens" if dict(labels)["stage"] == "raw" else "tokens"] += value
+        elif name == "resume_text_truncated_total":
+            stats["truncated"] += value
+        elif name == "resume_text_over_budget_total":
+            stats["over_budget"] += value
+    stats["saved_tokens"] = stats["raw_tokens"] - stats["tokens"]
+    stats["saved_ratio"] = round(stats["saved_tokens"] / stats["raw_tokens"], 4) if stats["raw_tokens"] else 0.0
+    return stats
+
+
+# Parse outcomes since start: clean, conformed (schema defaults/coercions), extracted (JSON inside prose),
+# repaired (truncated output closed) and failed, plus the salvage and failure rates
+def get_parse_stats():
+    stats = {"total": 0, "clean": 0, "conformed": 0, "extracted": 0, "repaired": 0, "failed": 0, "retries": 0}
+    for (name, labels), value in metrics.registry.counter_values().items():
+        if name == "llm_parse_total":
+            result = dict(labels)["result"]
+            stats[result] = stats.get(result, 0) + value
+            stats["total"] += value
+        elif name == "llm_parse_retries_total":
+            stats["retries"] += value
+    stats["salvage_rate"] = round((stats["extracted"] + stats["repaired"]) / stats["total"], 4) if stats["total"] else 0.0
+    stats["failure_rate"] = round(stats["failed"] / stats["total"], 4) if stats["total"] else 0.0
+    return stats
\ No newline at end of file
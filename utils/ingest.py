@@ -0,0 +1,182 @@
+# Memory-bounded ingestion of large resume uploads
+# Raw files are copied to a spool directory in chunks; PDF worker processes read them from there and write the
+# extracted text back to the spool, so neither passes through this process. Documents move through in chunks of
+# max_in_flight: while one chunk is handed to process_chunk, the next one is being parsed. Spooled files are
+# deleted as soon as process_chunk returns, so peak memory depends on max_in_flight, not on the number of files.
+# process_chunk can score the chunk itself, or submit it to an extractor.ExtractionSession and only wait until at
+# most max_in_flight texts are still being extracted; chunks then overlap under one LLM rate limit (app.py).
+
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+from . import metrics
+from .pdf_pool import PdfExtractionPool
+
+INGEST_MAX_IN_FLIGHT = int(os.getenv("INGEST_MAX_IN_FLIGHT", 16))
+# Defaults to the system temp directory
+INGEST_SPOOL_DIR = os.getenv("INGEST_SPOOL_DIR") or None
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+# {"rss": bytes, "peak_rss": bytes} of this process (PDF worker processes not included)
+def memory_usage():
+    usage = {}
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    usage["rss"] = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    usage["peak_rss"] = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if "peak_rss" not in usage:
+        # ru_maxrss is in KiB on Linux and in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage["peak_rss"] = peak if sys.platform == "darwin" else peak * 1024
+    usage.setdefault("rss", usage["peak_rss"])
+    return usage
+
+
+def record_memory():
+    usage = memory_usage()
+    metrics.set_gauge("memory_rss_bytes", usage["rss"])
+    metrics.set_gauge("memory_peak_rss_bytes", usage["peak_rss"])
+    return usage
+
+
+class Spool:
+
+    def __init__(self, directory=None):
+        directory = directory or INGEST_SPOOL_DIR
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix="resume-ingest-", dir=directory)
+        self._count = 0
+
+    # Unique file name in the spool; the original name only keeps its extension (uploaded names are not trusted)
+    def new_path(self, name, suffix=""):
+        self._count += 1
+        extension = os.path.splitext(name)[1].lower()
+        return os.path.join(self.path, f"{self._count:06d}{extension}{suffix}")
+
+    # Copies a binary file object in COPY_CHUNK_BYTES pieces; returns the spooled path and its size
+    def add_file(self, name, fileobj):
+        path = self.new_path(name)
+        fileobj.seek(0)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(fileobj, f, COPY_CHUNK_BYTES)
+        return path, os.path.getsize(path)
+
+    def discard(self, path):
+        if path and path.startswith(self.path + os.sep):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_text(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _chunks(documents, size):
+    chunk = []
+    for document in documents:
+        chunk.append(document)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Spools the raw files of a chunk and queues its PDFs in the worker pool
+def _submit_chunk(pool, spool, chunk, stats):
+    submitted = []
+    for document in chunk:
+        item = {"document": document, "raw_path": document.get("path"), "handle": None, "error": None}
+        try:
+            if item["raw_path"] is None:
+                item["raw_path"], size = spool.add_file(document["name"], document["file"])
+                stats["spooled_bytes"] += size
+            if not document["name"].lower().endswith(".txt"):
+                item["text_path"] = spool.new_path(document["name"], ".txt")
+                item["handle"] = pool.submit_file(item["raw_path"], item["text_path"])
+        except OSError as e:
+            item["error"] = f"File could not be spooled: {e}"
+        submitted.append(item)
+    return submitted
+
+
+# Waits for a chunk's PDFs, hands the chunk with its texts to process_chunk, then deletes its spooled files
+def _finish_chunk(pool, spool, submitted, process_chunk, stats):
+    items = []
+    for item in submitted:
+        document = item["document"]
+        result = {"key": document.get("key"), "name": document["name"], "text": None,
+                  "error": item["error"], "error_type": "spool_error" if item["error"] else None}
+        if item["error"] is None:
+            if item["handle"] is None:
+                text_path = item["raw_path"]
+            else:
+                # Parent-side budget starts when the document's turn comes, as in PdfExtractionPool.extract_many
+                parsed = pool.wait(document["name"], item["handle"], time.monotonic(), item["text_path"])
+                result["error"], result["error_type"] = parsed["error"], parsed["error_type"]
+                text_path = item["text_path"]
+            if result["error"] is None:
+                result["text"] = read_text(text_path)
+        items.append(result)
+
+    try:
+        process_chunk(items)
+    finally:
+        for item in submitted:
+            spool.discard(item["raw_path"])
+            spool.discard(item.get("text_path"))
+        stats["chunks"] += 1
+        stats["documents"] += len(items)
+        usage = record_memory()
+        stats["peak_rss"] = max(stats["peak_rss"], usage["peak_rss"])
+        stats["rss"] = usage["rss"]
+
+
+# documents: iterable of {"key", "name", "file": binary file object} or {"key", "name", "path": file on disk};
+# it is consumed lazily, one chunk ahead of the one being processed.
+# process_chunk(items) gets up to max_in_flight {"key", "name", "text", "error", "error_type"} dicts (text is None
+# for failed documents); ingest keeps nothing of them after it returns, and whatever process_chunk still holds
+# (texts waiting for the LLM) is its own bound to keep.
+# Returns {"documents", "chunks", "spooled_bytes", "rss", "peak_rss"}.
+def ingest(documents, process_chunk, max_in_flight=None, pdf_pool=None, spool_dir=None):
+    max_in_flight = max_in_flight or INGEST_MAX_IN_FLIGHT
+    stats = {"documents": 0, "chunks": 0, "spooled_bytes": 0, "rss": 0, "peak_rss": 0}
+    pool = pdf_pool or PdfExtractionPool(min(max_in_flight, os.cpu_count() or 1))
+    try:
+        with Spool(spool_dir) as spool:
+            parsing = None
+            for chunk in _chunks(documents, max_in_flight):
+                # The next chunk is parsed by the worker processes while the current one is analyzed
+                submitted = _submit_chunk(pool, spool, chunk, stats)
+                if parsing is not None:
+                    _finish_chunk(pool, spool, parsing, process_chunk, stats)
+                parsing = submitted
+            if parsing is not None:
+                _finish_chunk(pool, spool, parsing, process_chunk, stats)
+    finally:
+        if pdf_pool is None:
+            pool.close()
+    return stats
@@ -0,0 +1,76 @@
+# Shared Job Description analysis cache for the HTTP service (api.py)
+# Keyed by the hash of the whitespace-normalized JD text, so the same posting pasted by different clients is
+# analyzed once. Concurrent requests for a JD that is still being analyzed wait for that one LLM call (single-flight).
+
+import asyncio
+import threading
+from collections import OrderedDict
+
+from . import metrics
+from .cache import hash_text
+
+
+# Line breaks, indentation and repeated spaces do not change the analysis
+def normalize_jd_text(text):
+    return " ".join(text.split())
+
+
+def jd_key(text):
+    return hash_text(normalize_jd_text(text))
+
+
+class JDAnalysisCache:
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def set(self, key, data):
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    # analyze(text) is a coroutine returning the JD data (None on failure, which is not cached)
+    # Returns (key, data, cached); cached is True when no new LLM call was started for this request
+    async def get_or_analyze(self, text, analyze):
+        key = jd_key(text)
+        data = self.get(key)
+        if data is not None:
+            metrics.inc("jd_cache_requests_total", result="hit")
+            return key, data, True
+
+        task = self._pending.get(key)
+        if task is not None:
+            metrics.inc("jd_cache_requests_total", result="joined")
+            # shield: a client disconnecting does not cancel the analysis the other requests are waiting for
+            return key, await asyncio.shield(task), True
+
+        metrics.inc("jd_cache_requests_total", result="miss")
+        task = asyncio.ensure_future(self._analyze(key, text, analyze))
+        self._pending[key] = task
+        return key, await asyncio.shield(task), False
+
+    # Runs as its own task, so the result is cached even if the request that started it goes away
+    async def _analyze(self, key, text, analyze):
+        try:
+            data = await analyze(text)
+            if data is not None:
+                self.set(key, data)
+            return data
+        finally:
+            self._pending.pop(key, None)
@@ -0,0 +1,372 @@
+# Durable resume-scoring queue in SQLite, shared by worker processes (utils/worker.py) on one host
+# A batch is one JD + its resume files; each file is a task. Workers lease a task for LEASE seconds and renew the
+# lease with heartbeats while they work. A crashed worker's lease expires and the task goes back to the queue.
+# Failed tasks are retried with backoff up to max_attempts, then moved to the dead letter state.
+#
+# python -m utils.job_queue enqueue --jd job.txt --input resumes/    -> batch id
+# python -m utils.job_queue status [--batch ID]
+# python -m utils.job_queue results --batch ID --output results.jsonl
+# python -m utils.job_queue requeue-dead --batch ID
+# python -m utils.job_queue rerank --batch ID --profile NAME    -> ranking under another scoring profile, no LLM calls
+
+import argparse
+import datetime
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+from . import metrics
+from .ratelimit import backoff_delay
+
+QUEUE_PATH = os.getenv("QUEUE_PATH", os.path.join(".cache", "queue.sqlite3"))
+QUEUE_LEASE_SECONDS = float(os.getenv("QUEUE_LEASE_SECONDS", 120))
+QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", 3))
+
+# queued -> leased -> done, or back to queued (retry / expired lease), or dead (no attempts left / permanent error)
+STATUSES = ("queued", "leased", "done", "dead")
+
+
+def default_owner():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _where(batch_id, condition=None):
+    clauses = []
+    args = ()
+    if batch_id:
+        clauses.append("batch_id = ?")
+        args = (batch_id,)
+    if condition:
+        clauses.append(condition)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+
+class JobQueue:
+
+    def __init__(self, path=None, lease_seconds=None, max_attempts=None):
+        self.path = path or QUEUE_PATH
+        self.lease_seconds = QUEUE_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        self.max_attempts = max_attempts or QUEUE_MAX_ATTEMPTS
+        self._local = threading.local()
+
+    # One connection per thread (and per process), WAL mode, transactions handled explicitly
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            # WAL keeps its index in shared memory: every process using the file must be on this host, on a local disk
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS batches ("
+                "id TEXT PRIMARY KEY, job_data TEXT NOT NULL, reference_date TEXT NOT NULL, "
+                "options TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id TEXT NOT NULL, file TEXT NOT NULL, "
+                "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, "
+                "available_at REAL NOT NULL, lease_owner TEXT, lease_expires_at REAL, "
+                "result TEXT, final_score REAL, error TEXT, error_type TEXT, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                "UNIQUE (batch_id, file))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, available_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_batch ON tasks (batch_id, status)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # BEGIN IMMEDIATE takes the write lock up front, so two workers never lease the same task
+    def _transaction(self):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    # reference_date is pinned per batch so every worker scores against the same "Present"
+    # scoring_profile (complete profile dict, utils.scoring_profiles) is stored with the batch for the same reason
+    def enqueue_batch(self, job_data, files, reference_date=None, prefilter=False, batch_id=None, scoring_profile=None):
+        batch_id = batch_id or uuid.uuid4().hex[:12]
+        reference_date = reference_date or datetime.datetime.now()
+        now = time.time()
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "INSERT OR IGNORE INTO batches (id, job_data, reference_date, options, created_at) VALUES (?, ?, ?, ?, ?)",
+                (batch_id, json.dumps(job_data), reference_date.isoformat(),
+                 json.dumps({"prefilter": prefilter, "scoring_profile": scoring_profile}), now)
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (batch_id, file, status, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+                [(batch_id, os.path.abspath(path), self.max_attempts, now, now, now) for path in files]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        metrics.inc("queue_tasks_total", outcome="enqueued", amount=len(files))
+        return batch_id
+
+    def get_batch(self, batch_id):
+        row = self._connect().execute(
+            "SELECT job_data, reference_date, options FROM batches WHERE id = ?", (batch_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": batch_id,
+            "job_data": json.loads(row[0]),
+            "reference_date": datetime.datetime.fromisoformat(row[1]),
+            "options": json.loads(row[2]),
+        }
+
+    # Leases up to "limit" ready tasks: queued ones whose backoff has passed, and leased ones whose lease expired.
+    # Expired leases that already used all their attempts are dead-lettered instead.
+    def lease(self, owner=None, limit=1, batch_id=None):
+        owner = owner or default_owner()
+        now = time.time()
+        conn = self._transaction()
+        try:
+            where, args = _where(batch_id, "status = 'leased' AND lease_expires_at < ? AND attempts >= max_attempts")
+            expired = conn.execute(
+                "UPDATE tasks SET status = 'dead', error = 'Lease expired on the last attempt', "
+                "error_type = 'lease_expired', lease_owner = NULL, updated_at = ?" + where, (now,) + args + (now,)
+            ).rowcount
+            where, args = _where(
+                batch_id, "((status = 'queued' AND available_at <= ?) OR (status = 'leased' AND lease_expires_at < ?))"
+            )
+            rows = conn.execute(
+                "SELECT id, batch_id, file, attempts FROM tasks" + where + " ORDER BY id LIMIT ?",
+                args + (now, now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(owner, now + self.lease_seconds, now, row[0]) for row in rows]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if expired:
+            metrics.inc("queue_tasks_total", outcome="dead", amount=expired)
+        return [
+            {"id": row[0], "batch_id": row[1], "file": row[2], "attempt": row[3] + 1, "owner": owner}
+            for row in rows
+        ]
+
+    # Returns False when the lease was lost (expired and taken by another worker): the caller should stop
+    def heartbeat(self, task):
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE tasks SET lease_expires_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (now + self.lease_seconds, now, task["id"], task["owner"])
+        )
+        return cursor.rowcount == 1
+
+    # Only the current lease holder can finish a task, so a worker that lost its lease cannot overwrite the result
+    def complete(self, task, result):
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE tasks SET status = 'done', result = ?, final_score = ?, error = NULL, error_type = NULL, "
+            "lease_owner = NULL, lease_expires_at = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (json.dumps(result, ensure_ascii=False), result.get("final_score"), now, task["id"], task["owner"])
+        )
+        if cursor.rowcount == 1:
+            metrics.inc("queue_tasks_total", outcome="done")
+        return cursor.rowcount == 1
+
+    # Retryable failures go back to the queue with jittered exponential backoff until max_attempts is used up
+    def fail(self, task, error, error_type=None, retryable=True, result=None):
+        now = time.time()
+        conn = self._transaction()
+        try:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM tasks WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (task["id"], task["owner"])
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            status = "queued" if retryable and row[0] < row[1] else "dead"
+            conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, error_type = ?, result = ?, available_at = ?, "
+                "lease_owner = NULL, lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                (status, str(error), error_type, json.dumps(result, ensure_ascii=False) if result else None,
+                 now + backoff_delay(row[0] - 1, base=2.0), now, task["id"])
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        metrics.inc("queue_tasks_total", outcome="retried" if status == "queued" else "dead")
+        return status
+
+    # Dead-letter replay: dead tasks get a fresh set of attempts
+    def requeue_dead(self, batch_id=None):
+        now = time.time()
+        where, args = _where(batch_id, "status = 'dead'")
+        cursor = self._connect().execute(
+            "UPDATE tasks SET status = 'queued', attempts = 0, available_at = ?, updated_at = ?" + where, (now, now) + args
+        )
+        return cursor.rowcount
+
+    # Task counts per status (plus expired leases still marked leased) and the score summary of finished tasks
+    def status(self, batch_id=None):
+        now = time.time()
+        conn = self._connect()
+        where, args = _where(batch_id)
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(conn.execute("SELECT status, COUNT(*) FROM tasks" + where + " GROUP BY status", args).fetchall())
+        where, args = _where(batch_id, "status = 'leased' AND lease_expires_at < ?")
+        expired = conn.execute("SELECT COUNT(*) FROM tasks" + where, args + (now,)).fetchone()[0]
+        where, args = _where(batch_id, "status = 'leased' AND lease_expires_at >= ?")
+        workers = conn.execute("SELECT COUNT(DISTINCT lease_owner) FROM tasks" + where, args + (now,)).fetchone()[0]
+        where, args = _where(batch_id, "status = 'done' AND final_score IS NOT NULL")
+        scored, mean_score, max_score = conn.execute(
+            "SELECT COUNT(*), AVG(final_score), MAX(final_score) FROM tasks" + where, args
+        ).fetchone()
+        total = sum(counts.values())
+        return {
+            "total": total,
+            **counts,
+            "expired_leases": expired,
+            "active_workers": workers,
+            "progress": round((counts["done"] + counts["dead"]) / total, 3) if total else 0.0,
+            "scored": scored,
+            "mean_score": round(mean_score, 1) if mean_score is not None else None,
+            "max_score": max_score,
+        }
+
+    # Finished records (best score first), dead tasks as error records at the end
+    def results(self, batch_id, include_dead=True):
+        conn = self._connect()
+        for (result,) in conn.execute(
+            "SELECT result FROM tasks WHERE batch_id = ? AND status = 'done' "
+            "ORDER BY final_score IS NULL, final_score DESC, id", (batch_id,)
+        ):
+            yield json.loads(result)
+        if include_dead:
+            for file, error, error_type, attempts in conn.execute(
+                "SELECT file, error, error_type, attempts FROM tasks WHERE batch_id = ? AND status = 'dead' ORDER BY id",
+                (batch_id,)
+            ):
+                yield {"file": file, "error": error, "error_type": error_type, "attempts": attempts}
+
+    def is_finished(self, batch_id=None):
+        counts = self.status(batch_id)
+        return counts["queued"] == 0 and counts["leased"] == 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Durable resume-scoring queue shared by utils.worker processes.")
+    parser.add_argument("--queue", default=None, help=f"Queue database (defaults to QUEUE_PATH, {QUEUE_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Analyze a JD and queue every resume for it")
+    enqueue.add_argument("--jd", required=True, help="Job description text file")
+    enqueue.add_argument("--input", required=True, nargs="+", help="Directories and/or glob patterns of PDF/TXT resumes")
+    enqueue.add_argument("--prefilter", action="store_true",
+                         help="Reject clear license/location mismatches before the LLM call")
+    enqueue.add_argument("--profile", default=None, help="Scoring profile name (defaults to the default profile)")
+
+    status = commands.add_parser("status", help="Task counts and score summary")
+    status.add_argument("--batch", default=None)
+
+    results = commands.add_parser("results", help="Write the finished records as JSONL")
+    results.add_argument("--batch", required=True)
+    results.add_argument("--output", default=None, help="Defaults to stdout")
+
+    requeue = commands.add_parser("requeue-dead", help="Give dead-lettered tasks a fresh set of attempts")
+    requeue.add_argument("--batch", default=None)
+
+    rerank = commands.add_parser("rerank", help="Rank the finished records under another scoring profile")
+    rerank.add_argument("--batch", required=True)
+    rerank.add_argument("--profile", required=True, help="Scoring profile name (built-in or from SCORING_PROFILES_PATH)")
+    rerank.add_argument("--top", type=int, default=None, help="Only the best N")
+    rerank.add_argument("--output", default=None, help="Defaults to stdout")
+    return parser.parse_args(argv)
+
+
+# Re-scores the stored score components of a batch (utils.scoring_profiles.ComponentTable); records without
+# components (errors) are left out
+def rerank_batch(queue, batch_id, scoring_profile, top=None):
+    from .scoring_profiles import ComponentTable
+    records = [record for record in queue.results(batch_id, include_dead=False) if "components" in record]
+    table = ComponentTable([record["components"] for record in records])
+    ranked = []
+    for index, final_score in table.rank(scoring_profile, top):
+        record = records[index]
+        ranked.append({
+            "file": record["file"], "candidate_name": record.get("candidate_name"), "final_score": final_score,
+            "stored_score": record["final_score"], "scoring_profile": scoring_profile["name"],
+        })
+    return ranked
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    queue = JobQueue(args.queue)
+
+    scoring_profile = None
+    if getattr(args, "profile", None):
+        from .scoring_profiles import get_profile
+        try:
+            scoring_profile = get_profile(args.profile)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    if args.command == "enqueue":
+        from .batch import iter_resume_paths
+        from .extractor import extract_data_with_gemini
+        with open(args.jd, "r", encoding="utf-8") as f:
+            job_data = extract_data_with_gemini(f.read(), type="job_description")
+        if job_data is None:
+            print("Error: the job description could not be analyzed", file=sys.stderr)
+            return 1
+        files = list(iter_resume_paths(args.input))
+        batch_id = queue.enqueue_batch(job_data, files, prefilter=args.prefilter, scoring_profile=scoring_profile)
+        print(f"Queued {len(files)} resumes as batch {batch_id}", file=sys.stderr)
+        print(batch_id)
+    elif args.command == "status":
+        print(json.dumps(queue.status(args.batch), indent=2))
+    elif args.command == "results":
+        output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            for record in queue.results(args.batch):
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        finally:
+            if args.output:
+                output.close()
+    elif args.command == "requeue-dead":
+        print(f"Requeued {queue.requeue_dead(args.batch)} dead tasks", file=sys.stderr)
+    elif args.command == "rerank":
+        started = time.perf_counter()
+        ranked = rerank_batch(queue, args.batch, scoring_profile, args.top)
+        elapsed = time.perf_counter() - started
+        output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            for record in ranked:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        finally:
+            if args.output:
+                output.close()
+        print(f"Re-ranked batch {args.batch} with profile {scoring_profile['name']} in {elapsed * 1000:.1f}ms",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
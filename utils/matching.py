@@ -0,0 +1,107 @@
+# Many jobs x many candidates matching, backed by inverted skill indexes
+
+import datetime
+import heapq
+from collections import defaultdict
+
+from .ranking import CandidateProfile, top_k
+from .scorer import score_candidate
+
+
+# Same normalization calculate_score uses when comparing skill names
+def normalize_skill(name):
+    return name.lower()
+
+
+class MatchStore:
+
+    def __init__(self):
+        self.candidates = {}
+        # Precomputed upper-bound data for top-k pruning (utils.ranking)
+        self.profiles = {}
+        self.jobs = {}
+        # Scoring profile per job (utils.scoring_profiles); jobs without one use the default profile
+        self.job_profiles = {}
+        # skill -> ids of the candidates that list it / of the jobs that require it
+        self.candidate_index = defaultdict(set)
+        self.job_index = defaultdict(set)
+        self.jobs_without_required_skills = set()
+
+    def add_candidate(self, candidate_id, candidate_data):
+        if candidate_id in self.candidates:
+            self.remove_candidate(candidate_id)
+        self.candidates[candidate_id] = candidate_data
+        self.profiles[candidate_id] = CandidateProfile(candidate_data)
+        for skill in candidate_data.get("skills", []):
+            self.candidate_index[normalize_skill(skill["name"])].add(candidate_id)
+
+    def remove_candidate(self, candidate_id):
+        candidate_data = self.candidates.pop(candidate_id)
+        self.profiles.pop(candidate_id, None)
+        for skill in candidate_data.get("skills", []):
+            ids = self.candidate_index.get(normalize_skill(skill["name"]))
+            if ids is not None:
+                ids.discard(candidate_id)
+
+    def add_job(self, job_id, job_data, scoring_profile=None):
+        if job_id in self.jobs:
+            self.remove_job(job_id)
+        self.jobs[job_id] = job_data
+        if scoring_profile is not None:
+            self.job_profiles[job_id] = scoring_profile
+        required_skills = job_data.get("required_skills", [])
+        if not required_skills:
+            self.jobs_without_required_skills.add(job_id)
+        for skill in required_skills:
+            self.job_index[normalize_skill(skill["name"])].add(job_id)
+
+    def remove_job(self, job_id):
+        job_data = self.jobs.pop(job_id)
+        self.job_profiles.pop(job_id, None)
+        self.jobs_without_required_skills.discard(job_id)
+        for skill in job_data.get("required_skills", []):
+            ids = self.job_index.get(normalize_skill(skill["name"]))
+            if ids is not None:
+                ids.discard(job_id)
+
+    # Candidates sharing at least one required skill (everyone if the job requires none)
+    def candidate_ids_for_job(self, job_data):
+        required_skills = job_data.get("required_skills", [])
+        if not required_skills:
+            return set(self.candidates)
+        ids = set()
+        for skill in required_skills:
+            ids.update(self.candidate_index.get(normalize_skill(skill["name"]), ()))
+        return ids
+
+    def job_ids_for_candidate(self, candidate_data):
+        ids = set(self.jobs_without_required_skills)
+        for skill in candidate_data.get("skills", []):
+            ids.update(self.job_index.get(normalize_skill(skill["name"]), ()))
+        return ids
+
+    # "Which stored candidates best fit this JD": [(candidate_id, ScoreResult)] best first
+    # scoring_profile overrides the stored job's profile (pass a job_id as job_data to look both up)
+    def top_candidates(self, job_data, k=10, reference_date=None, stats=None, scoring_profile=None):
+        if not isinstance(job_data, dict):
+            scoring_profile = scoring_profile or self.job_profiles.get(job_data)
+            job_data = self.jobs[job_data]
+        candidates = (
+            (candidate_id, self.candidates[candidate_id]) for candidate_id in self.candidate_ids_for_job(job_data)
+        )
+        return top_k(job_data, candidates, k, reference_date, self.profiles, stats, scoring_profile)
+
+    # "Which open JDs best fit this CV": [(job_id, ScoreResult)] best first
+    # Every job is scored with its own scoring profile
+    def top_jobs(self, candidate_data, k=10, reference_date=None):
+        reference_date = reference_date or datetime.datetime.now()
+        scored = (
+            (job_id, score_candidate(self.jobs[job_id], candidate_data, reference_date, self.job_profiles.get(job_id)))
+            for job_id in self.job_ids_for_candidate(candidate_data)
+        )
+        return _top_k(scored, k)
+
+
+# Highest final_score first, ties broken by id so results do not depend on set iteration order
+def _top_k(scored, k):
+    return heapq.nsmallest(k, scored, key=lambda item: (-item[1].final_score, str(item[0])))
@@ -0,0 +1,243 @@
+# In-process pipeline metrics: per-stage latency histograms and counters, exported as Prometheus text
+# Stages: pdf_parse, compaction, prompt_build, llm, json_parse, score (see the timer() calls in extractor/pdf_pool/batch/app)
+
+import atexit
+import http.server
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+PREFIX = "resume_scorer"
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+DESCRIPTIONS = {
+    "stage_seconds": ("histogram", "Time spent per pipeline stage"),
+    "llm_requests_total": ("counter", "LLM requests by prompt type and outcome"),
+    "llm_retries_total": ("counter", "Retried LLM requests"),
+    "llm_tokens_total": ("counter", "LLM tokens (reported by the API, estimated when missing)"),
+    "cache_requests_total": ("counter", "LLM cache lookups by result"),
+    "errors_total": ("counter", "Errors by stage and category"),
+    "resumes_total": ("counter", "Processed resumes by outcome"),
+    "pdf_pool_recycles_total": ("counter", "PDF worker pools replaced after a document hung past its budget"),
+    "resume_text_tokens_total": ("counter", "Estimated resume text tokens in prompts, before (raw) and after compaction"),
+    "resume_text_truncated_total": ("counter", "Resumes cut at the token budget"),
+    "memory_rss_bytes": ("gauge", "Resident memory of this process"),
+    "memory_peak_rss_bytes": ("gauge", "Peak resident memory of this process"),
+}
+
+
+class Histogram:
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    # Same linear interpolation inside the bucket as Prometheus' histogram_quantile
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+def _labels_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels_key, extra=()):
+    items = list(labels_key) + list(extra)
+    if not items:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in items)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(items, escaped)) + "}"
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self.gauges[(name, _labels_key(labels))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    # with timer("llm"): ... -> one stage_seconds observation, also recorded when the block raises
+    @contextmanager
+    def timer(self, stage, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - started, stage=stage, **labels)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    # {"stage": {"count", "total_seconds", "mean", "p50", "p95", "p99"}} for every stage seen so far
+    def stage_summary(self):
+        summary = {}
+        with self._lock:
+            for (name, labels_key), histogram in sorted(self.histograms.items()):
+                if name != "stage_seconds":
+                    continue
+                stage = ",".join(value for _, value in labels_key)
+                summary[stage] = {
+                    "count": histogram.count,
+                    "total_seconds": round(histogram.sum, 4),
+                    "mean": round(histogram.sum / histogram.count, 4),
+                    "p50": round(histogram.quantile(0.50), 4),
+                    "p95": round(histogram.quantile(0.95), 4),
+                    "p99": round(histogram.quantile(0.99), 4),
+                }
+        return summary
+
+    def counter_values(self):
+        with self._lock:
+            return {(name, labels_key): value for (name, labels_key), value in self.counters.items()}
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            names = sorted(
+                {name for name, _ in self.counters} | {name for name, _ in self.gauges} | {name for name, _ in self.histograms}
+            )
+            for name in names:
+                metric_type, description = DESCRIPTIONS.get(name, ("untyped", name))
+                full_name = f"{PREFIX}_{name}"
+                lines.append(f"# HELP {full_name} {description}")
+                lines.append(f"# TYPE {full_name} {metric_type}")
+
+                for (counter_name, labels_key), value in sorted(self.counters.items()):
+                    if counter_name == name:
+                        lines.append(f"{full_name}{_format_labels(labels_key)} {value}")
+
+                for (gauge_name, labels_key), value in sorted(self.gauges.items()):
+                    if gauge_name == name:
+                        lines.append(f"{full_name}{_format_labels(labels_key)} {value}")
+
+                for (histogram_name, labels_key), histogram in sorted(self.histograms.items()):
+                    if histogram_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                        cumulative += count
+                        le = bound if isinstance(bound, str) else repr(float(bound))
+                        lines.append(f"{full_name}_bucket{_format_labels(labels_key, [('le', le)])} {cumulative}")
+                    lines.append(f"{full_name}_sum{_format_labels(labels_key)} {histogram.sum}")
+                    lines.append(f"{full_name}_count{_format_labels(labels_key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    # Written to a temp file and renamed, so a scraper (e.g. node_exporter's textfile collector) never reads half a file
+    def write_file(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+
+registry = MetricsRegistry()
+
+inc = registry.inc
+set_gauge = registry.set_gauge
+observe = registry.observe
+timer = registry.timer
+render_prometheus = registry.render_prometheus
+stage_summary = registry.stage_summary
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+# Serves GET /metrics from a daemon thread; calling it again (e.g. on a Streamlit rerun) is a no-op
+def start_metrics_server(port, host="127.0.0.1"):
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
+
+
+def write_metrics_file(path=None):
+    path = path or os.getenv("METRICS_FILE")
+    if path:
+        registry.write_file(path)
+    return path
+
+
+_atexit_registered = False
+
+
+# METRICS_PORT starts the HTTP endpoint, METRICS_FILE is rewritten at exit (and whenever write_metrics_file is called)
+def setup_from_env():
+    global _atexit_registered
+    port = int(os.getenv("METRICS_PORT", 0))
+    if port:
+        try:
+            start_metrics_server(port, os.getenv("METRICS_HOST", "127.0.0.1"))
+        except OSError as e:
+            print(f"Metrics Server Error: {e}")
+    if os.getenv("METRICS_FILE") and not _atexit_registered:
+        atexit.register(write_metrics_file)
+        _atexit_registered = True
@@ -0,0 +1,237 @@
+# Tolerant parsing of LLM output: recover the JSON from fences/prose/truncated output, then conform it to a schema
+# Schemas are the small JSON Schema subset used in prompts.py (type, properties, items, enum, default)
+
+import json
+
+FENCE_MARKERS = ("```json", "```JSON", "```")
+
+
+def strip_fences(content):
+    for marker in FENCE_MARKERS:
+        content = content.replace(marker, "")
+    return content.strip()
+
+
+# Scans from the first "{" / "[" and returns (text of the first complete value, open brackets left at the end of the input)
+def scan_json(text):
+    starts = [index for index in (text.find("{"), text.find("[")) if index != -1]
+    if not starts:
+        return None, []
+    start = min(starts)
+    stack = []
+    in_string = escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return text[start:index + 1], []
+    if in_string:
+        stack.append('"')
+    return text[start:], stack
+
+
+# Closes a value cut off mid-way (max_output_tokens, dropped connection): everything after the last complete member
+# is dropped and the brackets still open at that point are closed
+def repair_truncated(fragment):
+    closers = {"{": "}", "[": "]"}
+    stack = []
+    cut_points = []
+    in_string = escaped = False
+    for index, char in enumerate(fragment):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                # Only valid if the string was a value, not a key; the parse attempt below decides
+                cut_points.append((index + 1, list(stack)))
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+            cut_points.append((index + 1, list(stack)))
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            cut_points.append((index + 1, list(stack)))
+        elif char == ",":
+            cut_points.append((index, list(stack)))
+
+    for cut, open_stack in reversed(cut_points[-50:]):
+        closing = "".join(closers[char] for char in reversed(open_stack))
+        try:
+            return json.loads(fragment[:cut] + closing)
+        except json.JSONDecodeError:
+            continue
+    raise json.JSONDecodeError("Could not repair truncated JSON", fragment, 0)
+
+
+# Drops commas directly before a closing bracket ('{"a": 1,}'); commas inside strings (", }" in a summary) stay
+def remove_trailing_commas(fragment):
+    chars = []
+    pending_comma = None
+    in_string = escaped = False
+    for char in fragment:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            pending_comma = len(chars)
+        elif char in "}]" and pending_comma is not None:
+            chars[pending_comma] = ""
+        if not in_string and not char.isspace() and char != ",":
+            pending_comma = None
+        chars.append(char)
+    return "".join(chars)
+
+
+def looks_truncated(content):
+    fragment, stack = scan_json(strip_fences(content))
+    return fragment is not None and bool(stack)
+
+
+# Returns (data, method); method is "clean", "extracted" (JSON found inside prose) or "repaired" (truncated output closed)
+# Raises json.JSONDecodeError when nothing usable is found
+def salvage_json(content):
+    content = strip_fences(content or "")
+    try:
+        return json.loads(content), "clean"
+    except json.JSONDecodeError:
+        pass
+
+    fragment, stack = scan_json(content)
+    if fragment is None:
+        raise json.JSONDecodeError("No JSON object found", content, 0)
+    if not stack:
+        try:
+            return json.loads(fragment), "extracted"
+        except json.JSONDecodeError:
+            # Trailing commas are the most common remaining defect
+            return json.loads(remove_trailing_commas(fragment)), "extracted"
+    return repair_truncated(fragment), "repaired"
+
+
+def _types(schema):
+    value = schema.get("type", "string")
+    return value if isinstance(value, list) else [value]
+
+
+def default_value(schema):
+    if "default" in schema:
+        return json.loads(json.dumps(schema["default"]))
+    types = _types(schema)
+    if "null" in types:
+        return None
+    return {"object": {}, "array": [], "string": "", "integer": 0, "number": 0, "boolean": False}.get(types[0])
+
+
+# Coerces data to the schema: missing fields get their default, wrong types are converted when the intent is clear
+# (e.g. "3" -> 3, "primary" -> "Primary", "Python" -> {"name": "Python", ...}) and dropped otherwise.
+# Unknown fields are kept. Returns (value, fixes) where fixes counts the changes made.
+def conform(data, schema):
+    types = _types(schema)
+    if data is None:
+        return default_value(schema), 0 if "null" in types else 1
+
+    if "object" in types:
+        array_properties = [key for key, value in schema.get("properties", {}).items() if "array" in _types(value)]
+        if isinstance(data, list) and len(array_properties) == 1 and len(schema["properties"]) == 1:
+            # {"results": [...]} answered as a bare [...]
+            data, fixes = {array_properties[0]: data}, 1
+        elif isinstance(data, list) and len(data) == 1 and isinstance(data[0], dict):
+            data, fixes = data[0], 1
+        elif isinstance(data, str) and "name" in schema.get("properties", {}):
+            data, fixes = {"name": data}, 1
+        elif not isinstance(data, dict):
+            # Not recoverable: dropped from its array (or the whole parse fails at the top level)
+            return None, 1
+        else:
+            fixes = 0
+        result = dict(data)
+        for key, property_schema in schema.get("properties", {}).items():
+            if key not in data:
+                result[key] = default_value(property_schema)
+                fixes += 1
+            else:
+                result[key], property_fixes = conform(data[key], property_schema)
+                fixes += property_fixes
+        return result, fixes
+
+    if "array" in types:
+        if not isinstance(data, list):
+            data, fixes = ([] if data in ("", None) else [data]), 1
+        else:
+            fixes = 0
+        items = []
+        item_schema = schema.get("items", {})
+        for item in data:
+            value, item_fixes = conform(item, item_schema)
+            fixes += item_fixes
+            if value is not None or "null" in _types(item_schema):
+                items.append(value)
+        return items, fixes
+
+    if "enum" in schema:
+        if data in schema["enum"]:
+            return data, 0
+        lowered = {str(option).lower(): option for option in schema["enum"]}
+        if str(data).strip().lower() in lowered:
+            return lowered[str(data).strip().lower()], 1
+        return default_value(schema), 1
+
+    if "boolean" in types:
+        if isinstance(data, bool):
+            return data, 0
+        if isinstance(data, str) and data.strip().lower() in ("true", "yes", "false", "no"):
+            return data.strip().lower() in ("true", "yes"), 1
+        return default_value(schema), 1
+
+    if "integer" in types or "number" in types:
+        if isinstance(data, (int, float)) and not isinstance(data, bool):
+            if "integer" in types and isinstance(data, float) and data.is_integer():
+                return int(data), 1
+            return data, 0
+        try:
+            number = float(str(data).strip().rstrip("+"))
+            return (int(number) if "integer" in types and number.is_integer() else number), 1
+        except ValueError:
+            return default_value(schema), 1
+
+    if "string" in types:
+        if isinstance(data, str):
+            return data, 0
+        if isinstance(data, (int, float)) and not isinstance(data, bool):
+            return str(data), 1
+        return default_value(schema), 1
+
+    return data, 0
+
+
+# Schema as sent to the API: "default" is only used locally
+def api_schema(schema):
+    if isinstance(schema, dict):
+        return {key: api_schema(value) for key, value in schema.items() if key != "default"}
+    if isinstance(schema, list):
+        return [api_schema(value) for value in schema]
+    return schema
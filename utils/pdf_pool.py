@@ -0,0 +1,221 @@
+# PDF text extraction in worker processes, with per-document time and page budgets
+
+import io
+import multiprocessing
+import os
+import threading
+import time
+
+from . import metrics
+
+
+# Raises on failure; extract_text_from_pdf keeps the old "print and return empty string" behaviour on top of it.
+# Pages are separated by a form feed ("\f"), which every consumer of the text sees (prefilter, dedup, the
+# extraction cache key); prepare_resume_text removes it from the prompt when compaction is off.
+def read_pdf_text(source, max_pages=None, timeout=None):
+    # Imported on first use: pdfplumber is slow to import and only PDF parsing needs it
+    import pdfplumber
+
+    started = time.monotonic()
+    parts = []
+    with pdfplumber.open(source) as pdf:
+        total_pages = len(pdf.pages)
+        pages = pdf.pages[:max_pages] if max_pages else pdf.pages
+        for page in pages:
+            if timeout and time.monotonic() - started > timeout:
+                raise TimeoutError(f"PDF extraction exceeded {timeout}s after {len(parts)} pages")
+            extracted_text = page.extract_text() or ""
+            if extracted_text:
+                parts.append(extracted_text + "\n")
+    # utils/compaction.py uses the page breaks to drop headers and footers repeated on every page
+    return "\f".join(parts), total_pages
+
+
+def _extract_worker(data, max_pages, timeout):
+    started = time.monotonic()
+    text, total_pages = read_pdf_text(io.BytesIO(data), max_pages, timeout)
+    return text, total_pages, time.monotonic() - started
+
+
+# Spooled variant (utils/ingest.py): reads the PDF from disk and writes the text to text_path, so neither the
+# bytes nor the text pass through the parent process; returns whether there was any text instead of the text
+def _extract_file_worker(path, text_path, max_pages, timeout):
+    started = time.monotonic()
+    text, total_pages = read_pdf_text(path, max_pages, timeout)
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return bool(text.strip()), total_pages, time.monotonic() - started
+
+
+def _error_result(name, error_type, message, started):
+    return {
+        "name": name,
+        "text": "",
+        "error": message,
+        "error_type": error_type,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+# A submitted document: the task is kept so it can be resubmitted when the pool is recycled
+class PdfJob:
+
+    __slots__ = ("func", "args", "result", "resubmitted_at")
+
+    def __init__(self, func, args, result):
+        self.func = func
+        self.args = args
+        self.result = result
+        self.resubmitted_at = None
+
+
+# How often a waiting thread checks whether its job was moved to a new pool
+WAIT_POLL_SECONDS = 0.25
+
+
+class PdfExtractionPool:
+
+    def __init__(self, max_workers=None, timeout=None, max_pages=None):
+        self.max_workers = max_workers or int(os.getenv("PDF_MAX_WORKERS", 0)) or os.cpu_count() or 1
+        self.timeout = timeout if timeout is not None else float(os.getenv("PDF_TIMEOUT_SECONDS", 30))
+        self.max_pages = max_pages if max_pages is not None else int(os.getenv("PDF_MAX_PAGES", 30))
+        self._pool = None
+        self._in_flight = set()
+        self.recycles = 0
+        self._lock = threading.Lock()
+
+    def _new_pool(self):
+        return multiprocessing.get_context().Pool(processes=self.max_workers)
+
+    def _submit(self, func, args):
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._new_pool()
+            job = PdfJob(func, args, self._pool.apply_async(func, args))
+            self._in_flight.add(job)
+        return job
+
+    def submit(self, data):
+        return self._submit(_extract_worker, (data, self.max_pages, self.timeout))
+
+    def submit_file(self, path, text_path):
+        return self._submit(_extract_file_worker, (path, text_path, self.max_pages, self.timeout))
+
+    # A worker stuck inside a page keeps its slot until its process is killed, so after a parent-side timeout the
+    # whole pool is replaced and the jobs that were still queued or running are resubmitted to the new one.
+    # Returns False when the job itself was resubmitted meanwhile (by another thread's recycle): it is not timed out.
+    def _recycle(self, timed_out, result):
+        with self._lock:
+            if timed_out.result is not result:
+                return False
+            self._in_flight.discard(timed_out)
+            old_pool = self._pool
+            self._pool = self._new_pool()
+            self.recycles += 1
+            now = time.monotonic()
+            for job in self._in_flight:
+                if not job.result.ready():
+                    job.result = self._pool.apply_async(job.func, job.args)
+                    job.resubmitted_at = now
+        metrics.inc("pdf_pool_recycles_total")
+        old_pool.terminate()
+        return True
+
+    # Records the parse time (measured inside the worker) and the error type of every document
+    # text_path: the handle comes from submit_file; the result then has "text_path" and "text" is None
+    def wait(self, name, handle, started, text_path=None):
+        result = self._wait(name, handle, started, text_path)
+        metrics.observe("stage_seconds", result["seconds"], stage="pdf_parse")
+        if result["error_type"]:
+            metrics.inc("errors_total", stage="pdf_parse", category=result["error_type"])
+        return result
+
+    # The worker stops itself between pages once over budget; the parent-side wait (budget + grace) catches
+    # documents stuck inside a single page. A job moved to a new pool gets its budget again from that moment.
+    def _wait(self, name, handle, started, text_path=None):
+        grace = max(5.0, self.timeout * 0.5) if self.timeout else None
+        try:
+            while True:
+                result = handle.result
+                wait_for = WAIT_POLL_SECONDS
+                if grace is not None:
+                    remaining = max(started, handle.resubmitted_at or started) + self.timeout + grace - time.monotonic()
+                    if remaining <= 0 and self._recycle(handle, result):
+                        return _error_result(name, "timeout", f"PDF extraction exceeded {self.timeout}s", started)
+                    wait_for = min(max(remaining, 0.0), WAIT_POLL_SECONDS)
+                try:
+                    value, total_pages, seconds = result.get(wait_for)
+                    break
+                except multiprocessing.TimeoutError:
+                    continue
+        except TimeoutError as e:
+            return _error_result(name, "timeout", str(e) or f"PDF extraction exceeded {self.timeout}s", started)
+        except Exception as e:
+            return _error_result(name, "invalid_pdf", f"{type(e).__name__}: {e}", started)
+        finally:
+            with self._lock:
+                self._in_flight.discard(handle)
+
+        # submit_file workers return whether there was any text, submit workers the text itself
+        text = None if text_path else value
+        has_text = value if text_path else bool(value.strip())
+        result = {
+            "name": name,
+            "text": text,
+            "pages": total_pages,
+            "truncated": bool(self.max_pages and total_pages > self.max_pages),
+            "error": None,
+            "error_type": None,
+            "seconds": round(seconds, 3),
+        }
+        if text_path:
+            result["text_path"] = text_path
+        if not has_text:
+            result["error"] = "No text could be extracted (scanned or empty PDF?)"
+            result["error_type"] = "no_text"
+        return result
+
+    # Blocking single-document call, safe to use from several threads
+    def extract(self, name, data):
+        started = time.monotonic()
+        return self.wait(name, self.submit(data), started)
+
+    # documents: [{"name": ..., "data": bytes}] -> results in the same order (.txt files are decoded in place)
+    # Documents are waited for in order, so each one's parent-side budget starts when its turn comes
+    def extract_many(self, documents):
+        handles = []
+        for document in documents:
+            if document["name"].lower().endswith(".txt"):
+                handles.append(None)
+            else:
+                handles.append(self.submit(document["data"]))
+
+        results = []
+        for document, handle in zip(documents, handles):
+            if handle is None:
+                text = str(document["data"], "utf-8", errors="replace")
+                results.append({"name": document["name"], "text": text, "error": None, "error_type": None, "seconds": 0.0})
+            else:
+                results.append(self.wait(document["name"], handle, time.monotonic()))
+        return results
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+            self._in_flight.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def extract_texts_parallel(documents, max_workers=None, timeout=None, max_pages=None):
+    pdf_count = sum(1 for document in documents if not document["name"].lower().endswith(".txt"))
+    max_workers = min(max_workers or os.cpu_count() or 1, max(pdf_count, 1))
+    with PdfExtractionPool(max_workers, timeout, max_pages) as pool:
+        return pool.extract_many(documents)
@@ -0,0 +1,152 @@
+# Deterministic pre-LLM knockout filter
+# Checks the JD's required licenses and location against the raw resume text and only rejects clear non-matches
+# (no term or alias of any accepted license anywhere in the text, a contact address in another state); anything
+# uncertain is passed on to the LLM + calculate_score as before.
+
+import re
+
+from .scorer import split_license_options
+
+# Words that describe a license rather than name it ("RN License" -> "rn")
+GENERIC_LICENSE_WORDS = {
+    "license", "licence", "licensed", "licensure", "certification", "certificate", "certified", "credential",
+    "active", "valid", "current", "state", "board", "registration", "card", "in", "of", "the", "a",
+}
+# British / American spellings; every generic phrase is also looked for with the other spelling
+SPELLING_VARIANTS = {"licence": "license", "license": "licence"}
+
+# Core license name -> other ways resumes write it
+LICENSE_ALIASES = {
+    "rn": ["registered nurse", "rn"],
+    "lpn": ["licensed practical nurse", "lpn", "lvn"],
+    "lvn": ["licensed vocational nurse", "lvn", "lpn"],
+    "np": ["nurse practitioner", "np", "aprn"],
+    "cna": ["certified nursing assistant", "nursing assistant", "cna"],
+    "bls": ["basic life support", "bls"],
+    "acls": ["advanced cardiovascular life support", "advanced cardiac life support", "acls"],
+    "pals": ["pediatric advanced life support", "pals"],
+    "emt": ["emergency medical technician", "emt"],
+    "cpa": ["certified public accountant", "cpa"],
+    "pmp": ["project management professional", "pmp"],
+    "cdl": ["commercial driver", "cdl"],
+    "driver s": ["driver s", "drivers", "driving"],
+    "driving": ["driving", "driver s", "drivers"],
+    "pe": ["professional engineer", "p e", "pe"],
+    "cpim": ["certified in production and inventory management", "cpim"],
+    "cscp": ["certified supply chain professional", "cscp"],
+    "cissp": ["certified information systems security professional", "cissp"],
+    "pharmd": ["doctor of pharmacy", "pharmd"],
+}
+
+US_STATES = {
+    "AL": "alabama", "AK": "alaska", "AZ": "arizona", "AR": "arkansas", "CA": "california", "CO": "colorado",
+    "CT": "connecticut", "DE": "delaware", "FL": "florida", "GA": "georgia", "HI": "hawaii", "ID": "idaho",
+    "IL": "illinois", "IN": "indiana", "IA": "iowa", "KS": "kansas", "KY": "kentucky", "LA": "louisiana",
+    "ME": "maine", "MD": "maryland", "MA": "massachusetts", "MI": "michigan", "MN": "minnesota",
+    "MS": "mississippi", "MO": "missouri", "MT": "montana", "NE": "nebraska", "NV": "nevada",
+    "NH": "new hampshire", "NJ": "new jersey", "NM": "new mexico", "NY": "new york", "NC": "north carolina",
+    "ND": "north dakota", "OH": "ohio", "OK": "oklahoma", "OR": "oregon", "PA": "pennsylvania",
+    "RI": "rhode island", "SC": "south carolina", "SD": "south dakota", "TN": "tennessee", "TX": "texas",
+    "UT": "utah", "VT": "vermont", "VA": "virginia", "WA": "washington", "WV": "west virginia",
+    "WI": "wisconsin", "WY": "wyoming", "DC": "district of columbia",
+}
+
+# "Austin, TX" / "Austin, TX 78701" style address; the residence is looked for in the resume header (contact block)
+CITY_STATE_PATTERN = re.compile(r"^([A-Z][A-Za-z.'-]+(?: [A-Z][A-Za-z.'-]+){0,3}),\s*([A-Z]{2})(?:\s+\d{5}(?:-\d{4})?)?$")
+HEADER_LINES = 5
+# Contact lines are split on these into fields ("Austin, TX | jane@example.com")
+HEADER_SEPARATOR_PATTERN = re.compile(r"\s*[|•·;\t]\s*|\s{3,}")
+# Name suffixes that are also state codes ("Jane Doe, MD", "John Smith, PA")
+CREDENTIAL_SUFFIXES = {"MD", "PA", "RN", "NP", "DO", "PT", "OT", "DC", "ND"}
+
+
+def normalize(text):
+    return " " + " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split()) + " "
+
+
+def contains_phrase(normalized_text, phrase):
+    phrase = normalize(phrase)
+    return phrase.strip() != "" and phrase in normalized_text
+
+
+# Returns (terms to look for, whether any of them names the license rather than only describing it)
+def license_terms(option):
+    # "Certified Nursing Assistant (CNA)": the name and the acronym are separate alternatives
+    parts = [part for part in re.split(r"[()]", option) if part.strip()]
+    terms = []
+    has_core = False
+    for part in parts:
+        words = normalize(part).split()
+        core = " ".join(word for word in words if word not in GENERIC_LICENSE_WORDS)
+        terms.append(" ".join(words))
+        terms.append(" ".join(SPELLING_VARIANTS.get(word, word) for word in words))
+        if core:
+            has_core = True
+            terms.append(core)
+            terms.extend(LICENSE_ALIASES.get(core, []))
+    return list(dict.fromkeys(terms)), has_core
+
+
+def check_license(normalized_text, req_lic):
+    checked_any = False
+    for option in split_license_options(req_lic):
+        terms, has_core = license_terms(option)
+        checked_any = checked_any or has_core
+        for term in terms:
+            if contains_phrase(normalized_text, term):
+                return {"check": "license", "requirement": req_lic, "passed": True, "matched": term}
+
+    # Only generic words ("License") -> nothing reliable to look for
+    if not checked_any:
+        return {"check": "license", "requirement": req_lic, "passed": None, "matched": None}
+    return {"check": "license", "requirement": req_lic, "passed": False, "matched": None}
+
+
+def check_location(text, normalized_text, job_data):
+    job_location = (job_data.get("location") or "").strip()
+    result = {"check": "location", "requirement": job_location, "passed": None, "matched": None}
+    if job_data.get("is_remote_allowed", False) or not job_location:
+        return result
+    if job_location.lower() in ("unspecified", "unknown", "remote"):
+        return result
+
+    parts = [part.strip() for part in job_location.split(",") if part.strip()]
+    city = parts[0] if parts else ""
+    state = parts[1].upper() if len(parts) > 1 and parts[1].upper() in US_STATES else None
+
+    if city and contains_phrase(normalized_text, city):
+        result.update(passed=True, matched=city)
+        return result
+    if state and (re.search(rf"\b{state}\b", text) or contains_phrase(normalized_text, US_STATES[state])):
+        result.update(passed=True, matched=state)
+        return result
+
+    # Rejected only when an address field of the contact block clearly places the candidate in another state.
+    # The first line is the name line ("Jane Doe, MD"), and credential suffixes never count as states.
+    # splitlines() would make a page break (read_pdf_text's form feed) an extra line of the contact block
+    for line in text.replace("\f", "").strip().splitlines()[1:HEADER_LINES]:
+        for field in HEADER_SEPARATOR_PATTERN.split(line.strip()):
+            match = CITY_STATE_PATTERN.match(field)
+            if not match or match.group(2) in CREDENTIAL_SUFFIXES:
+                continue
+            found_state = match.group(2)
+            if found_state in US_STATES and found_state != state:
+                result.update(passed=False, matched=match.group(0))
+                return result
+    return result
+
+
+# Returns {"passed": bool, "reason": str | None, "checks": [...]}; each check's "passed" is True, False or None (uncertain)
+def prefilter_resume(text, job_data):
+    normalized_text = normalize(text)
+    checks = [check_license(normalized_text, req_lic) for req_lic in job_data.get("required_licenses", []) or []]
+    checks.append(check_location(text, normalized_text, job_data))
+
+    for check in checks:
+        if check["passed"] is False:
+            if check["check"] == "license":
+                reason = f"Eliminated (prefilter): No mention of required license: {check['requirement']}"
+            else:
+                reason = f"Eliminated (prefilter): Location {check['matched']} does not match {check['requirement']}"
+            return {"passed": False, "reason": reason, "checks": checks}
+    return {"passed": True, "reason": None, "checks": checks}
@@ -0,0 +1,179 @@
+# Top-k ranking with upper-bound pruning
+# Skills, education, bonus and the knockout check are cheap to compute exactly; only experience (date parsing and
+# interval merging) is replaced by a bound: the span from the earliest role start to the latest end.
+# Candidates are scored exactly in order of their bound and the scan stops as soon as no remaining bound can beat
+# the current k-th result, so the output is identical to scoring everyone and sorting.
+
+import bisect
+import datetime
+
+from .scorer import (
+    EDUCATION_LEVEL_MAPPING, candidate_skill_levels, month_index, parse_month_index, profile_value, score_candidate,
+    split_license_options, weighted_total
+)
+
+# round() of primary and secondary years can put each up to 0.05 years over the span, so adjusted years can exceed it
+# by 0.05 * (1 + secondary_factor): 0.1 at the largest allowed factor (1.0), plus a little for float error
+ROUNDING_MARGIN_YEARS = 0.11
+
+
+# Reference-date (and scoring profile) independent part of the bound, computed once per stored candidate
+class CandidateProfile:
+
+    __slots__ = ("skill_levels", "education_value", "licenses", "location", "first_month", "last_month", "open_ended")
+
+    def __init__(self, candidate_data):
+        self.skill_levels = candidate_skill_levels(candidate_data)
+        self.education_value = EDUCATION_LEVEL_MAPPING.get(candidate_data.get('education_level', 'None'), 0)
+        self.licenses = set(l.lower() for l in candidate_data.get('licenses', []))
+        self.location = candidate_data.get('location', 'Unknown').lower()
+
+        # Same role filtering as calculate_total_experience; "Present" / unparseable ends become the reference month
+        self.first_month = None
+        self.last_month = None
+        self.open_ended = False
+        for role in candidate_data.get("work_history", []) or []:
+            if role.get("relevance", "Irrelevant") not in ("Primary", "Secondary"):
+                continue
+            start = role.get("start", "Unknown")
+            if not start or start.lower() == "unknown":
+                continue
+            start_idx = parse_month_index(start)
+            if start_idx is None:
+                continue
+            end = role.get("end", "Present")
+            end_idx = None
+            if end and end.lower() != "present":
+                end_idx = parse_month_index(end)
+            if end_idx is None:
+                self.open_ended = True
+            elif self.last_month is None or end_idx > self.last_month:
+                self.last_month = end_idx
+            if self.first_month is None or start_idx < self.first_month:
+                self.first_month = start_idx
+
+    # Primary + secondary years can never exceed the months between the first start and the last end
+    def max_years(self, reference_month):
+        if self.first_month is None:
+            return 0.0
+        ends = [self.last_month] if self.last_month is not None else []
+        if self.open_ended:
+            ends.append(reference_month)
+        span = max(ends) - self.first_month + 1
+        if span <= 0:
+            return 0.0
+        return span / 12 + ROUNDING_MARGIN_YEARS
+
+
+def job_terms(job_data, scoring_profile=None):
+    job_loc = job_data.get('location', '').lower()
+    required_level_weights = profile_value(scoring_profile, "required_level_weights")
+    return {
+        # One list of accepted options per required license ("A or B" / "A/B" -> ["a", "b"])
+        "license_options": [split_license_options(req_lic) for req_lic in job_data.get('required_licenses', [])],
+        # Location only knocks out when the job is on-site at a specified place
+        "location": job_loc if job_loc and job_loc not in ("unspecified", "unknown") and not job_data.get('is_remote_allowed', False) else None,
+        "required": [
+            (skill['name'].lower(), required_level_weights.get(skill.get('level', 'Unspecified'), 1.0))
+            for skill in job_data.get('required_skills', [])
+        ],
+        "preferred": [skill['name'].lower() for skill in job_data.get('preferred_skills', [])],
+        "education_value": EDUCATION_LEVEL_MAPPING.get(job_data.get('education_level', 'None'), 0),
+        "min_years": job_data.get('min_experience_years', 0),
+        "skill_level_weights": profile_value(scoring_profile, "skill_level_weights"),
+        "weights": profile_value(scoring_profile, "weights"),
+        "education_step_penalty": profile_value(scoring_profile, "education_step_penalty"),
+    }
+
+
+# Same decision as check_knockout, from the precomputed sets
+def knocked_out(terms, profile):
+    for options in terms["license_options"]:
+        if not any(opt in profile.licenses for opt in options):
+            return True
+    job_loc = terms["location"]
+    if job_loc is not None and profile.location != "unknown":
+        if profile.location not in job_loc and job_loc not in profile.location:
+            return True
+    return False
+
+
+# Upper bound of the unrounded final score; same arithmetic, in the same order, as score_candidate,
+# so every exact component gives bit-identical floats and only experience can be larger
+# (adjusted years never exceed the span, as profiles keep the secondary factor at or below 1)
+def score_bound(terms, profile, reference_month):
+    required = terms["required"]
+    if not required:
+        skill_score = 100
+    else:
+        total_skill_points = 0
+        max_possible_points = 0
+        skill_level_weights = terms["skill_level_weights"]
+        for name, req_weight in required:
+            max_possible_points += req_weight
+            cand_level = profile.skill_levels.get(name)
+            if cand_level is not None:
+                total_skill_points += min(skill_level_weights.get(cand_level, 1.0), req_weight)
+        skill_score = min((total_skill_points / max_possible_points) * 100, 100)
+
+    req_exp_years = terms["min_years"]
+    if req_exp_years == 0:
+        exp_score = 100
+    else:
+        exp_score = min(profile.max_years(reference_month) / req_exp_years * 100, 100)
+
+    if profile.education_value >= terms["education_value"]:
+        edu_score = 100
+    else:
+        edu_score = max(100 - ((terms["education_value"] - profile.education_value) * terms["education_step_penalty"]), 0)
+
+    preferred = terms["preferred"]
+    if not preferred:
+        bonus_score = 100
+    else:
+        match_count = sum(1 for name in preferred if name in profile.skill_levels)
+        bonus_score = (match_count / len(preferred)) * 100
+
+    return weighted_total(skill_score, exp_score, edu_score, bonus_score, terms["weights"])
+
+
+# candidates: iterable of (candidate_id, candidate_data); profiles: optional {candidate_id: CandidateProfile}
+# Returns [(candidate_id, ScoreResult)] best first, ties broken by str(id) -- the same list as brute force.
+# stats (optional dict) receives the number of candidates, exact scores computed and candidates pruned.
+# scoring_profile: see utils.scoring_profiles (None is the default profile)
+def top_k(job_data, candidates, k=10, reference_date=None, profiles=None, stats=None, scoring_profile=None):
+    if k <= 0:
+        return []
+    reference_date = reference_date or datetime.datetime.now()
+    reference_month = month_index(reference_date)
+    terms = job_terms(job_data, scoring_profile)
+
+    bounded = []
+    for candidate_id, candidate_data in candidates:
+        profile = profiles.get(candidate_id) if profiles is not None else None
+        if profile is None:
+            profile = CandidateProfile(candidate_data)
+        if knocked_out(terms, profile):
+            bound = 0
+        else:
+            # round() is monotonic, so the rounded bound is never below the rounded final score
+            bound = round(score_bound(terms, profile, reference_month), 1)
+        bounded.append(((-bound, str(candidate_id)), candidate_id, candidate_data))
+    bounded.sort(key=lambda item: item[0])
+
+    results = []
+    scored = 0
+    for bound_key, candidate_id, candidate_data in bounded:
+        if len(results) >= k and bound_key > results[-1][0]:
+            break
+        result = score_candidate(job_data, candidate_data, reference_date, scoring_profile)
+        scored += 1
+        bisect.insort(results, ((-result.final_score, str(candidate_id)), scored, candidate_id, result))
+        if len(results) > k:
+            results.pop()
+
+    if stats is not None:
+        stats["candidates"] = len(bounded)
+        stats["scored"] = scored
+        stats["pruned"] = len(bounded) - scored
+    return [(candidate_id, result) for _, _, candidate_id, result in results]
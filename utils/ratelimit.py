@@ -0,0 +1,87 @@
+# Rate limiting and retry helpers for the async LLM path
+
+import asyncio
+import random
+import time
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "DeadlineExceeded",
+    "InternalServerError", "ServerError", "TimeoutError", "ConnectionError",
+}
+RETRYABLE_MESSAGES = ("429", "rate limit", "resource exhausted", "quota", "unavailable", "deadline exceeded")
+RATE_LIMIT_MESSAGES = ("429", "rate limit", "resource exhausted", "resourceexhausted", "quota", "toomanyrequests")
+
+
+# Rough token count (~4 characters per token), good enough for TPM budgeting
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    # Waits until "amount" tokens are available (requests bigger than the bucket take the whole bucket)
+    async def acquire(self, amount=1):
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+
+# Requests-per-minute and tokens-per-minute limits (0 or None disables a limit)
+class RateLimiter:
+
+    def __init__(self, rpm=None, tpm=None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    async def acquire(self, tokens=1):
+        if self.requests:
+            await self.requests.acquire(1)
+        if self.tokens:
+            await self.tokens.acquire(tokens)
+
+
+def is_retryable_error(error):
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int) and status in RETRYABLE_STATUS_CODES:
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    message = str(error).lower()
+    return any(text in message for text in RETRYABLE_MESSAGES)
+
+
+# Exponential backoff with full jitter
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+# Error label used by the metrics: rate_limit, timeout, transient (other retryable errors) or llm_error
+def error_category(error):
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)) or "deadline exceeded" in str(error).lower():
+        return "timeout"
+    if not is_retryable_error(error):
+        return "llm_error"
+    message = f"{type(error).__name__} {error}".lower()
+    if getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429 \
+            or any(text in message for text in RATE_LIMIT_MESSAGES):
+        return "rate_limit"
+    return "transient"
@@ -1,6 +1,7 @@
 # Deterministic Python Algorithm is done here
 
 import datetime
+import re
 
 # Skill Level Weights
 SKILL_LEVEL_WEIGHTS = {
@@ -34,76 +35,158 @@ EDUCATION_LEVEL_MAPPING = {
     "Doctorate": 5
 }
 
+# Scoring profile: every tunable number of the formula (named profiles and validation in utils/scoring_profiles.py)
+# Missing keys fall back to these values
+DEFAULT_PROFILE = {
+    "name": "default",
+    "weights": {"skills": 0.30, "experience": 0.45, "education": 0.15, "bonus": 0.10},
+    "skill_level_weights": SKILL_LEVEL_WEIGHTS,
+    "required_level_weights": REQUIRED_LEVEL_WEIGHTS,
+    "secondary_factor": EXPERIENCE_RELEVANCE_WEIGHTS["Secondary"],
+    "education_step_penalty": 25,
+}
+
+def profile_value(scoring_profile, key):
+    if scoring_profile is None:
+        return DEFAULT_PROFILE[key]
+    return scoring_profile.get(key, DEFAULT_PROFILE[key])
+
+# The pieces of the formula every scoring path shares (score_candidate, utils.batch_scorer, utils.ranking's bound,
+# utils.scoring_profiles.ComponentTable). They take floats or numpy arrays and always do the same operations in the
+# same order, so all paths give bit-identical scores.
+def adjusted_years(primary_years, secondary_years, scoring_profile=None):
+    return (primary_years * 1.0) + (secondary_years * profile_value(scoring_profile, "secondary_factor"))
+
+def weighted_total(skill_score, exp_score, edu_score, bonus_score, weights):
+    return (
+        (skill_score * weights["skills"]) +
+        (exp_score * weights["experience"]) +
+        (edu_score * weights["education"]) +
+        (bonus_score * weights["bonus"])
+    )
+
+def weight_label(weight):
+    return f"{round(weight * 100, 1):g}%"
+
 # Calculating the Date
-def calculate_months_between(start_date_str, end_date_str):
+# Months are handled as integers (year * 12 + month - 1) so a role is just an inclusive interval
+# Same strings as datetime.strptime(value, "%Y-%m") accepts, without building datetime objects
+YEAR_MONTH_PATTERN = re.compile(r"(\d\d\d\d)-(1[0-2]|0[1-9]|[1-9])")
+
+def month_index(date):
+    return date.year * 12 + date.month - 1
+
+def parse_month_index(date_str):
+    match = YEAR_MONTH_PATTERN.fullmatch(date_str)
+    if match is None:
+        return None
+    year = int(match.group(1))
+    if year < datetime.MINYEAR:
+        return None
+    return year * 12 + int(match.group(2)) - 1
+
+def calculate_month_interval(start_date_str, end_date_str, reference_date=None):
     if not start_date_str or start_date_str.lower() == "unknown":
-        return set()
+        return None
     
-    try:
-        start = datetime.datetime.strptime(start_date_str, "%Y-%m")
-    except ValueError:
-        return set()
+    start_idx = parse_month_index(start_date_str)
+    if start_idx is None:
+        return None
     
-    if not end_date_str or end_date_str.lower() == "present":
-        end = datetime.datetime.now()
-    else:
-        try:
-            end = datetime.datetime.strptime(end_date_str, "%Y-%m")
-        except ValueError:
-            end = datetime.datetime.now()
-
-    months_set = set()
-    curr = start
-    while curr <= end:
-        months_set.add(curr.strftime("%Y-%m"))
-        if curr.month == 12:
-            curr = datetime.datetime(curr.year + 1, 1, 1)
+    if reference_date is None:
+        reference_date = datetime.datetime.now()
+
+    end_idx = None
+    if end_date_str and end_date_str.lower() != "present":
+        end_idx = parse_month_index(end_date_str)
+    if end_idx is None:
+        end_idx = month_index(reference_date)
+
+    if start_idx > end_idx:
+        return None
+    return (start_idx, end_idx)
+
+def calculate_months_between(start_date_str, end_date_str, reference_date=None):
+    interval = calculate_month_interval(start_date_str, end_date_str, reference_date)
+    if interval is None:
+        return set()
+    return {f"{idx // 12:04d}-{idx % 12 + 1:02d}" for idx in range(interval[0], interval[1] + 1)}
+
+# Sorting and merging overlapping/adjacent month intervals
+def merge_intervals(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
         else:
-            curr = datetime.datetime(curr.year, curr.month + 1, 1)
-            
-    return months_set
+            merged.append([start, end])
+    return merged
+
+def count_months(merged):
+    return sum(end - start + 1 for start, end in merged)
+
+# Number of months of the merged intervals "a" that are not covered by the merged intervals "b"
+def count_months_outside(a, b):
+    overlap = 0
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start <= end:
+            overlap += end - start + 1
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return count_months(a) - overlap
 
 # Calculating the total experience duration
-def calculate_total_experience(work_history):
-    primary_months_set = set()
-    secondary_months_set = set()
-
+# reference_date is the "Present" date; pin it once per batch so every candidate uses the same one
+def calculate_total_experience(work_history, reference_date=None):
     if not work_history:
         return {"primary_years": 0.0, "secondary_years": 0.0}
+
+    if reference_date is None:
+        reference_date = datetime.datetime.now()
+
+    primary_intervals = []
+    secondary_intervals = []
     
     for role in work_history:
         start = role.get("start", "Unknown")
         end = role.get("end", "Present")
         relevance = role.get("relevance", "Irrelevant")
 
-        role_months = calculate_months_between(start, end)
-
         if relevance == "Primary":
-            primary_months_set.update(role_months)
+            intervals = primary_intervals
         elif relevance == "Secondary":
-            secondary_months_set.update(role_months)
+            intervals = secondary_intervals
+        else:
+            continue
 
-    secondary_months_set = secondary_months_set - primary_months_set
+        interval = calculate_month_interval(start, end, reference_date)
+        if interval is not None:
+            intervals.append(interval)
+
+    # Secondary months that overlap a primary role only count as primary
+    primary = merge_intervals(primary_intervals)
+    secondary = merge_intervals(secondary_intervals)
 
     return {
-        "primary_years": round(len(primary_months_set) / 12, 1),
-        "secondary_years": round(len(secondary_months_set) / 12, 1)
+        "primary_years": round(count_months(primary) / 12, 1),
+        "secondary_years": round(count_months_outside(secondary, primary) / 12, 1)
     }
 
-# Main Function : Scoring Candidate
-def calculate_score(job_data, candidate_data):
-
-    # Calculating Experience Duration
-    exp_calc = calculate_total_experience(candidate_data.get("work_history", [])) 
-    primary_years = exp_calc["primary_years"]
-    secondary_years = exp_calc["secondary_years"]
-
-    # Skills of candidates
-    cand_skills_map = {
-        s['name'].lower(): s.get('level', 'Unspecified') 
-        for s in candidate_data.get('skills', [])
-    }
+# "CPIM or CSCP" / "CPIM/CSCP" -> ["cpim", "cscp"], a single license -> ["rn license"]
+def split_license_options(req_lic):
+    req_lic_lower = req_lic.lower()
+    if "/" in req_lic_lower or " or " in req_lic_lower:
+        return [opt.strip() for opt in req_lic_lower.replace("/", " or ").split(" or ")]
+    return [req_lic_lower]
 
+# Knockout Layer: returns the elimination reason, or None if the candidate passes
+def check_knockout(job_data, candidate_data):
     cand_licenses = set(l.lower() for l in candidate_data.get('licenses', []))
 
     required_licenses = job_data.get('required_licenses', [])
@@ -112,153 +195,270 @@ def calculate_score(job_data, candidate_data):
             req_lic_lower = req_lic.lower()
             
             if "/" in req_lic_lower or " or " in req_lic_lower:
-                options = [opt.strip() for opt in req_lic_lower.replace("/", " or ").split(" or ")]
+                options = split_license_options(req_lic)
                 
                 has_one_of_the_options = any(opt in cand_licenses for opt in options)
                 
                 if not has_one_of_the_options:
-                    return {
-                        "final_score": 0,
-                        "reasoning": [f"Eliminated: Missing one of the required license options: {req_lic}"],
-                        "breakdown": {"skills": 0, "experience": 0, "education": 0, "bonus": 0}
-                    }
+                    return f"Eliminated: Missing one of the required license options: {req_lic}"
             
             # If it's a standard, single license requirement
             elif req_lic_lower not in cand_licenses:
-                return {
-                    "final_score": 0,
-                    "reasoning": [f"Eliminated: Compulsory License Missing: {req_lic}"],
-                    "breakdown": {"skills": 0, "experience": 0, "education": 0, "bonus": 0}
-                }
+                return f"Eliminated: Compulsory License Missing: {req_lic}"
     
     # Location Check - If not remote        
     is_remote = job_data.get('is_remote_allowed', False)
     job_loc = job_data.get('location', '').lower()
     cand_loc = candidate_data.get('location', 'Unknown').lower()
 
-    if job_loc and job_loc != "unspecified" and not is_remote:
+    if job_loc and job_loc not in ("unspecified", "unknown") and not is_remote:
         if cand_loc != "unknown":
             if cand_loc not in job_loc and job_loc not in cand_loc:
-                return {
-                    "final_score": 0,
-                    "reasoning": [f"Eliminated: Location not Match. \nJob: {job_data.get('location')}, \nCandidate: {candidate_data.get('location')}."],
-                    "breakdown": {"skills": 0, "experience": 0, "education": 0, "bonus": 0}
-                }
-        
-    # Core Scoring
-    reasoning = []
+                return f"Eliminated: Location not Match. \nJob: {job_data.get('location')}, \nCandidate: {candidate_data.get('location')}."
+
+    return None
+
+def candidate_skill_levels(candidate_data):
+    return {
+        s['name'].lower(): s.get('level', 'Unspecified') 
+        for s in candidate_data.get('skills', [])
+    }
+
+# Compact score: the component scores plus references to the inputs needed to explain them.
+# reasoning / calculation_steps / breakdown are only built when asked for (UI, exports), not while ranking a pool.
+class ScoreResult:
+
+    __slots__ = (
+        "final_score", "skill_score", "exp_score", "edu_score", "bonus_score", "knockout_reason",
+        "total_skill_points", "max_possible_points", "primary_years", "secondary_years", "adjusted_years",
+        "match_count", "job_data", "candidate_data", "scoring_profile",
+    )
 
-    # Skill Scoring (30%)
+    def __init__(self, job_data, candidate_data, knockout_reason=None, scoring_profile=None):
+        self.job_data = job_data
+        self.candidate_data = candidate_data
+        self.knockout_reason = knockout_reason
+        self.scoring_profile = scoring_profile
+        self.final_score = 0
+        self.skill_score = self.exp_score = self.edu_score = self.bonus_score = 0
+        self.total_skill_points = self.max_possible_points = 0
+        self.primary_years = self.secondary_years = self.adjusted_years = 0
+        self.match_count = 0
+
+    def __repr__(self):
+        return f"ScoreResult(final_score={self.final_score})"
+
+    # Dict-style access to the calculate_score keys, so a ScoreResult can stand in for its dict
+    def __getitem__(self, key):
+        if key not in ("final_score", "reasoning", "calculation_steps", "breakdown"):
+            raise KeyError(key)
+        if key == "calculation_steps" and self.knockout_reason:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    @property
+    def reasoning(self):
+        if self.knockout_reason:
+            return [self.knockout_reason]
+        job_data = self.job_data
+        candidate_data = self.candidate_data
+        reasoning = []
+
+        job_required_skills = job_data.get('required_skills', [])
+        if not job_required_skills:
+            reasoning.append("No required skills specified (Full Score).")
+        else:
+            cand_skills_map = candidate_skill_levels(candidate_data)
+            skill_level_weights = profile_value(self.scoring_profile, "skill_level_weights")
+            required_level_weights = profile_value(self.scoring_profile, "required_level_weights")
+            for skill in job_required_skills:
+                skill_name = skill['name'].lower()
+                req_level = skill.get('level', 'Unspecified')
+                if skill_name in cand_skills_map:
+                    req_weight = required_level_weights.get(req_level, 1.0)
+                    cand_weight = skill_level_weights.get(cand_skills_map[skill_name], 1.0)
+                    if cand_weight > req_weight:
+                        reasoning.append(f"Overqualified Skill: {skill['name']} (Expert vs {req_level})")
+                else:
+                    reasoning.append(f"Missing Skill: {skill['name']}")
+
+        req_exp_years = job_data.get('min_experience_years', 0)
+        if req_exp_years == 0:
+            reasoning.append("No experience required (Full score).")
+        elif self.exp_score < 100:
+            reasoning.append(f"Little Experience: \nRequired: {req_exp_years} years, \nCandidate: {self.adjusted_years} years \n(Primary+Sec).")
+
+        if self.edu_score < 100:
+            job_edu_level = job_data.get('education_level', 'None')
+            cand_edu_level = candidate_data.get('education_level', 'None')
+            reasoning.append(f"Low Education Level: \nRequired: {job_edu_level}, \nCandidate: {cand_edu_level}.")
+
+        total_pref = len(job_data.get('preferred_skills', []))
+        if total_pref and self.bonus_score > 0:
+            reasoning.append(f"Plus Points: {self.match_count}/{total_pref} preferred skill available.")
+        return reasoning
+
+    @property
+    def calculation_steps(self):
+        if self.knockout_reason:
+            return None
+        skill_score, exp_score, edu_score, bonus_score = self.skill_score, self.exp_score, self.edu_score, self.bonus_score
+        req_exp_years = self.job_data.get('min_experience_years', 0)
+        total_pref = len(self.job_data.get('preferred_skills', []))
+        weights = profile_value(self.scoring_profile, "weights")
+        w_skills, w_exp, w_edu, w_bonus = weights["skills"], weights["experience"], weights["education"], weights["bonus"]
+        final_score = weighted_total(skill_score, exp_score, edu_score, bonus_score, weights)
+        return [
+            f"1. Skills: ({round(self.total_skill_points, 1)} / {round(self.max_possible_points, 1)}) * 100 = {round(skill_score, 1)}% | Weight: {weight_label(w_skills)} | Contribution: {round(skill_score * w_skills, 2)} [the skills that candidate has / required total skills from job description]",
+            f"2. Experience: ({round(self.adjusted_years, 1)} / {max(req_exp_years, 1)}) * 100 = {round(exp_score, 1)}% | Weight: {weight_label(w_exp)} | Contribution: {round(exp_score * w_exp, 2)} [the experience year that candidate has / required total experience year from job description]",
+            f"3. Education: Score: {round(edu_score, 1)}% | Weight: {weight_label(w_edu)} | Contribution: {round(edu_score * w_edu, 2)} [candidate education level / required education level from job description]",
+            f"4. Bonus: ({self.match_count} / {max(total_pref, 1)}) * 100 = {round(bonus_score, 1)}% | Weight: {weight_label(w_bonus)} | Contribution: {round(bonus_score * w_bonus, 2)} [preferred skills that candidate has / total preferred skills from job description]",
+            f"TOTAL SCORE = {round(skill_score * w_skills, 2)} + {round(exp_score * w_exp, 2)} + {round(edu_score * w_edu, 2)} + {round(bonus_score * w_bonus, 2)} = {round(final_score, 1)}"
+        ]
+
+    @property
+    def breakdown(self):
+        if self.knockout_reason:
+            return {"skills": 0, "experience": 0, "education": 0, "bonus": 0}
+        return {
+            "skills": round(self.skill_score, 1),
+            "experience": round(self.exp_score, 1),
+            "education": round(self.edu_score, 1),
+            "bonus": round(self.bonus_score, 1),
+            "years_calc": {
+                "required": self.job_data.get('min_experience_years', 0),
+                "primary": self.primary_years,
+                "secondary": self.secondary_years,
+                "adjusted_total": self.adjusted_years
+            }
+        }
+
+    # Profile-independent inputs of the score (JSON-serializable): stored next to a result, they are enough to
+    # re-score the candidate under another profile without the resume or the LLM (utils.scoring_profiles.ComponentTable)
+    def components(self):
+        if self.knockout_reason:
+            return {"knocked_out": True}
+        cand_skills_map = candidate_skill_levels(self.candidate_data)
+        return {
+            "knocked_out": False,
+            # [required level, candidate level or None] per required skill, in JD order
+            "skills": [
+                [skill.get('level', 'Unspecified'), cand_skills_map.get(skill['name'].lower())]
+                for skill in self.job_data.get('required_skills', [])
+            ],
+            "required_years": self.job_data.get('min_experience_years', 0),
+            "primary_years": self.primary_years,
+            "secondary_years": self.secondary_years,
+            "education_gap": (
+                EDUCATION_LEVEL_MAPPING.get(self.job_data.get('education_level', 'None'), 0)
+                - EDUCATION_LEVEL_MAPPING.get(self.candidate_data.get('education_level', 'None'), 0)
+            ),
+            "preferred_matches": self.match_count,
+            "preferred_total": len(self.job_data.get('preferred_skills', [])),
+        }
+
+    # Same dict calculate_score has always returned
+    def to_dict(self):
+        if self.knockout_reason:
+            return {"final_score": 0, "reasoning": self.reasoning, "breakdown": self.breakdown}
+        return {
+            "final_score": self.final_score,
+            "reasoning": self.reasoning,
+            "calculation_steps": self.calculation_steps,
+            "breakdown": self.breakdown,
+        }
+
+# Score-only fast path: numbers, no text
+# scoring_profile: profile dict (utils.scoring_profiles); None is DEFAULT_PROFILE
+def score_candidate(job_data, candidate_data, reference_date=None, scoring_profile=None):
+
+    knockout_reason = check_knockout(job_data, candidate_data)
+    if knockout_reason:
+        return ScoreResult(job_data, candidate_data, knockout_reason, scoring_profile)
+
+    result = ScoreResult(job_data, candidate_data, scoring_profile=scoring_profile)
+    skill_level_weights = profile_value(scoring_profile, "skill_level_weights")
+    required_level_weights = profile_value(scoring_profile, "required_level_weights")
+    weights = profile_value(scoring_profile, "weights")
+
+    # Calculating Experience Duration
+    exp_calc = calculate_total_experience(candidate_data.get("work_history", []), reference_date) 
+    primary_years = exp_calc["primary_years"]
+    secondary_years = exp_calc["secondary_years"]
+
+    # Skills of candidates
+    cand_skills_map = candidate_skill_levels(candidate_data)
+
+    # Skill Scoring (default profile: 30%)
     job_required_skills = job_data.get('required_skills', [])
+    total_skill_points = 0
+    max_possible_points = 0
 
     # If no mandatory skills are specified in the job description, full marks are awarded.
     if not job_required_skills:
         skill_score = 100
-        reasoning.append("No required skills specified (Full Score).")
     else:
-        total_skill_points = 0
-        max_possible_points = 0
-
         for skill in job_required_skills:
-            skill_name = skill['name'].lower()
-            
-            req_level = skill.get('level', 'Unspecified')
-            req_weight = REQUIRED_LEVEL_WEIGHTS.get(req_level, 1.0)
+            req_weight = required_level_weights.get(skill.get('level', 'Unspecified'), 1.0)
             max_possible_points += req_weight 
             
-            if skill_name in cand_skills_map:
-                cand_level = cand_skills_map[skill_name]
-                cand_weight = SKILL_LEVEL_WEIGHTS.get(cand_level, 1.0)
-            
-                earned = min(cand_weight, req_weight)
-                
-                total_skill_points += earned
-                
-                if cand_weight > req_weight:
-                     reasoning.append(f"Overqualified Skill: {skill['name']} (Expert vs {req_level})")
-            else:
-                reasoning.append(f"Missing Skill: {skill['name']}")
+            cand_level = cand_skills_map.get(skill['name'].lower())
+            if cand_level is not None:
+                total_skill_points += min(skill_level_weights.get(cand_level, 1.0), req_weight)
 
         raw_skill_score = (total_skill_points / max_possible_points) * 100
         skill_score = min(raw_skill_score, 100)
 
-    # Experience Scoring (45%)
+    # Experience Scoring (default profile: 45%)
     req_exp_years = job_data.get('min_experience_years', 0)
 
-    adjusted_candidate_years = (primary_years * 1.0) + (secondary_years * 0.5)
+    adjusted_candidate_years = adjusted_years(primary_years, secondary_years, scoring_profile)
 
     if req_exp_years == 0:
         exp_score = 100
-        reasoning.append("No experience required (Full score).")
-
     else:
         exp_ratio = adjusted_candidate_years / req_exp_years
         exp_score = min(exp_ratio * 100, 100)
 
-        if exp_score < 100:
-            reasoning.append(f"Little Experience: \nRequired: {req_exp_years} years, \nCandidate: {adjusted_candidate_years} years \n(Primary+Sec).")
-
-    # Education Scoring (15%)
-    job_edu_level = job_data.get('education_level', 'None')
-    cand_edu_level = candidate_data.get('education_level', 'None')
-
-    job_edu_val = EDUCATION_LEVEL_MAPPING.get(job_edu_level, 0)
-    cand_edu_val = EDUCATION_LEVEL_MAPPING.get(cand_edu_level, 0)
+    # Education Scoring (default profile: 15%)
+    job_edu_val = EDUCATION_LEVEL_MAPPING.get(job_data.get('education_level', 'None'), 0)
+    cand_edu_val = EDUCATION_LEVEL_MAPPING.get(candidate_data.get('education_level', 'None'), 0)
 
     if cand_edu_val >= job_edu_val:
         edu_score = 100
     else:
         diff = job_edu_val - cand_edu_val
-        edu_score = max(100 - (diff * 25), 0)
-        reasoning.append(f"Low Education Level: \nRequired: {job_edu_level}, \nCandidate: {cand_edu_level}.")
+        edu_score = max(100 - (diff * profile_value(scoring_profile, "education_step_penalty")), 0)
 
-    # Nice to Have Scoring (10%)
+    # Nice to Have Scoring (default profile: 10%)
     job_preferred_skills = job_data.get('preferred_skills', [])
-    
+    match_count = 0
+
     if not job_preferred_skills:
         bonus_score = 100
     else:
-        match_count = 0
-        total_pref = len(job_preferred_skills)
-        
         for skill in job_preferred_skills:
             if skill['name'].lower() in cand_skills_map:
                 match_count += 1
         
-        bonus_score = (match_count / total_pref) * 100
-        if bonus_score > 0:
-            reasoning.append(f"Plus Points: {match_count}/{total_pref} preferred skill available.")
+        bonus_score = (match_count / len(job_preferred_skills)) * 100
 
     # Aggregation
-    final_score = (
-        (skill_score * 0.30) +
-        (exp_score * 0.45) +
-        (edu_score * 0.15) +
-        (bonus_score * 0.10)
-    )
- 
-    calc_steps = [
-        f"1. Skills: ({round(total_skill_points, 1)} / {round(max_possible_points, 1)}) * 100 = {round(skill_score, 1)}% | Weight: 30% | Contribution: {round(skill_score * 0.30, 2)} [the skills that candidate has / required total skills from job description]",
-        f"2. Experience: ({round(adjusted_candidate_years, 1)} / {max(req_exp_years, 1)}) * 100 = {round(exp_score, 1)}% | Weight: 45% | Contribution: {round(exp_score * 0.45, 2)} [the experience year that candidate has / required total experience year from job description]",
-        f"3. Education: Score: {round(edu_score, 1)}% | Weight: 15% | Contribution: {round(edu_score * 0.15, 2)} [candidate education level / required education level from job description]",
-        f"4. Bonus: ({match_count} / {max(total_pref, 1)}) * 100 = {round(bonus_score, 1)}% | Weight: 10% | Contribution: {round(bonus_score * 0.10, 2)} [preferred skills that candidate has / total preferred skills from job description]",
-        f"TOTAL SCORE = {round(skill_score * 0.30, 2)} + {round(exp_score * 0.45, 2)} + {round(edu_score * 0.15, 2)} + {round(bonus_score * 0.10, 2)} = {round(final_score, 1)}"
-    ]
-
-    return {
-        "final_score": round(final_score, 1),
-        "reasoning": reasoning,
-        "calculation_steps": calc_steps,
-        "breakdown": {
-            "skills": round(skill_score, 1),
-            "experience": round(exp_score, 1),
-            "education": round(edu_score, 1),
-            "bonus": round(bonus_score, 1),
-            "years_calc": {
-                "required": req_exp_years,
-                "primary": primary_years,
-                "secondary": secondary_years,
-                "adjusted_total": adjusted_candidate_years
-            }
-        }
-    }
+    final_score = weighted_total(skill_score, exp_score, edu_score, bonus_score, weights)
+
+    result.final_score = round(final_score, 1)
+    result.skill_score = skill_score
+    result.exp_score = exp_score
+    result.edu_score = edu_score
+    result.bonus_score = bonus_score
+    result.total_skill_points = total_skill_points
+    result.max_possible_points = max_possible_points
+    result.primary_years = primary_years
+    result.secondary_years = secondary_years
+    result.adjusted_years = adjusted_candidate_years
+    result.match_count = match_count
+    return result
+
+# Main Function : Scoring Candidate (full result with the explanation texts)
+def calculate_score(job_data, candidate_data, reference_date=None, scoring_profile=None):
+    return score_candidate(job_data, candidate_data, reference_date, scoring_profile).to_dict()
@@ -0,0 +1,174 @@
+# Named scoring profiles and instant re-ranking from stored score components
+# A profile holds every tunable number of the scoring formula (see DEFAULT_PROFILE in utils/scorer.py). Built-in
+# profiles can be extended or overridden with a JSON file: {"name": {"weights": {...}, "secondary_factor": 0.3}, ...}
+# Keys a profile does not set are taken from the default profile.
+#
+# Re-ranking: ScoreResult.components() keeps the profile-independent inputs of a score (matched skill levels,
+# primary/secondary years, education gap, preferred matches). A ComponentTable of them re-scores a whole pool
+# under any profile with a few array operations, without the resumes or the LLM.
+
+import copy
+import json
+import os
+import sys
+
+import numpy as np
+
+from .batch_scorer import empty_encoding, level_code, score_encoded
+from .scorer import DEFAULT_PROFILE
+
+SCORING_PROFILES_PATH = os.getenv("SCORING_PROFILES_PATH", "")
+
+WEIGHT_KEYS = ("skills", "experience", "education", "bonus")
+
+BUILTIN_PROFILES = {
+    "default": {},
+    "skills_first": {
+        "weights": {"skills": 0.45, "experience": 0.30, "education": 0.15, "bonus": 0.10},
+    },
+    "experience_light": {
+        "weights": {"skills": 0.40, "experience": 0.25, "education": 0.20, "bonus": 0.15},
+        "secondary_factor": 0.75,
+    },
+}
+
+
+def _check_number(value, label, minimum=0.0, maximum=None):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{label} must be a number, got {value!r}")
+    if value < minimum or (maximum is not None and value > maximum):
+        limit = f"between {minimum} and {maximum}" if maximum is not None else f"at least {minimum}"
+        raise ValueError(f"{label} must be {limit}, got {value}")
+
+
+# Complete, validated profile from partial overrides; raises ValueError for invalid values
+def make_profile(overrides=None, name=None):
+    overrides = overrides or {}
+    if not isinstance(overrides, dict):
+        raise ValueError("A scoring profile must be a JSON object")
+    unknown = set(overrides) - set(DEFAULT_PROFILE)
+    if unknown:
+        raise ValueError(f"Unknown scoring profile keys: {', '.join(sorted(unknown))}")
+
+    profile = copy.deepcopy(DEFAULT_PROFILE)
+    profile["name"] = name or overrides.get("name") or "custom"
+
+    weights = overrides.get("weights", {})
+    if not isinstance(weights, dict) or set(weights) - set(WEIGHT_KEYS):
+        raise ValueError(f"weights must be an object with the keys {', '.join(WEIGHT_KEYS)}")
+    profile["weights"].update(weights)
+    for key in WEIGHT_KEYS:
+        _check_number(profile["weights"][key], f"weights.{key}")
+    # Final scores stay on the 0-100 scale, so they are comparable between profiles
+    if abs(sum(profile["weights"].values()) - 1.0) > 1e-6:
+        raise ValueError(f"weights must add up to 1, got {sum(profile['weights'].values()):g}")
+
+    for key in ("skill_level_weights", "required_level_weights"):
+        levels = overrides.get(key, {})
+        if not isinstance(levels, dict):
+            raise ValueError(f"{key} must be an object of level -> weight")
+        profile[key].update(levels)
+        for level, weight in profile[key].items():
+            _check_number(weight, f"{key}.{level}")
+
+    # Secondary experience never counts more than primary (the top-k bound relies on it)
+    profile["secondary_factor"] = overrides.get("secondary_factor", profile["secondary_factor"])
+    _check_number(profile["secondary_factor"], "secondary_factor", 0.0, 1.0)
+    profile["education_step_penalty"] = overrides.get("education_step_penalty", profile["education_step_penalty"])
+    _check_number(profile["education_step_penalty"], "education_step_penalty")
+    return profile
+
+
+# {name: complete profile}: the built-in profiles plus the ones from the JSON file (SCORING_PROFILES_PATH)
+def load_profiles(path=None):
+    path = SCORING_PROFILES_PATH if path is None else path
+    definitions = dict(BUILTIN_PROFILES)
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                custom = json.load(f)
+            # The default profile is what every score without a profile uses, so it cannot be redefined
+            if custom.pop("default", None) is not None:
+                print(f"Error: {path} cannot redefine the default scoring profile (ignored)", file=sys.stderr)
+            definitions.update(custom)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Error: scoring profiles could not be read from {path}: {e}", file=sys.stderr)
+
+    profiles = {}
+    for name, overrides in definitions.items():
+        try:
+            profiles[name] = make_profile(overrides, name)
+        except ValueError as e:
+            print(f"Error: scoring profile {name!r} is invalid: {e}", file=sys.stderr)
+    return profiles
+
+
+# Profile by name, or a complete profile from a dict of overrides; None is the default profile
+def get_profile(profile=None, path=None):
+    if profile is None:
+        return make_profile(name="default")
+    if isinstance(profile, dict):
+        return make_profile(profile)
+    profiles = load_profiles(path)
+    if profile not in profiles:
+        raise ValueError(f"Unknown scoring profile {profile!r} (available: {', '.join(profiles)})")
+    return profiles[profile]
+
+
+# Stored components of one JD's candidates, encoded like utils.batch_scorer.encode_candidates and re-scored with
+# its score_encoded, so the final scores are identical to scoring the candidates again under the profile
+class ComponentTable:
+
+    def __init__(self, components, ids=None):
+        components = list(components)
+        self.ids = list(range(len(components))) if ids is None else list(ids)
+
+        scored = [item for item in components if not item["knocked_out"]]
+        first = scored[0] if scored else {"skills": [], "required_years": 0, "preferred_total": 0}
+        required_levels = [required for required, _ in first["skills"]]
+        self.encoded = empty_encoding(len(components), required_levels, first["required_years"], first["preferred_total"])
+        level_codes = {}
+
+        encoded = self.encoded
+        for row, item in enumerate(components):
+            if item["knocked_out"]:
+                encoded["knocked_out"][row] = True
+                continue
+            if ([required for required, _ in item["skills"]] != required_levels
+                    or item["required_years"] != encoded["required_years"]
+                    or item["preferred_total"] != encoded["preferred_total"]):
+                raise ValueError("All components of a ComponentTable must come from the same job description")
+            for col, (_, level) in enumerate(item["skills"]):
+                if level is not None:
+                    encoded["skill_codes"][row, col] = level_code(encoded, level_codes, level)
+            encoded["primary_years"][row] = item["primary_years"]
+            encoded["secondary_years"][row] = item["secondary_years"]
+            encoded["education_gap"][row] = item["education_gap"]
+            encoded["preferred_matches"][row] = item["preferred_matches"]
+
+        # Sort key for ties (same as top_k: str(id))
+        self.id_keys = np.array([str(candidate_id) for candidate_id in self.ids])
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Unrounded component and final scores under the profile (0 for knocked-out candidates)
+    def scores(self, scoring_profile=None):
+        return score_encoded(self.encoded, scoring_profile)
+
+    # [(id, final_score)] best first, ties broken by str(id); final_score rounded like score_candidate
+    def rank(self, scoring_profile=None, k=None):
+        if not self.ids:
+            return []
+        final_scores = self.scores(scoring_profile)["final_score"]
+        scaled = final_scores * 10
+        rounded = np.rint(scaled) / 10
+        # np.rint rounds halves to even and "* 10" can itself round, so the few values next to a half are rounded
+        # with Python's round, like score_candidate; everywhere else both give the same float
+        for row in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6).tolist():
+            rounded[row] = round(float(final_scores[row]), 1)
+        final_scores = rounded
+        order = np.lexsort((self.id_keys, -final_scores))
+        if k is not None:
+            order = order[:k]
+        return [(self.ids[row], float(final_scores[row])) for row in order.tolist()]
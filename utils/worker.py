@@ -0,0 +1,144 @@
+# Queue worker: python -m utils.worker [--queue PATH] [--processes N] [--threads N] [--exit-when-empty]
+# Every thread leases one task at a time from utils.job_queue, runs the same per-file pipeline as utils.batch
+# (PDF parsing -> LLM extraction -> calculate_score) and renews its lease with heartbeats while it works.
+# Start more processes on the same host to add throughput; the SQLite (WAL) queue file cannot be shared across hosts.
+
+import argparse
+import multiprocessing
+import sys
+import threading
+import time
+
+from . import extractor, metrics
+from .batch import file_sha256, process_resume
+from .job_queue import JobQueue, default_owner
+from .pdf_pool import PdfExtractionPool
+
+# Everything else (unreadable/empty PDFs, PDF timeouts) fails the same way on every attempt -> dead letter at once
+RETRYABLE_ERROR_TYPES = {"llm_error", "worker_error"}
+
+
+def run_task(queue, task, batch, pdf_pool):
+    stop = threading.Event()
+    lost = threading.Event()
+
+    def beat():
+        while not stop.wait(queue.lease_seconds / 3):
+            if not queue.heartbeat(task):
+                lost.set()
+                return
+
+    heartbeat = threading.Thread(target=beat, daemon=True)
+    heartbeat.start()
+    try:
+        record = process_resume(
+            task["file"], file_sha256(task["file"]), batch["job_data"], batch["reference_date"], pdf_pool,
+            batch["options"].get("prefilter", False), scoring_profile=batch["options"].get("scoring_profile")
+        )
+    except Exception as e:
+        record = {"file": task["file"], "error": f"{type(e).__name__}: {e}", "error_type": "worker_error"}
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    if lost.is_set():
+        print(f"LEASE LOST {task['file']}: result discarded, another worker has the task", file=sys.stderr)
+        return "lost"
+    if "error" in record:
+        metrics.inc("resumes_total", outcome="failed")
+        status = queue.fail(
+            task, record["error"], record.get("error_type"), record.get("error_type") in RETRYABLE_ERROR_TYPES, record
+        )
+        print(f"FAILED ({status}) {task['file']}: {record['error']}", file=sys.stderr)
+        return status
+    metrics.inc("resumes_total", outcome="prefiltered" if "prefilter" in record else "scored")
+    queue.complete(task, record)
+    return "done"
+
+
+# One leasing loop; returns the number of tasks it processed
+def work(queue, pdf_pool, batch_id=None, exit_when_empty=False, poll_interval=1.0, max_tasks=None):
+    owner = default_owner()
+    batches = {}
+    processed = 0
+    while max_tasks is None or processed < max_tasks:
+        tasks = queue.lease(owner, 1, batch_id)
+        if not tasks:
+            if exit_when_empty and queue.is_finished(batch_id):
+                break
+            time.sleep(poll_interval)
+            continue
+        task = tasks[0]
+        if task["batch_id"] not in batches:
+            batches[task["batch_id"]] = queue.get_batch(task["batch_id"])
+        run_task(queue, task, batches[task["batch_id"]], pdf_pool)
+        processed += 1
+    return processed
+
+
+# One worker process: "threads" leasing loops sharing a PDF pool (LLM calls release the GIL while waiting)
+# client replaces the Gemini client in this process (tests and benchmarks pass a fake one)
+def run_worker(queue_path=None, threads=1, batch_id=None, exit_when_empty=False, poll_interval=1.0,
+               max_tasks=None, client=None, lease_seconds=None):
+    if client is not None:
+        extractor.set_llm(client)
+    queue = JobQueue(queue_path, lease_seconds)
+    counts = []
+    with PdfExtractionPool(threads) as pdf_pool:
+        loops = [
+            threading.Thread(
+                target=lambda: counts.append(work(queue, pdf_pool, batch_id, exit_when_empty, poll_interval, max_tasks))
+            )
+            for _ in range(threads)
+        ]
+        for loop in loops:
+            loop.start()
+        for loop in loops:
+            loop.join()
+    return sum(counts)
+
+
+def start_workers(processes, **kwargs):
+    workers = [multiprocessing.Process(target=run_worker, kwargs=kwargs) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Process queued resumes (see utils.job_queue).")
+    parser.add_argument("--queue", default=None, help="Queue database (defaults to QUEUE_PATH)")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes on this machine")
+    parser.add_argument("--threads", type=int, default=4, help="Tasks in progress per process")
+    parser.add_argument("--batch", default=None, help="Only work on this batch")
+    parser.add_argument("--exit-when-empty", action="store_true", help="Stop once nothing is queued or leased")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls of an empty queue")
+    parser.add_argument("--metrics-file", default=None,
+                        help="Write Prometheus-format metrics here when done (single process only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    metrics.setup_from_env()
+    options = {"queue_path": args.queue, "threads": args.threads, "batch_id": args.batch,
+               "exit_when_empty": args.exit_when_empty, "poll_interval": args.poll_interval}
+    try:
+        if args.processes > 1:
+            for worker in start_workers(args.processes, **options):
+                worker.join()
+        else:
+            processed = run_worker(**options)
+            print(f"Done: {processed} tasks processed", file=sys.stderr)
+    except KeyboardInterrupt:
+        # Leases of the tasks in progress expire and other workers pick them up
+        print("Interrupted", file=sys.stderr)
+        return 130
+    finally:
+        if args.processes == 1:
+            metrics.write_metrics_file(args.metrics_file)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())